@@ -0,0 +1,19 @@
+-- Indexes for the queries run every round.
+
+-- A player is player1 of at most one game per round. The key also serves
+-- every round_id filter: MAX(round_id), WHERE round_id = / > %s and the
+-- per-round fingerprints of the head-to-head cache.
+ALTER TABLE Results
+    ADD CONSTRAINT results_pkey PRIMARY KEY (round_id, player1_id);
+
+-- Opponent lookups from either side of a game (fetch_played_opponents,
+-- the tie-breaker joins, the incremental tie-breaker scope).
+CREATE INDEX IF NOT EXISTS results_player1_idx ON Results (player1_id, player2_id);
+CREATE INDEX IF NOT EXISTS results_player2_idx ON Results (player2_id, player1_id);
+
+-- Ranking order of get_active_players() and print_standings(), covering
+-- the columns they read so the standings can be returned from the index.
+CREATE INDEX IF NOT EXISTS standings_ranking_idx ON Standings
+    (points DESC, tiebreaker_A DESC, tiebreaker_B DESC, tiebreaker_C DESC)
+    INCLUDE (id, name, is_bye, matches)
+    WHERE is_active;
@@ -0,0 +1,13 @@
+-- Ranked standings stored once per change, so readers do not re-rank.
+
+-- version is derived from the last round and a checksum of the results
+-- and the ranked rows; created_at marks the current snapshot, it is bumped
+-- when a version becomes current again.
+CREATE TABLE IF NOT EXISTS standings_snapshots (
+    version VARCHAR(32) PRIMARY KEY,
+    round_id INTEGER NOT NULL,
+    standings JSONB NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp()
+);
+
+CREATE INDEX IF NOT EXISTS standings_snapshots_created_idx ON standings_snapshots (created_at DESC);
@@ -0,0 +1,3 @@
+-- Optional playing strength of a player, e.g. the ratings of generated
+-- load-test players, which result simulation turns into expected scores.
+ALTER TABLE Players ADD COLUMN IF NOT EXISTS rating INTEGER CHECK (rating >= 0);
@@ -0,0 +1,25 @@
+-- Count of statements that changed the standings. A snapshot records the
+-- count it was ranked from, so readers can tell when the standings changed
+-- behind its back (e.g. a withdrawal edited by hand) and refresh it.
+
+CREATE TABLE IF NOT EXISTS standings_changes (
+    id BOOLEAN PRIMARY KEY DEFAULT true CHECK (id),
+    generation BIGINT NOT NULL
+);
+
+-- Starts above the snapshots stored so far, which are refreshed on first read
+INSERT INTO standings_changes (id, generation) VALUES (true, 1) ON CONFLICT (id) DO NOTHING;
+
+ALTER TABLE standings_snapshots ADD COLUMN IF NOT EXISTS generation BIGINT NOT NULL DEFAULT 0;
+
+CREATE OR REPLACE FUNCTION count_standings_change() RETURNS trigger AS $$
+BEGIN
+    UPDATE standings_changes SET generation = generation + 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS standings_changed ON Standings;
+CREATE TRIGGER standings_changed
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON Standings
+    FOR EACH STATEMENT EXECUTE FUNCTION count_standings_change();
@@ -0,0 +1,53 @@
+-- Log of the statements that changed results, one row each with the
+-- lowest round it touched. The head-to-head cache remembers the last
+-- generation it saw: later changes above its cached round are appended,
+-- any other change rebuilds it, and no change costs one index probe
+-- instead of a checksum over every result.
+
+CREATE TABLE IF NOT EXISTS results_changes (
+    generation BIGSERIAL PRIMARY KEY,
+    lowest_round INTEGER NOT NULL
+);
+
+CREATE OR REPLACE FUNCTION log_results_change() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO results_changes (lowest_round)
+        SELECT MIN(round_id) FROM new_rows HAVING COUNT(*) > 0;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO results_changes (lowest_round)
+        SELECT MIN(round_id) FROM old_rows HAVING COUNT(*) > 0;
+    ELSIF TG_OP = 'UPDATE' THEN
+        INSERT INTO results_changes (lowest_round)
+        SELECT MIN(round_id)
+        FROM (SELECT round_id FROM old_rows UNION ALL SELECT round_id FROM new_rows) AS changed
+        HAVING COUNT(*) > 0;
+    ELSE
+        -- TRUNCATE has no transition tables, every round is gone
+        INSERT INTO results_changes (lowest_round) VALUES (0);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+-- Runs as the owner: writers of results need no rights on the log's sequence
+SECURITY DEFINER SET search_path = public;
+
+DROP TRIGGER IF EXISTS results_inserted ON Results;
+CREATE TRIGGER results_inserted
+    AFTER INSERT ON Results REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION log_results_change();
+
+DROP TRIGGER IF EXISTS results_updated ON Results;
+CREATE TRIGGER results_updated
+    AFTER UPDATE ON Results REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION log_results_change();
+
+DROP TRIGGER IF EXISTS results_deleted ON Results;
+CREATE TRIGGER results_deleted
+    AFTER DELETE ON Results REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION log_results_change();
+
+DROP TRIGGER IF EXISTS results_truncated ON Results;
+CREATE TRIGGER results_truncated
+    AFTER TRUNCATE ON Results
+    FOR EACH STATEMENT EXECUTE FUNCTION log_results_change();
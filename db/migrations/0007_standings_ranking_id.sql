@@ -0,0 +1,10 @@
+-- Ranking order of get_active_players() and of the standings snapshot
+-- (refresh_snapshot(), which print_standings() and the service read).
+-- Both break the remaining ties by player id, so id is the last key column
+-- instead of an included one; otherwise every ranking pays a sort on top
+-- of the index scan. Replaces the index of 0002_query_indexes.sql.
+DROP INDEX IF EXISTS standings_ranking_idx;
+CREATE INDEX standings_ranking_idx ON Standings
+    (points DESC, tiebreaker_A DESC, tiebreaker_B DESC, tiebreaker_C DESC, id)
+    INCLUDE (name, is_bye, matches)
+    WHERE is_active;
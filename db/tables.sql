@@ -1,6 +1,20 @@
 DROP TABLE IF EXISTS Players CASCADE;
 DROP TABLE IF EXISTS Results CASCADE;
 DROP TABLE IF EXISTS Standings CASCADE;
+DROP TABLE IF EXISTS standings_snapshots;
+DROP TABLE IF EXISTS standings_changes;
+DROP FUNCTION IF EXISTS count_standings_change();
+DROP FUNCTION IF EXISTS log_results_change();
+-- The results change log outlives a reset so that its generations keep
+-- growing; the row below makes every head-to-head cache rebuild.
+DO $$
+BEGIN
+    IF to_regclass('results_changes') IS NOT NULL THEN
+        INSERT INTO results_changes (lowest_round) VALUES (0);
+    END IF;
+END
+$$;
+DROP TABLE IF EXISTS schema_migrations;
 
 CREATE TABLE Players (
     id VARCHAR(25) PRIMARY KEY,
@@ -0,0 +1,50 @@
+import csv
+import io
+
+
+class CSVStream:
+    """
+    Read-only text stream of rows formatted as CSV on demand.
+
+    Stands in for an open CSV file where one is read (COPY ... FROM STDIN,
+    csv.reader), so rows can be registered without writing them to disk
+    first. Only the rows of one read() are formatted at a time.
+    """
+
+    def __init__(self, rows):
+        self.rows = iter(rows)
+        self.buffer = ""
+        self.out = io.StringIO()
+        self.writer = csv.writer(self.out, lineterminator='\n')
+
+    def _next_record(self):
+        row = next(self.rows, None)
+        if row is None:
+            return ""
+        self.writer.writerow(row)
+        record = self.out.getvalue()
+        self.out.seek(0)
+        self.out.truncate()
+        return record
+
+    def read(self, size=-1):
+        while size < 0 or len(self.buffer) < size:
+            record = self._next_record()
+            if not record:
+                break
+            self.buffer += record
+        if size < 0:
+            size = len(self.buffer)
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+    def readline(self, size=-1):
+        """Rest of the buffer if read() left one, else the next CSV record."""
+        if self.buffer:
+            record, self.buffer = self.buffer, ""
+            return record
+        return self._next_record()
+
+    def __iter__(self):
+        while record := self.readline():
+            yield record
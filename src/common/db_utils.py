@@ -1,4 +1,5 @@
 import os
+from contextlib import contextmanager
 
 def get_connection_string() -> str:
     """
@@ -17,3 +18,24 @@ def get_connection_string() -> str:
 
     conn_string = f"postgresql://{user}:{password}@{host}:{port}/{dbname}"
     return conn_string
+
+
+@contextmanager
+def open_connection(conn_string=None, conn=None):
+    """
+    Yield a database connection for one command.
+
+    A connection passed in (the one main.py shares between commands) is
+    yielded as is and left open. Otherwise a new connection is opened to
+    conn_string, or to get_connection_string(), and closed afterwards.
+    """
+    if conn is not None:
+        yield conn
+        return
+
+    import psycopg2
+    conn = psycopg2.connect(conn_string or get_connection_string())
+    try:
+        yield conn
+    finally:
+        conn.close()
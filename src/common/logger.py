@@ -1,7 +1,6 @@
 import logging
 import os
 import sys
-import inspect
 from pathlib import Path
 
 def get_logger(name: str = None) -> logging.Logger:
@@ -11,11 +10,11 @@ def get_logger(name: str = None) -> logging.Logger:
     Automatically uses the calling script's filename, even if run as __main__.
     """
     if name is None or name == "__main__":
-        # Get the filename of the module that called get_logger()
-        frame = inspect.stack()[1]
-        module = inspect.getmodule(frame[0])
-        if module and hasattr(module, "__file__"):
-            name = Path(module.__file__).stem
+        # Get the filename of the module that called get_logger(). Only the
+        # caller's frame is read, inspect.stack() would load every source file
+        caller_file = sys._getframe(1).f_globals.get("__file__")
+        if caller_file:
+            name = Path(caller_file).stem
         else:
             name = Path(sys.argv[0]).stem or "app"
 
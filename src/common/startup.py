@@ -0,0 +1,49 @@
+import re
+import sys
+
+# One line of `python -X importtime` output:
+#   import time: self [us] | cumulative | imported package
+IMPORT_TIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$')
+
+# Import time allowed for main.py plus the module of a plain pairing or
+# print command; pandas or Faker on that path alone would exceed it
+STARTUP_BUDGET_MS = 250
+
+
+def parse_import_times(lines):
+    """
+    Parse `python -X importtime` output.
+
+    Args:
+        lines (iterable): Lines of stderr, other lines are skipped.
+
+    Returns:
+        list of tuples: (module, self ms, cumulative ms, depth), in the
+                        order the imports completed.
+    """
+    imports = []
+    for line in lines:
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            imports.append((module, int(self_us) / 1000, int(cumulative_us) / 1000, (len(indent) - 1) // 2))
+    return imports
+
+
+def total_import_ms(imports):
+    """Wall time spent importing, the sum over the top-level imports."""
+    return sum(cumulative for _, _, cumulative, depth in imports if depth == 0)
+
+
+def print_import_profile(imports, top=15, file=sys.stderr):
+    """
+    Print the import time breakdown: the total, then the top-level imports
+    that took longest with their cumulative and own time.
+    """
+    top_level = sorted((entry for entry in imports if entry[3] == 0), key=lambda entry: -entry[2])
+    print(f"\nStartup import time: {total_import_ms(imports):.1f} ms "
+          f"({len(imports)} modules, budget {STARTUP_BUDGET_MS} ms)", file=file)
+    print(f"{'module':<40} | {'cumulative ms':>13} | {'self ms':>7}", file=file)
+    print("-" * 67, file=file)
+    for module, self_ms, cumulative_ms, _ in top_level[:top]:
+        print(f"{module:<40} | {cumulative_ms:13.1f} | {self_ms:7.1f}", file=file)
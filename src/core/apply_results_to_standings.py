@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+
+import psycopg2
+import argparse
+import sys
+import os
+
+from core.standings_snapshot import refresh_snapshot
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+# SQL of applying a round, shared by the Postgres and SQLite storages (the
+# latter through sqlite_params()), so it sticks to what both understand.
+
+# Whether the round exists, and the matches already applied to the standings
+ROUND_STATUS_SQL = """
+    SELECT EXISTS (SELECT 1 FROM results WHERE round_id = %(round_id)s),
+           (SELECT COALESCE(MAX(matches), 0) FROM standings);
+"""
+
+# Matches, points and BYEs of the whole round, applied at once
+APPLY_SCORES_SQL = """
+    UPDATE standings AS s
+    SET matches = s.matches + g.games,
+        points = s.points + g.points,
+        is_bye = s.is_bye OR g.byes > 0
+    FROM (
+        SELECT player_id,
+               COUNT(*) AS games,
+               SUM(score) AS points,
+               SUM(bye) AS byes
+        FROM (
+            SELECT player1_id AS player_id, player1_score AS score,
+                   CASE WHEN player2_id IS NULL THEN 1 ELSE 0 END AS bye
+            FROM results
+            WHERE round_id = %(round_id)s
+            UNION ALL
+            SELECT player2_id, player2_score, 0
+            FROM results
+            WHERE round_id = %(round_id)s AND player2_id IS NOT NULL
+        ) AS games
+        GROUP BY player_id
+    ) AS g
+    WHERE s.id = g.player_id;
+"""
+
+
+def check_round_status(round_id, round_exists, max_matches):
+    """Raise ValueError unless the round exists and is not applied yet (ROUND_STATUS_SQL)."""
+    if not round_exists:
+        raise ValueError(f"Round ID {round_id} does not exist in the table")
+    if not (round_id > max_matches):
+        raise ValueError(f"Round {round_id} already applied (matches = {max_matches})")
+
+
+def apply_scores_to_standings(conn, round_id, commit=True):
+    """
+    Apply the results of a round to the standings table.
+
+    Every game of the round is expanded into one row per player (BYEs only
+    have player1), aggregated per player and applied with a single
+    UPDATE ... FROM, so the cost is one statement however large the round.
+    The whole round is committed as one transaction, unless commit is False
+    and the caller owns the transaction.
+
+    Complexity:
+        Round trips : O(1) — one guard query and one UPDATE.
+    """
+    params = {"round_id": round_id}
+    try:
+        with conn.cursor() as cur:
+            # Guard: the round must exist and must not be applied twice
+            cur.execute(ROUND_STATUS_SQL, params)
+            check_round_status(round_id, *cur.fetchone())
+
+            cur.execute(APPLY_SCORES_SQL, params)
+            logger.debug(f"Round {round_id} applied to {cur.rowcount} players")
+
+            # Commit the changes to the database
+            if commit:
+                conn.commit()
+            logger.info("Record applied successfully")
+
+    except psycopg2.Error as e:
+        conn.rollback()
+        logger.error(f"Error applying round {round_id}: {e}")
+        raise
+
+
+# Tie-breakers of the players selected by the scope CTE:
+# - tiebreaker_A: Buchholz, sum of the total points of each distinct opponent.
+# - tiebreaker_B: Sonneborn-Berger, sum of the opponents' total points
+#                 weighted by the score made against them.
+# - tiebreaker_C: Progressive score, sum of the running score after each round.
+# BYEs count towards the progressive score only.
+TIEBREAK_CTES = """
+    games AS (
+        SELECT round_id, player1_id AS player_id, player2_id AS opponent_id,
+               player1_score AS score
+        FROM results
+        UNION ALL
+        SELECT round_id, player2_id, player1_id, player2_score
+        FROM results
+        WHERE player2_id IS NOT NULL
+    ),
+    scope AS (
+        {scope}
+    ),
+    scoped_games AS (
+        SELECT * FROM games WHERE player_id IN (SELECT id FROM scope)
+    ),
+    buchholz AS (
+        SELECT d.player_id, SUM(o.points) AS value
+        FROM (SELECT DISTINCT player_id, opponent_id
+              FROM scoped_games
+              WHERE opponent_id IS NOT NULL) AS d
+        JOIN standings AS o ON o.id = d.opponent_id
+        GROUP BY d.player_id
+    ),
+    sonneborn_berger AS (
+        SELECT g.player_id, SUM(g.score * o.points) AS value
+        FROM scoped_games AS g
+        JOIN standings AS o ON o.id = g.opponent_id
+        GROUP BY g.player_id
+    ),
+    progressive AS (
+        SELECT player_id, SUM(running) AS value
+        FROM (SELECT player_id,
+                     SUM(score) OVER (PARTITION BY player_id ORDER BY round_id) AS running
+              FROM scoped_games) AS r
+        GROUP BY player_id
+    ),
+    tiebreaks AS (
+        SELECT t.id,
+               COALESCE(b.value, 0) AS tiebreaker_A,
+               COALESCE(sb.value, 0) AS tiebreaker_B,
+               COALESCE(p.value, 0) AS tiebreaker_C
+        FROM standings AS t
+        LEFT JOIN buchholz AS b ON b.player_id = t.id
+        LEFT JOIN sonneborn_berger AS sb ON sb.player_id = t.id
+        LEFT JOIN progressive AS p ON p.player_id = t.id
+        WHERE t.id IN (SELECT id FROM scope)
+    )
+"""
+
+# Every player of the standings table
+FULL_SCOPE = "SELECT id FROM standings"
+
+# Players whose tie-breakers a round can change: those who played it, whose
+# points and progressive score moved, and every opponent they ever met,
+# whose Buchholz and Sonneborn-Berger include those points.
+ROUND_SCOPE = """
+        WITH round_players AS (
+            SELECT player1_id AS id FROM results WHERE round_id = %(round_id)s
+            UNION
+            SELECT player2_id FROM results WHERE round_id = %(round_id)s AND player2_id IS NOT NULL
+        )
+        SELECT id FROM round_players
+        UNION
+        SELECT g.player_id FROM games AS g JOIN round_players AS r ON g.opponent_id = r.id
+"""
+
+
+# Tie-breakers of the players in {scope} stored in the standings
+UPDATE_TIEBREAKS_SQL = f"""
+    WITH {TIEBREAK_CTES}
+    UPDATE standings AS s
+    SET tiebreaker_A = t.tiebreaker_A,
+        tiebreaker_B = t.tiebreaker_B,
+        tiebreaker_C = t.tiebreaker_C
+    FROM tiebreaks AS t
+    WHERE s.id = t.id;
+"""
+
+# Players whose stored tie-breakers differ from a full recomputation. The
+# tolerance covers SQLite's REAL sums, whose result depends on the order of
+# the terms; DECIMAL(8,2) values differ by at least 0.01.
+TIEBREAK_MISMATCHES_SQL = f"""
+    WITH {TIEBREAK_CTES.format(scope=FULL_SCOPE)}
+    SELECT s.id
+    FROM standings AS s
+    JOIN tiebreaks AS t ON t.id = s.id
+    WHERE s.tiebreaker_A IS NULL OR abs(s.tiebreaker_A - t.tiebreaker_A) > 1e-6
+       OR s.tiebreaker_B IS NULL OR abs(s.tiebreaker_B - t.tiebreaker_B) > 1e-6
+       OR s.tiebreaker_C IS NULL OR abs(s.tiebreaker_C - t.tiebreaker_C) > 1e-6
+    ORDER BY s.id;
+"""
+
+
+def apply_tiebreaks(conn, round_id=None, verify=False, commit=True):
+    """
+    Recalculate the tie-breakers of the standings table in one statement.
+
+    Args:
+        conn: Database connection.
+        round_id (int | None): Incremental mode, only update the players the
+                               newly applied round touched (see ROUND_SCOPE).
+                               None recomputes every player.
+        verify (bool): Before committing, compare every stored tie-breaker
+                       with a full recomputation and roll back on mismatch.
+        commit (bool): Commit the update. False leaves the transaction open
+                       for the caller, as run-round does.
+
+    Returns:
+        str: Version of the standings snapshot stored with the update.
+
+    Raises:
+        ValueError: If verify finds players whose tie-breakers differ.
+
+    Complexity:
+        Round trips : O(1) — a single UPDATE over CTEs, no per-player queries.
+    """
+    scope = FULL_SCOPE if round_id is None else ROUND_SCOPE
+    try:
+        with conn.cursor() as cur:
+            cur.execute(UPDATE_TIEBREAKS_SQL.format(scope=scope), {"round_id": round_id})
+            logger.debug(f"Tie-breakers updated for {cur.rowcount} players")
+
+            if verify:
+                mismatches = find_tiebreak_mismatches(cur)
+                if mismatches:
+                    conn.rollback()
+                    raise ValueError(f"Tie-breakers differ from a full recomputation for "
+                                     f"{len(mismatches)} players: {', '.join(mismatches[:10])}")
+                logger.info("Tie-breakers verified against a full recomputation.")
+
+            # Readers of the ranked standings are served from the snapshot
+            version = refresh_snapshot(conn, commit=False)
+
+            if commit:
+                conn.commit()
+            logger.info("Tie-breakers recalculated successfully.")
+            return version
+
+    except psycopg2.Error as e:
+        conn.rollback()
+        logger.error(f"Error in tie-breaker computation: {e}")
+        raise
+
+
+def find_tiebreak_mismatches(cur):
+    """Return the ids of players whose stored tie-breakers differ from a full recomputation."""
+    cur.execute(TIEBREAK_MISMATCHES_SQL)
+    return [row[0] for row in cur.fetchall()]
+
+
+def main(argv=None, conn=None):
+    """
+    Apply the results of a round to the standings and its tie-breakers.
+
+    Args:
+        argv (list | None): Command line arguments, sys.argv[1:] if None.
+        conn: Open database connection or Storage to use instead of connecting to --conn.
+    """
+    parser = argparse.ArgumentParser(prog="apply-results")
+    parser.add_argument('--conn',
+                        help='PostgreSQL connection string, or sqlite:///<file> for a local database '
+                             '(default: from DB_* environment variables)')
+    parser.add_argument("-r",
+                        "--round-id",
+                        type=int,
+                        required=True,
+                        help="Round ID")
+    parser.add_argument('--full-tiebreaks',
+                        action='store_true',
+                        help='Recompute the tie-breakers of every player instead of those touched by the round')
+    parser.add_argument('--verify',
+                        action='store_true',
+                        help='Check the tie-breakers against a full recomputation before committing')
+    args = parser.parse_args(argv)
+
+    # Imported here, core.storage builds on the functions of this module
+    from core.storage import open_storage
+
+    with open_storage(args.conn, conn) as storage:
+        # Apply scores to standings and recalculate the tie-breakers of the
+        # players touched by the round, in one transaction
+        try:
+            storage.apply_round(args.round_id, args.full_tiebreaks, args.verify)
+            storage.commit()
+        except storage.Error:
+            # Logged by the step that failed
+            storage.rollback()
+            sys.exit(1)
+        except BaseException:
+            storage.rollback()
+            raise
+
+
+if __name__ == '__main__':
+    main()
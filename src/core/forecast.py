@@ -0,0 +1,236 @@
+from functools import partial
+import os
+
+import numpy as np
+
+from core.simulation import OUTCOMES, OUTCOME_WEIGHTS, BYE_POINTS
+
+# Simulated tournaments advanced together as one set of (runs, players) arrays
+DEFAULT_CHUNK_SIZE = 4096
+
+# Below this many runs the chunks are simulated in-process, a worker pool
+# costs more to start than it saves.
+PARALLEL_MIN_RUNS = 20_000
+
+# Bit offsets of the packed ranking key: half-points, then half-point
+# Buchholz, then the current rank as the final tie-breaker
+_POINTS_SHIFT = 40
+_BUCHHOLZ_SHIFT = 20
+
+_HALF_POINT_OUTCOMES = np.rint(2 * OUTCOMES).astype(np.int64)
+_HALF_POINT_BYE = round(2 * BYE_POINTS)
+
+
+def parse_bands(spec):
+    """
+    Parse prize bands such as "1,2,3,4-10" into [(1, 1), (2, 2), (3, 3), (4, 10)].
+    """
+    bands = []
+    for part in spec.split(','):
+        lo, _, hi = part.strip().partition('-')
+        lo, hi = int(lo), int(hi or lo)
+        if lo < 1 or hi < lo:
+            raise ValueError(f"Invalid prize band: {part}")
+        bands.append((lo, hi))
+    return bands
+
+
+def played_matrix(player_ids, pairs):
+    """
+    Games already played between the given players as a dense (n, n) bool
+    matrix, indexed by position in player_ids. Games against unknown ids
+    (inactive players) or BYEs are skipped.
+    """
+    index = {player_id: i for i, player_id in enumerate(player_ids)}
+    played = np.zeros((len(player_ids), len(player_ids)), dtype=bool)
+    games = [(index[p1], index[p2]) for p1, p2 in pairs if p1 in index and p2 in index]
+    if games:
+        left, right = np.array(games, dtype=np.int64).T
+        played[left, right] = True
+        played[right, left] = True
+    return played
+
+
+class _Batch:
+    """
+    Runs simulated together. Points are kept in integer half-points. Games
+    played before the forecast are shared by all runs as one matrix, only
+    the simulated rounds are stored per run.
+    """
+
+    def __init__(self, runs, points, is_bye, history, fixed_buchholz, rounds):
+        self.n = len(points)
+        self.rows = np.arange(runs)[:, None]
+        self.base = self.rows * self.n
+        self.points = np.broadcast_to(np.rint(2 * points).astype(np.int32), (runs, self.n)).copy()
+        self.is_bye = np.broadcast_to(is_bye, (runs, self.n)).copy()
+        self.history = history
+        self.opponents = np.full((runs, self.n, rounds), -1, dtype=np.int16 if self.n < 2**15 else np.int32)
+        self.played_rounds = 0
+        self.fixed_buchholz = np.rint(2 * fixed_buchholz).astype(np.int32)
+
+    def buchholz(self):
+        """Buchholz of every player and run, in half-points."""
+        buchholz = (self.points.astype(np.float32) @ self.history.astype(np.float32)).astype(np.int32)
+        for r in range(self.played_rounds):
+            opponents = self.opponents[:, :, r]
+            scored = np.take_along_axis(self.points, np.maximum(opponents, 0), axis=1)
+            buchholz += np.where(opponents >= 0, scored, 0)
+        return buchholz + self.fixed_buchholz
+
+    def ranking(self, tiebreak=True):
+        """
+        Player indices of every run in standings order: points, Buchholz
+        (only if tiebreak) and the current rank.
+        """
+        key = -(self.points.astype(np.int64) << _POINTS_SHIFT) + np.arange(self.n)
+        if tiebreak:
+            key -= self.buchholz().astype(np.int64) << _BUCHHOLZ_SHIFT
+        return np.argsort(key, axis=1)
+
+    def played(self, rows, player1, player2):
+        simulated = self.opponents[rows, player1, :self.played_rounds] == player2[..., None]
+        return self.history[player1, player2] | simulated.any(axis=-1)
+
+    def pair(self):
+        """
+        Approximate Swiss pairing of every run at once: the BYE goes to the
+        lowest ranked player without one, then players are paired top-down
+        by points and a rematch is resolved by swapping the second player
+        with the next one down, as greedy_pairing does.
+
+        Returns:
+            tuple: (player1 indices, player2 indices, BYE indices or None)
+        """
+        order = self.ranking(tiebreak=False)
+        runs, n = order.shape
+        byes = None
+        if n % 2:
+            had_bye = np.take_along_axis(self.is_bye, order, axis=1)
+            # Last position without a BYE, or the last player if everyone had one
+            position = n - 1 - np.argmax(~had_bye[:, ::-1], axis=1)
+            byes = order[np.arange(runs), position]
+            order = order[np.arange(n) != position[:, None]].reshape(runs, n - 1)
+
+        num_pairs = order.shape[1] // 2
+        rematch = self.played(self.rows, order[:, 0::2], order[:, 1::2])
+        for k in range(num_pairs - 1):
+            rows = np.flatnonzero(rematch[:, k])
+            if not len(rows):
+                continue
+            first, second, third = order[rows, 2 * k], order[rows, 2 * k + 1], order[rows, 2 * k + 2]
+            swap = ~self.played(rows, first, third)
+            rows, second, third = rows[swap], second[swap], third[swap]
+            order[rows, 2 * k + 1] = third
+            order[rows, 2 * k + 2] = second
+            rematch[rows, k + 1] = self.played(rows, second, order[rows, 2 * k + 3])
+
+        return order[:, 0::2], order[:, 1::2], byes
+
+    def play(self, cumulative_weights, rng):
+        """Pair and play one round in every run."""
+        left, right, byes = self.pair()
+        draws = rng.random(left.shape)
+        outcome = sum(draws >= bound for bound in cumulative_weights[:-1])
+        scores = _HALF_POINT_OUTCOMES[outcome]
+
+        # Every player appears at most once per run and round, so plain
+        # assignments on flat (run, player) indices are safe
+        left, right = (left + self.base).ravel(), (right + self.base).ravel()
+        points = self.points.ravel()
+        points[left] += scores[..., 0].ravel()
+        points[right] += scores[..., 1].ravel()
+        opponents = self.opponents.reshape(-1, self.opponents.shape[2])
+        opponents[left, self.played_rounds] = right % self.n
+        opponents[right, self.played_rounds] = left % self.n
+        if byes is not None:
+            points[byes + self.base[:, 0]] += _HALF_POINT_BYE
+            self.is_bye.ravel()[byes + self.base[:, 0]] = True
+        self.played_rounds += 1
+
+
+def _simulate_chunk(runs, rng, points, is_bye, history, fixed_buchholz, rounds, cumulative_weights,
+                    band_of_place, num_bands):
+    """
+    Play the remaining rounds of one chunk of tournaments.
+
+    Returns:
+        np.ndarray: Flat (players · bands) count of final placements per band.
+    """
+    n = len(points)
+    places = np.flatnonzero(band_of_place >= 0)
+    batch = _Batch(runs, points, is_bye, history, fixed_buchholz, rounds)
+    for _ in range(rounds):
+        batch.play(cumulative_weights, rng)
+    order = batch.ranking()
+    return np.bincount((order[:, places] * num_bands + band_of_place[places]).ravel(),
+                       minlength=n * num_bands)
+
+
+def forecast_placements(points, is_bye, history, rounds, bands, runs=10_000,
+                        fixed_buchholz=None, rng=None, outcome_weights=OUTCOME_WEIGHTS,
+                        chunk_size=DEFAULT_CHUNK_SIZE, workers=None):
+    """
+    Monte Carlo forecast of the final placements.
+
+    The remaining rounds are simulated for a whole chunk of tournaments at
+    once with NumPy arrays. Chunks are independent, each draws from its
+    own generator spawned from rng, so they can be spread over a process
+    pool and the forecast of a seed does not depend on the worker count.
+    Final standings use the order of get_active_players(): points,
+    Buchholz, then the current rank, which stands in for the tie-breakers
+    not recomputed here.
+
+    Args:
+        points (array): Current points of the active players in ranking order.
+        is_bye (array): Whether each player already had a BYE.
+        history (np.ndarray): Games played so far, see played_matrix().
+        rounds (int): Rounds left to play.
+        bands (list): Prize bands as (first place, last place), 1-based.
+        runs (int): Number of simulated tournaments.
+        fixed_buchholz (array | None): Buchholz from opponents that are not
+                                       simulated (inactive players).
+        rng (np.random.Generator | None): Source of results.
+        outcome_weights (tuple): Probabilities of win / draw / loss.
+        chunk_size (int): Tournaments simulated together, bounds memory.
+        workers (int | None): Size of the process pool (None: CPU count),
+                              1 simulates every chunk in-process.
+
+    Returns:
+        np.ndarray: (players, bands) probability of finishing in each band.
+
+    Complexity:
+        Time  : O(runs · rounds · n log n), divided across `workers` processes.
+        Space : O(n² + chunk_size · n · rounds) per process.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    points = np.asarray(points, dtype=float)
+    n = len(points)
+    fixed_buchholz = np.zeros(n) if fixed_buchholz is None else np.asarray(fixed_buchholz, dtype=float)
+
+    # Band of every final position, -1 for places outside all bands
+    band_of_place = np.full(n, -1, dtype=np.int64)
+    for band, (lo, hi) in enumerate(bands):
+        band_of_place[lo - 1:hi] = band
+
+    weights = np.asarray(outcome_weights, dtype=float)
+    cumulative_weights = np.cumsum(weights / weights.sum())
+
+    chunks = [min(chunk_size, runs - start) for start in range(0, runs, chunk_size)]
+    simulate = partial(_simulate_chunk, points=points, is_bye=np.asarray(is_bye, dtype=bool), history=history,
+                       fixed_buchholz=fixed_buchholz, rounds=rounds, cumulative_weights=cumulative_weights,
+                       band_of_place=band_of_place, num_bands=len(bands))
+
+    chunk_rngs = rng.spawn(len(chunks))
+    counts = np.zeros(n * len(bands), dtype=np.int64)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(chunks) < 2 or runs < PARALLEL_MIN_RUNS:
+        counts = sum(map(simulate, chunks, chunk_rngs), counts)
+    else:
+        # multiprocessing is only imported when a pool is actually used
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+            counts = sum(pool.map(simulate, chunks, chunk_rngs), counts)
+
+    return counts.reshape(n, len(bands)) / runs
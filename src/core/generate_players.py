@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+
+import csv
+from itertools import chain
+from pathlib import Path
+import os
+import argparse
+import re
+
+import numpy as np
+
+from common.csv_stream import CSVStream
+from common.logger import get_logger
+from common.common import root_dir
+
+logger = get_logger(__name__)
+
+# Players generated (and written or loaded) at a time
+BATCH_SIZE = 10000
+
+# Distinct first and last names drawn from Faker once per run; a million
+# players combine them instead of calling Faker a million times
+NAME_POOL_SIZE = 1000
+DOMAIN_POOL_SIZE = 20
+
+# Default spread of generated ratings and their allowed range
+RATING_SD = 350.0
+RATING_RANGE = (100, 3000)
+
+
+def name_pools(seed=None):
+    """
+    Draw the name and email domain pools from Faker.
+
+    Returns:
+        tuple: (first names, last names, email domains) as NumPy arrays.
+    """
+    # Faker takes a while to import and set up, only pay for it here
+    from faker import Faker
+    fake = Faker()
+    fake.seed_instance(seed)
+
+    first_names = np.array(sorted({fake.first_name() for _ in range(NAME_POOL_SIZE)}))
+    last_names = np.array(sorted({fake.last_name() for _ in range(NAME_POOL_SIZE)}))
+    domains = np.array(sorted({fake.free_email_domain() for _ in range(DOMAIN_POOL_SIZE)}))
+    return first_names, last_names, domains
+
+
+def email_part(name):
+    """Name as the lowercase ASCII letters of an email local part."""
+    return re.sub(r'[^a-z]', '', name.lower())
+
+
+def generate_player_batches(num_players, seed=None, rating_mean=None, rating_sd=RATING_SD,
+                            batch_size=BATCH_SIZE):
+    """
+    Generate players in batches, reproducibly for a given seed.
+
+    Ids are drawn at once without replacement from the zero-padded numbers
+    of at least five digits (a partial permutation, so there are no
+    collisions to retry). Names combine precomputed Faker pools and the
+    email adds the id, which keeps every email unique.
+
+    Args:
+        num_players (int): Number of players to generate.
+        seed (int | None): Seed of the ids, names and ratings; random if None.
+        rating_mean (float | None): Mean of normally distributed ratings,
+                                    None for players without a rating.
+        rating_sd (float): Standard deviation of the ratings.
+        batch_size (int): Players per batch.
+
+    Yields:
+        list[tuple]: (id, name, email) tuples, with a rating appended if
+                     rating_mean is given.
+
+    Complexity:
+        Time  : O(num_players), vectorized per batch.
+        Memory: O(num_players) for the ids, O(batch_size) for the rest.
+    """
+    rng = np.random.default_rng(seed)
+    first_names, last_names, domains = name_pools(seed)
+    first_parts = np.array([email_part(name) for name in first_names])
+    last_parts = np.array([email_part(name) for name in last_names])
+
+    digits = max(5, len(str(max(num_players - 1, 0))))
+    ids = rng.choice(10 ** digits, size=num_players, replace=False)
+
+    logger.debug(f"Starting generation of {num_players} players...")
+    for start in range(0, num_players, batch_size):
+        batch_ids = [f"{player_id:0{digits}d}" for player_id in ids[start:start + batch_size].tolist()]
+        size = len(batch_ids)
+        first = rng.integers(len(first_names), size=size)
+        last = rng.integers(len(last_names), size=size)
+        domain = rng.integers(len(domains), size=size)
+
+        names = np.char.add(np.char.add(first_names[first], " "), last_names[last]).tolist()
+        emails = [f"{first_part}.{last_part}{player_id}@{host}" for first_part, last_part, player_id, host
+                  in zip(first_parts[first].tolist(), last_parts[last].tolist(), batch_ids, domains[domain].tolist())]
+
+        if rating_mean is None:
+            yield list(zip(batch_ids, names, emails))
+        else:
+            ratings = np.clip(np.rint(rng.normal(rating_mean, rating_sd, size)), *RATING_RANGE).astype(int)
+            yield list(zip(batch_ids, names, emails, ratings.tolist()))
+
+
+def generate_fake_players(num_players, seed=None, **options):
+    """
+    Generate a list of fake players with unique IDs, names, and emails.
+
+    Args:
+        num_players (int): Number of players to generate.
+        seed (int | None): Seed for a reproducible list.
+        **options: rating_mean and rating_sd, see generate_player_batches().
+
+    Returns:
+        list[tuple]: List of tuples (id, name, email[, rating])
+    """
+    return list(chain.from_iterable(generate_player_batches(num_players, seed, **options)))
+
+
+def write_players_to_csv(batches, output_path, columns):
+    """
+    Write batches of players to a CSV file.
+
+    Args:
+        batches (iterable): Lists of player tuples.
+        output_path (Path): Destination CSV file path.
+        columns (list): CSV header.
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    count = 0
+    with open(output_path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(columns)
+        for batch in batches:
+            writer.writerows(batch)
+            count += len(batch)
+
+    logger.info(f"Successfully wrote {count} players to {output_path}")
+
+
+def parse_args(argv=None):
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="generate-players",
+        description="Generate tournament players using Faker."
+    )
+    parser.add_argument(
+        '-n', '--num-players',
+        type=int,
+        default=10,
+        help='Number of players to generate (default: 10)'
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        help='Seed for a reproducible set of players (default: random)'
+    )
+    parser.add_argument(
+        '--rating-mean',
+        type=float,
+        help='Add a rating column, normally distributed around this mean'
+    )
+    parser.add_argument(
+        '--rating-sd',
+        type=float,
+        default=RATING_SD,
+        help='Standard deviation of the ratings (default: %(default)s)'
+    )
+    parser.add_argument(
+        '-o', '--output',
+        default=os.path.join(root_dir(__file__), 'data', 'players.csv'),
+        help='Output CSV file (default: %(default)s)'
+    )
+    parser.add_argument(
+        '--load',
+        action='store_true',
+        help='Register the players in the database (COPY on PostgreSQL) instead of writing a CSV'
+    )
+    parser.add_argument(
+        '--conn',
+        help='Connection string of --load, PostgreSQL or sqlite:///<file> '
+             '(default: from DB_* environment variables)'
+    )
+    return parser.parse_args(argv)
+
+
+# ------------------------------------------------------------
+# Main Entrypoint
+# ------------------------------------------------------------
+def main(argv=None, conn=None):
+    args = parse_args(argv)
+    num_players = args.num_players
+
+    logger.info(f"Generating {num_players} players...")
+
+    batches = generate_player_batches(num_players, args.seed, args.rating_mean, args.rating_sd)
+    columns = ['id', 'name', 'email'] + (['rating'] if args.rating_mean is not None else [])
+
+    if args.load:
+        # Imported here, loading needs the database drivers
+        from core.storage import open_storage
+
+        # Registered through the staging table, streamed without a file
+        with open_storage(args.conn, conn) as storage:
+            storage.register_players(CSVStream(chain([columns], chain.from_iterable(batches))))
+        return
+
+    write_players_to_csv(batches, Path(args.output), columns)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,7 +3,6 @@
 import csv
 import random
 from pathlib import Path
-import subprocess
 
 from common.db_utils import get_connection_string
 
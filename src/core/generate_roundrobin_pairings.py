@@ -1,86 +1,20 @@
 #!/usr/bin/env python3
 
-import psycopg2
 import argparse
 from pathlib import Path
 import csv
-import subprocess
 import os
 import math
 
-from player import Player
-from common.db_utils import get_connection_string
+from core.player import Player
+from core.pairing_engines import round_robin_pairing
+from common.db_utils import open_connection
 from common.logger import get_logger
 from common.common import root_dir
 
 logger = get_logger(__name__)
 
 
-def round_robin_pairing(players):
-    """
-    Generate all round-robin pairings for a list of active player objects.
-
-    Each player faces every other player exactly once.
-    If there is an odd number of players, one receives a BYE each round.
-
-    Args:
-        players (list): List of player objects with at least attributes:
-                        - id
-                        - name
-                        - rank (optional, used for sorting/logging)
-
-    Returns:
-        list[list[tuple]]: A list of rounds,
-                           where each round is a list of (playerA, playerB) tuples.
-                           A BYE is represented as (player, 'BYE').
-
-    Algorithm:
-        - Implements the "circle method" for round-robin scheduling.
-        - Ensures each player plays every other exactly once.
-        - BYE pairings appear only if the player count is odd.
-
-    Complexity:
-        Time  : O(n²)
-        Space : O(n²)
-    """
-
-    players = players[:]  # Copy list to avoid mutation
-    n = len(players)
-    has_bye = False
-
-    # Handle odd number of players
-    if n % 2 == 1:
-        has_bye = True
-        n += 1
-
-    rounds = []
-    for round_index in range(n - 1):
-        round_pairs = []
-
-        for i in range(n // 2):
-            if has_bye and (i == 0 and round_index % n < len(players)):
-                # Give BYE to one player each round in rotation
-                bye_player = players[(round_index + i) % len(players)]
-                round_pairs.append((bye_player, 'BYE'))
-                continue
-
-            # Determine real matchups
-            p1_index = (round_index + i) % len(players)
-            p2_index = (round_index + n - 1 - i) % len(players)
-
-            if p1_index == p2_index:
-                continue  # skip self-match in odd count
-
-            p1 = players[p1_index]
-            p2 = players[p2_index]
-            if p1 != p2:
-                round_pairs.append((p1, p2))
-
-        rounds.append(round_pairs)
-
-    return rounds
-
-
 # Get eligible list of players in order of rankings to pair for the next round
 def get_active_players(conn):
     with conn.cursor() as cur:
@@ -133,27 +67,29 @@ def generate_pairings_csv(sorted_pairs, round_id):
 
     logger.info(f"Pairings CSV file generated successfully: {filename}")
 
-if __name__ == '__main__':
-    conn_string = get_connection_string()
+def main(argv=None, conn=None):
+    """
+    Pair every round of a round-robin tournament, one CSV per round.
 
-    # Parse command line arguments
-    parser = argparse.ArgumentParser()
+    Args:
+        argv (list | None): Command line arguments, sys.argv[1:] if None.
+        conn: Open database connection to use instead of connecting to --conn.
+    """
+    parser = argparse.ArgumentParser(prog="generate-roundrobin-pairings")
     parser.add_argument('--conn',
-                        help='PostgreSQL connection string',
-                        default=conn_string)
-    args = parser.parse_args()
-
-    # Connect to the database
-    conn = psycopg2.connect(args.conn)
+                        help='PostgreSQL connection string (default: from DB_* environment variables)')
+    args = parser.parse_args(argv)
 
-    active_players = get_active_players(conn)
+    with open_connection(args.conn, conn) as conn:
+        active_players = get_active_players(conn)
 
     max_rounds = roundrobin_round_count(len(active_players))
-    
+
     all_rounds = round_robin_pairing(active_players)
-    
+
     for r, matches in enumerate(all_rounds, 1):
         generate_pairings_csv(matches, r)
 
-    # Close database connection
-    conn.close()
\ No newline at end of file
+
+if __name__ == '__main__':
+    main()
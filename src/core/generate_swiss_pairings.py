@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+
+import argparse
+from pathlib import Path
+import csv
+import os
+import math
+import numpy as np
+
+from core.player import Player
+from core.head_to_head import HeadToHead
+from core.pairing_engines import ENGINES
+from common.logger import get_logger
+from common.common import root_dir
+
+logger = get_logger(__name__)
+
+# Get eligible list of players in order of rankings to pair for the next round.
+# Ranked live rather than from the snapshot: it runs once per round and must
+# see every edit of the standings, such as a withdrawal.
+def get_active_players(conn):
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT id, name, is_bye, points
+            FROM Standings
+            WHERE is_active = true
+            ORDER BY points DESC, tiebreaker_A DESC, tiebreaker_B DESC, tiebreaker_C DESC, id;
+        """)
+        player_data = cur.fetchall()
+    players = [Player(rank + 1, player_id, name, is_bye, float(points))
+               for rank, (player_id, name, is_bye, points) in enumerate(player_data)]
+    return players
+
+def validate_new_round(conn, max_round_count, round_id: int, max_round_id=None):
+    """
+    Validate that the given round_id is valid:
+    - Cannot be less than maximum set by tournament type.
+    - Cannot be less than max round already in results.
+    - Must be exactly +1 greater than the current max round.
+
+    max_round_id, when the caller already knows the last round in results,
+    saves the query for it.
+    """
+    if max_round_count == 0:
+        raise ValueError(
+            f"No players are registered in the standings table. "
+            f"Cannot start or validate round {round_id} for swiss tournament."
+        )
+
+    if round_id > max_round_count:
+        raise ValueError(
+            f"Invalid round {round_id}! swiss tournament is limited to maximum {max_round_count} rounds ."
+        )
+ 
+    if max_round_id is None:
+        with conn.cursor() as cur:
+            cur.execute("SELECT COALESCE(MAX(round_id), 0) FROM results;")
+            max_round_id = cur.fetchone()[0]
+
+    if round_id <= max_round_id:
+        raise ValueError(
+            f"Invalid round {round_id}: must be greater than last applied round {max_round_id}."
+        )
+
+    if round_id != max_round_id + 1:
+        raise ValueError(
+            f"Invalid round {round_id}: Last round was {max_round_id}, next round must be {max_round_id + 1}!"
+        )
+
+    logger.info(f"Round {round_id} is valid (previous max round = {max_round_id})")
+    return True
+
+
+# Given a player, get set of already played opponents
+# useful function, but calling it every time will drain time resources
+def fetch_played_opponents(conn, player_id):
+    opponents = set()
+
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT player1_id, player2_id
+            FROM results
+            WHERE player1_id = %s OR player2_id = %s
+        """, (player_id, player_id))
+
+        for row in cur.fetchall():
+            opponent1_id, opponent2_id = row
+
+            if opponent1_id and opponent1_id != player_id:
+                opponents.add(opponent1_id)
+
+            if opponent2_id and opponent2_id != player_id:
+                opponents.add(opponent2_id)
+
+    return opponents
+
+def create_head_to_head_map(conn, player_ids=()):
+    """
+    Load the head-to-head history of the tournament.
+
+    Args:
+        conn: Database connection.
+        player_ids (list): Players indexed first, e.g. the active players
+                           in ranking order.
+
+    Returns:
+        HeadToHead: Packed head-to-head index of all played games.
+    """
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT player1_id, player2_id
+            FROM results
+        """)
+        return HeadToHead.from_pairs(cur.fetchall(), player_ids)
+
+def fetch_results_changes(conn, since=0):
+    """
+    Read the results change log of db/migrations/0006_results_changes.sql.
+
+    Args:
+        conn: Database connection.
+        since (int): Generation the caller has seen.
+
+    Returns:
+        tuple: (last generation, lowest round changed after since, or None
+                if nothing changed)
+
+    Complexity:
+        Time  : O(changes after since) on the generation key.
+    """
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT (SELECT COALESCE(MAX(generation), 0) FROM results_changes),
+                   (SELECT MIN(lowest_round) FROM results_changes WHERE generation > %s);
+        """, (since,))
+        return cur.fetchone()
+
+
+def fetch_games_after(conn, round_id=0, skip_rounds=()):
+    """(round_id, player1_id, player2_id) of every game after round_id, except those of skip_rounds."""
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT round_id, player1_id, player2_id
+            FROM results
+            WHERE round_id > %s AND NOT (round_id = ANY(%s::integer[]))
+        """, (round_id, list(skip_rounds)))
+        return cur.fetchall()
+
+
+def head_to_head_cache_file(conn):
+    """Cache file of the tournament stored in the connected database."""
+    return os.path.join(root_dir(__file__), 'data', f'head_to_head_{conn.info.dbname}.npz')
+
+
+def save_head_to_head_cache(head_to_head_map, cache_file, last_round, generation):
+    """Write the head-to-head index with the last round and results generation it covers."""
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    head_to_head_map.save(cache_file, last_round=np.int64(last_round), generation=np.int64(generation))
+
+
+def load_head_to_head_map(conn, player_ids=(), cache_file=None, known_rounds=None, save=save_head_to_head_cache):
+    """
+    Load the head-to-head history through the on-disk cache.
+
+    The cache stores the packed index together with the last round it
+    covers and the generation of the results change log it has seen. If
+    nothing changed since, the cache is used as is; if only rounds after
+    the cached one were added, just their rows are fetched and appended;
+    otherwise (results edited, rounds deleted, database reset, unreadable
+    file) the index is rebuilt from scratch. The cache is rewritten
+    whenever it was extended or rebuilt.
+
+    Args:
+        conn: Database connection.
+        player_ids (list): Players to index, e.g. the active players.
+        cache_file (str | None): Defaults to data/head_to_head_<dbname>.npz
+        known_rounds (dict | None): {round_id: (player1_id, player2_id) pairs}
+                                    the caller already holds, e.g. the round
+                                    it just registered. Rounds missing from
+                                    the cache are taken from here instead of
+                                    being fetched again.
+        save (callable): save(head_to_head_map, cache_file, last_round,
+                         generation) writes the cache. A caller whose rounds
+                         are not committed yet passes one that waits for
+                         the commit.
+
+    Returns:
+        HeadToHead: Packed head-to-head index of all played games.
+
+    Complexity:
+        Round trips : O(1); rows read are those of the rounds not cached.
+    """
+    cache_file = cache_file or head_to_head_cache_file(conn)
+    known_rounds = known_rounds or {}
+
+    head_to_head_map = None
+    if os.path.exists(cache_file):
+        try:
+            head_to_head_map, meta = HeadToHead.load(cache_file)
+            cached_round, cached_generation = int(meta["last_round"]), int(meta["generation"])
+        except (OSError, KeyError, ValueError) as err:
+            logger.warning(f"Ignoring unreadable head-to-head cache {cache_file}: {err}")
+            head_to_head_map = None
+
+    # The log is read before the rows, a change in between is seen next time
+    if head_to_head_map is None:
+        generation, _ = fetch_results_changes(conn)
+    else:
+        generation, lowest_round = fetch_results_changes(conn, cached_generation)
+        if generation < cached_generation or (lowest_round is not None and lowest_round <= cached_round):
+            logger.info(f"Results changed up to round {cached_round} since it was cached, "
+                        f"rebuilding head-to-head map")
+            head_to_head_map = None
+        elif lowest_round is None:
+            logger.debug(f"Head-to-head cache is up to date (round {cached_round})")
+            head_to_head_map.add_players(player_ids)
+            return head_to_head_map
+
+    if head_to_head_map is None:
+        games = fetch_games_after(conn)
+        head_to_head_map = HeadToHead.from_pairs(((p1, p2) for _, p1, p2 in games), player_ids)
+        last_round = max((r for r, _, _ in games), default=0)
+    else:
+        head_to_head_map.add_players(player_ids)
+        new_known = {r: pairs for r, pairs in known_rounds.items() if r > cached_round}
+        for pairs in new_known.values():
+            head_to_head_map.add_pairs(pairs)
+        games = fetch_games_after(conn, cached_round, new_known)
+        head_to_head_map.add_pairs((p1, p2) for _, p1, p2 in games)
+        new_rounds = sorted(set(new_known) | {r for r, _, _ in games})
+        last_round = max([cached_round, *new_rounds])
+        logger.debug(f"Head-to-head cache extended with rounds {new_rounds}")
+
+    save(head_to_head_map, cache_file, last_round, generation)
+    return head_to_head_map
+
+
+def swiss_pairing(storage, players, engine="greedy", use_cache=True, known_rounds=None, save_cache=True,
+                  **options):
+    """
+    Generate Swiss-style tournament pairings with the selected engine.
+
+    Args:
+        storage (Storage): Tournament storage (used for head-to-head history).
+        players (list): List of player objects in ranking order.
+        engine (str): Name of the pairing engine, one of ENGINES:
+                      - "greedy":   top-down scan with swap attempts
+                      - "matching": maximum-weight (blossom) matching per ranking block
+                      - "score-groups": matching per score group in a process pool
+        use_cache (bool): Load the head-to-head history through the on-disk cache.
+        known_rounds (dict | None): Games already in memory, see load_head_to_head_map().
+        save_cache (bool): Write the cache now; False leaves it to storage.commit().
+        **options: Engine specific keyword arguments (e.g. workers).
+
+    Returns:
+        list of tuples: Each tuple contains (playerA, playerB) or (player, 'BYE').
+    """
+    head_to_head_map = storage.head_to_head_map([player.id for player in players], use_cache, known_rounds,
+                                                save_cache)
+    logger.debug(f"Pairing {len(players)} players with '{engine}' engine")
+    return ENGINES[engine](players, head_to_head_map, **options)
+
+
+def generate_pairings_csv(sorted_pairs, round_id):
+    filename = os.path.join(root_dir(__file__), 'data', f'pairings_r{round_id}.csv')
+    filename_display = os.path.join(root_dir(__file__), 'data', 'pairings-display.txt')
+
+    os.makedirs(os.path.dirname(filename), exist_ok=True)  # ensure data/ dir exists
+
+    with open(filename, 'w', newline='') as file, open(filename_display, 'w') as f:
+        writer = csv.writer(file)
+        writer.writerow(["round_id", "player1_id", "player1_name", "player1_score", "player2_score", "player2_name", "player2_id"])
+
+        for pair in sorted_pairs:
+            player1 = pair[0]
+            player2 = pair[1]
+
+            if player2 == "BYE":
+                row = [round_id, player1.id, player1.name, "BYE", "_", "_", "_"]
+                row_display = f"{player1.name} has a BYE\n"
+            else:
+                row = [round_id, player1.id, player1.name, "?", "?", player2.name, player2.id]
+                row_display = f'{player1.name} ?  -  ? {player2.name}\n'
+
+            writer.writerow(row)
+            f.write(row_display)
+
+    logger.info(f"Pairings CSV file generated successfully: {filename}")
+
+def get_player_count(conn) -> int:
+    """
+    Count the number of players in the standings table.
+    """
+    with conn.cursor() as cur:
+        cur.execute("SELECT COUNT(id) FROM standings;")
+        num_players = cur.fetchone()[0] or 0
+    return num_players
+
+
+def swiss_round_count(num_players: int, round_id: int) -> int:
+    """
+    Determine number of rounds for Swiss system.
+
+    Rules:
+    - Recommended: ceil(log2(num_players))
+    - Max allowed: N/2 (even), (N-1)/2 (odd)
+    - Logs a warning if exceeding recommended rounds, but does not raise.
+    """
+    if num_players < 2:
+        raise ValueError("Need at least 2 players for a tournament")
+
+    recommended = math.ceil(math.log2(num_players))
+    max_rounds = num_players // 2 if num_players % 2 == 0 else (num_players - 1) // 2
+
+    if round_id > recommended:
+        logger.warning(
+            f"[Swiss pairing] Recommended rounds ≈ {recommended} "
+            f"(based on log2({num_players})), but using up to {max_rounds} is acceptable."
+        )
+
+    return max_rounds
+
+
+def main(argv=None, conn=None):
+    """
+    Pair the next Swiss round and write data/pairings_r<round>.csv.
+
+    Args:
+        argv (list | None): Command line arguments, sys.argv[1:] if None.
+        conn: Open database connection or Storage to use instead of connecting to --conn.
+    """
+    parser = argparse.ArgumentParser(prog="generate-swiss-pairings")
+    parser.add_argument('--conn',
+                        help='PostgreSQL connection string, or sqlite:///<file> for a local database '
+                             '(default: from DB_* environment variables)')
+    parser.add_argument("-r",
+                        "--round-id",
+                        type=int,
+                        required=True,
+                        help="Round ID")
+    parser.add_argument("-e",
+                        "--engine",
+                        choices=sorted(ENGINES),
+                        default="greedy",
+                        help="Pairing engine (default: %(default)s)")
+    parser.add_argument("-w",
+                        "--workers",
+                        type=int,
+                        default=None,
+                        help="Worker processes for the score-groups engine (default: CPU count)")
+    parser.add_argument("--no-cache",
+                        action="store_true",
+                        help="Rebuild the head-to-head history from the results table")
+    args = parser.parse_args(argv)
+
+    # Imported here, core.storage builds on the functions of this module
+    from core.storage import open_storage
+
+    with open_storage(args.conn, conn) as storage:
+        active_players = storage.active_players()
+
+        max_rounds = swiss_round_count(len(active_players), args.round_id)
+
+        validate_new_round(None, max_rounds, args.round_id, max_round_id=storage.max_round_id())
+
+        options = {"workers": args.workers} if args.engine == "score-groups" else {}
+        raw_pairs = swiss_pairing(storage, active_players, args.engine, not args.no_cache, **options)
+
+    # Sort the raw_pairs list by the rank of the first element in each pair
+    sorted_pairs = sorted(raw_pairs, key=lambda pair: pair[0].rank)
+
+    generate_pairings_csv(sorted_pairs, args.round_id)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+import os
+
+import numpy as np
+
+# Rows unpacked at once by subset(), bounds its temporary memory
+SUBSET_CHUNK_ROWS = 1024
+
+
+class HeadToHead:
+    """
+    Head-to-head history of a tournament as a packed bit matrix.
+
+    Player ids are mapped once to dense integer indices. Bit (i, j) of the
+    matrix is set when the players with indices i and j have met, so a
+    rematch check is a single lookup and all opponents of a player can be
+    queried as one vectorized row operation.
+
+    Complexity:
+        Space : O(n² / 8) bytes for n players, no per-player containers.
+    """
+
+    def __init__(self, player_ids=()):
+        self.index = {}
+        self.ids = []
+        self._bits = np.zeros((0, 0), dtype=np.uint8)
+        self.add_players(player_ids)
+
+    @classmethod
+    def from_pairs(cls, pairs, player_ids=()):
+        """
+        Build the history from (player1_id, player2_id) rows of the results table.
+        Rows with a missing opponent (BYE) only register the present player.
+        """
+        head_to_head = cls(player_ids)
+        head_to_head.add_pairs(pairs)
+        return head_to_head
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def nbytes(self):
+        return self._bits.nbytes
+
+    def _reserve(self, size):
+        capacity = self._bits.shape[0]
+        if size <= capacity:
+            return
+        # Grow geometrically so that registering players one by one stays cheap
+        capacity = max(size, 2 * capacity, 64)
+        capacity += -capacity % 8
+        bits = np.zeros((capacity, capacity // 8), dtype=np.uint8)
+        rows, cols = self._bits.shape
+        bits[:rows, :cols] = self._bits
+        self._bits = bits
+
+    def add_players(self, player_ids):
+        """Assign dense indices to player ids that are not known yet."""
+        for player_id in player_ids:
+            if player_id is not None and player_id not in self.index:
+                self.index[player_id] = len(self.ids)
+                self.ids.append(player_id)
+        self._reserve(len(self.ids))
+
+    def indices(self, player_ids):
+        """Return the dense indices of player_ids as an array, -1 for unknown ids."""
+        return np.fromiter((self.index.get(player_id, -1) for player_id in player_ids),
+                           dtype=np.int64, count=len(player_ids))
+
+    def add_pairs(self, pairs):
+        """Record a batch of played games given as (player1_id, player2_id) rows."""
+        pairs = list(pairs)
+        self.add_players(player_id for pair in pairs for player_id in pair)
+
+        games = [(self.index[p1], self.index[p2]) for p1, p2 in pairs if p1 is not None and p2 is not None]
+        if not games:
+            return
+
+        left, right = np.array(games, dtype=np.int64).T
+        rows = np.concatenate([left, right])
+        cols = np.concatenate([right, left])
+        np.bitwise_or.at(self._bits, (rows, cols >> 3), (0x80 >> (cols & 7)).astype(np.uint8))
+
+    def played(self, player1_id, player2_id):
+        """Return True if the two players have already met."""
+        i = self.index.get(player1_id)
+        j = self.index.get(player2_id)
+        if i is None or j is None:
+            return False
+        return bool(self._bits[i, j >> 3] & (0x80 >> (j & 7)))
+
+    def played_mask(self, i, candidates):
+        """
+        Vectorized rematch check of player index i against an array of
+        candidate indices. Unknown indices (-1) never count as played.
+        """
+        candidates = np.asarray(candidates, dtype=np.int64)
+        if i < 0:
+            return np.zeros(candidates.shape, dtype=bool)
+        known = candidates >= 0
+        safe = np.where(known, candidates, 0)
+        return known & ((self._bits[i, safe >> 3] & (0x80 >> (safe & 7))) != 0)
+
+    def eligible_opponents(self, player_id, candidate_ids=None):
+        """
+        Return the ids of all players player_id has not met yet.
+
+        Args:
+            player_id: Player to find opponents for.
+            candidate_ids (list | None): Restrict the answer to these ids,
+                                         defaults to every known player.
+        """
+        if candidate_ids is None:
+            candidate_ids = self.ids
+        candidates = self.indices(candidate_ids)
+        mask = ~self.played_mask(self.index.get(player_id, -1), candidates)
+        return [candidate_ids[k] for k in np.flatnonzero(mask) if candidate_ids[k] != player_id]
+
+    def opponents(self, player_id):
+        """Return the ids of all players player_id has met."""
+        i = self.index.get(player_id)
+        if i is None:
+            return []
+        row = np.unpackbits(self._bits[i], count=len(self.ids))
+        return [self.ids[j] for j in np.flatnonzero(row)]
+
+    def save(self, path, **metadata):
+        """
+        Write the index to an .npz file, together with array-like metadata.
+        The file is replaced atomically so readers never see a partial cache.
+        """
+        n = len(self.ids)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f,
+                     ids=np.array(self.ids, dtype=str),
+                     bits=self._bits[:n, :(n + 7) // 8],
+                     **metadata)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read an index written by save().
+
+        Returns:
+            tuple: (HeadToHead, dict of metadata arrays)
+        """
+        with np.load(path, allow_pickle=False) as data:
+            arrays = {key: data[key] for key in data.files}
+
+        ids = arrays.pop("ids").tolist()
+        bits = arrays.pop("bits")
+
+        head_to_head = cls(ids)
+        head_to_head._bits[:bits.shape[0], :bits.shape[1]] = bits
+        return head_to_head, arrays
+
+    def subset(self, player_ids):
+        """
+        Return the history restricted to player_ids, e.g. to ship a single
+        score group to a worker process without the whole matrix.
+        """
+        player_ids = list(player_ids)
+        sub = HeadToHead(player_ids)
+        idx = self.indices(sub.ids)
+        known = np.flatnonzero(idx >= 0)
+
+        # Unpack a bounded number of rows at a time, full rows are n bytes each
+        for start in range(0, len(known), SUBSET_CHUNK_ROWS):
+            rows = known[start:start + SUBSET_CHUNK_ROWS]
+            unpacked = np.unpackbits(self._bits[idx[rows]], axis=1, count=len(self.ids))
+            block = np.zeros((len(rows), len(sub.ids)), dtype=np.uint8)
+            block[:, known] = unpacked[:, idx[known]]
+            packed = np.packbits(block, axis=1)
+            sub._bits[rows, :packed.shape[1]] = packed
+        return sub
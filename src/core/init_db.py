@@ -1,15 +1,22 @@
 #!/usr/bin/env python3
 
+import argparse
+import hashlib
 import os
+import re
 import psycopg2
-import subprocess
 
-from common.db_utils import get_connection_string
 from common.logger import get_logger
 from common.common import root_dir
 
 logger = get_logger(__name__)
 
+# Migration files: NNNN_description.sql
+MIGRATION_FILE = re.compile(r'^(\d{4})_(\w+)\.sql$')
+
+# pg_advisory_xact_lock key held while a migration runs
+MIGRATION_LOCK_ID = 74201
+
 
 def execute_sql_file(conn, filepath):
     with open(filepath, 'r') as f:
@@ -27,32 +34,143 @@ def execute_sql_file(conn, filepath):
     logger.info(f"{filepath} executed.")
 
 
-def main():
+def migration_files(migrations_path):
+    """
+    Return the migrations found in migrations_path as (version, name, path),
+    in version order. Files are named NNNN_description.sql.
+    """
+    migrations = []
+    for filename in sorted(os.listdir(migrations_path)):
+        match = MIGRATION_FILE.match(filename)
+        if match:
+            migrations.append((match.group(1), match.group(2), os.path.join(migrations_path, filename)))
+    return migrations
 
 
-    db_path = os.path.join(root_dir(__file__), 'db')
-    print(db_path)
+def applied_migrations(conn):
+    """Create the schema_migrations table if needed and return {version: checksum}."""
+    with conn.cursor() as cur:
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version VARCHAR(16) PRIMARY KEY,
+                name VARCHAR(255) NOT NULL,
+                checksum CHAR(32) NOT NULL,
+                applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+            );
+        """)
+        cur.execute("SELECT version, checksum FROM schema_migrations;")
+        applied = dict(cur.fetchall())
+    conn.commit()
+    return applied
 
-    # Connect to new DB as admin
-    try:
-        conn = psycopg2.connect(
-            dbname=os.getenv("DB_NAME", "tournament"),
-            user=os.getenv("DB_USER"),
-            password=os.getenv("DB_PASS"),
-            host=os.getenv("DB_HOST", "localhost"),
-            port=os.getenv("DB_PORT", "5432")
-        )
-        logger.info("Connection to the database was successful.")
-    except Exception as err:
-        logger.error(f"Failed to connect to the database: {err}")
-        exit(1)
+
+def apply_migrations(conn, migrations_path):
+    """
+    Apply every migration of migrations_path not recorded in
+    schema_migrations yet, each in its own transaction together with its
+    bookkeeping row, so a failing migration leaves no trace.
+
+    Returns:
+        list: Versions applied by this call.
+    """
+    applied = applied_migrations(conn)
+    newly_applied = []
+    for version, name, filepath in migration_files(migrations_path):
+        with open(filepath, 'r') as f:
+            sql = f.read()
+        checksum = hashlib.md5(sql.encode()).hexdigest()
+
+        if version in applied:
+            if applied[version] != checksum:
+                logger.warning(f"Migration {version}_{name} changed after it was applied, "
+                               f"add a new migration instead")
+            continue
+
+        try:
+            with conn.cursor() as cur:
+                # Serialize concurrent runners, the lock ends with the transaction
+                cur.execute("SELECT pg_advisory_xact_lock(%s);", (MIGRATION_LOCK_ID,))
+                cur.execute("SELECT 1 FROM schema_migrations WHERE version = %s;", (version,))
+                if cur.fetchone():
+                    conn.rollback()
+                    continue
+                cur.execute(sql)
+                cur.execute("INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s);",
+                            (version, name, checksum))
+            conn.commit()
+        except psycopg2.Error as err:
+            conn.rollback()
+            logger.error(f"Migration {version}_{name} failed and was rolled back: {err}")
+            raise
+
+        newly_applied.append(version)
+        logger.info(f"Migration {version}_{name} applied.")
+
+    if not newly_applied:
+        logger.info("Database schema is up to date.")
+    return newly_applied
+
+
+def print_migration_status(conn, migrations_path):
+    applied = applied_migrations(conn)
+    for version, name, _ in migration_files(migrations_path):
+        print(f"{version}  {'applied' if version in applied else 'pending':<8} {name}")
+
+
+def main(argv=None, conn=None):
+    """
+    Bring the database schema up to date.
+
+    Args:
+        argv (list | None): Command line arguments, sys.argv[1:] if None.
+        conn: Open database connection to use instead of connecting with
+              the DB_* environment variables. It is left open.
+    """
+    parser = argparse.ArgumentParser(
+        prog="init-db",
+        description="Bring the tournament database schema up to date."
+    )
+    parser.add_argument('--reset',
+                        action='store_true',
+                        help='Drop and recreate all tables before migrating (deletes all data)')
+    parser.add_argument('--status',
+                        action='store_true',
+                        help='List applied and pending migrations without changing anything')
+    args = parser.parse_args(argv)
+
+    db_path = os.path.join(root_dir(__file__, 3), 'db')
+    migrations_path = os.path.join(db_path, 'migrations')
+
+    own_conn = conn is None
+    if own_conn:
+        # Connect to new DB as admin
+        try:
+            conn = psycopg2.connect(
+                dbname=os.getenv("DB_NAME", "tournament"),
+                user=os.getenv("DB_USER"),
+                password=os.getenv("DB_PASS"),
+                host=os.getenv("DB_HOST", "localhost"),
+                port=os.getenv("DB_PORT", "5432")
+            )
+            logger.info("Connection to the database was successful.")
+        except Exception as err:
+            logger.error(f"Failed to connect to the database: {err}")
+            exit(1)
 
     try:
+        if args.status:
+            print_migration_status(conn, migrations_path)
+            return
+
         execute_sql_file(conn, os.path.join(db_path, 'schema_permissions.sql'))
-        execute_sql_file(conn, os.path.join(db_path, 'tables.sql'))
+        if args.reset:
+            logger.warning("Resetting the database, all tournament data is deleted.")
+            execute_sql_file(conn, os.path.join(db_path, 'tables.sql'))
+        apply_migrations(conn, migrations_path)
         execute_sql_file(conn, os.path.join(db_path, 'table_permissions.sql'))
     finally:
-        conn.close()
+        if own_conn:
+            conn.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,473 @@
+"""
+Maximum-weight matching on general graphs (Edmonds' blossom algorithm).
+
+This is the primal-dual formulation described by Galil ("Efficient
+algorithms for finding maximum matching in graphs", 1986), following the
+structure of Joris van Rantwijk's reference implementation. Only integer
+edge weights are supported, which keeps every dual update exact.
+
+Complexity:
+    Time  : O(n³) in the worst case, where n is the number of vertices.
+    Space : O(n + m), where m is the number of edges.
+"""
+
+
+def max_weight_matching(edges, max_cardinality=False):
+    """
+    Compute a maximum-weight matching of a general undirected graph.
+
+    Args:
+        edges (list[tuple[int, int, int]]): Edges as (i, j, weight) with
+            non-negative vertex indices i != j and integer weights.
+        max_cardinality (bool): If True, only maximum-cardinality matchings
+            are considered, and the heaviest of those is returned.
+
+    Returns:
+        list[int]: mate[v] is the vertex matched to v, or -1 if v is single.
+    """
+    if not edges:
+        return []
+
+    nedge = len(edges)
+    nvertex = 0
+    for (i, j, w) in edges:
+        if i < 0 or j < 0 or i == j:
+            raise ValueError(f"Invalid edge ({i}, {j})")
+        if not isinstance(w, int):
+            raise TypeError(f"Edge weight must be an integer, got {w!r}")
+        nvertex = max(nvertex, i + 1, j + 1)
+
+    maxweight = max(0, max(w for (_, _, w) in edges))
+
+    # endpoint[p] is the vertex to which endpoint p is attached,
+    # edge k has endpoints 2k and 2k+1.
+    endpoint = [edges[p // 2][p % 2] for p in range(2 * nedge)]
+
+    # neighbend[v] lists the remote endpoints of the edges attached to v.
+    neighbend = [[] for _ in range(nvertex)]
+    for k, (i, j, _) in enumerate(edges):
+        neighbend[i].append(2 * k + 1)
+        neighbend[j].append(2 * k)
+
+    # mate[v] is the remote endpoint of v's matched edge, or -1.
+    # Maximum-weight edges are tight under the initial duals, so a greedy
+    # matching over them is a valid starting point and saves one stage each.
+    mate = nvertex * [-1]
+    for k, (i, j, w) in enumerate(edges):
+        if w == maxweight and mate[i] == -1 and mate[j] == -1:
+            mate[i] = 2 * k + 1
+            mate[j] = 2 * k
+
+    # Labels of top-level blossoms: 0 = free, 1 = S-vertex, 2 = T-vertex.
+    label = (2 * nvertex) * [0]
+    labelend = (2 * nvertex) * [-1]
+
+    inblossom = list(range(nvertex))
+    blossomparent = (2 * nvertex) * [-1]
+    blossomchilds = (2 * nvertex) * [None]
+    blossombase = list(range(nvertex)) + nvertex * [-1]
+    blossomendps = (2 * nvertex) * [None]
+    bestedge = (2 * nvertex) * [-1]
+    blossombestedges = (2 * nvertex) * [None]
+    unusedblossoms = list(range(nvertex, 2 * nvertex))
+
+    # Vertex duals start at maxweight, blossom duals at zero.
+    dualvar = nvertex * [maxweight] + nvertex * [0]
+
+    allowedge = nedge * [False]
+    queue = []
+
+    # Blossoms labeled and free vertices given a best edge during the current
+    # stage. Dual updates only visit these instead of every vertex.
+    labeled = set()
+    candidates = set()
+
+    def slack(k):
+        i, j, wt = edges[k]
+        return dualvar[i] + dualvar[j] - 2 * wt
+
+    def blossom_leaves(b):
+        # Iterative walk: blossoms nest deeply, recursive generators cost O(depth) per leaf.
+        if b < nvertex:
+            return [b]
+        leaves = []
+        stack = [b]
+        while stack:
+            t = stack.pop()
+            if t < nvertex:
+                leaves.append(t)
+            else:
+                stack.extend(blossomchilds[t])
+        return leaves
+
+    def assign_label(w, t, p):
+        b = inblossom[w]
+        label[w] = label[b] = t
+        labelend[w] = labelend[b] = p
+        bestedge[w] = bestedge[b] = -1
+        labeled.add(b)
+        if t == 1:
+            queue.extend(blossom_leaves(b))
+        elif t == 2:
+            base = blossombase[b]
+            assign_label(endpoint[mate[base]], 1, mate[base] ^ 1)
+
+    def scan_blossom(v, w):
+        # Trace back from v and w to discover a new blossom or an augmenting path.
+        path = []
+        base = -1
+        while v != -1 or w != -1:
+            b = inblossom[v]
+            if label[b] & 4:
+                base = blossombase[b]
+                break
+            path.append(b)
+            label[b] = 5
+            if labelend[b] == -1:
+                v = -1
+            else:
+                v = endpoint[labelend[b]]
+                b = inblossom[v]
+                v = endpoint[labelend[b]]
+            if w != -1:
+                v, w = w, v
+        for b in path:
+            label[b] = 1
+        return base
+
+    def add_blossom(base, k):
+        v, w, _ = edges[k]
+        bb = inblossom[base]
+        bv = inblossom[v]
+        bw = inblossom[w]
+
+        b = unusedblossoms.pop()
+        blossombase[b] = base
+        blossomparent[b] = -1
+        blossomparent[bb] = b
+
+        blossomchilds[b] = path = []
+        blossomendps[b] = endps = []
+
+        # Trace back from v to base.
+        while bv != bb:
+            blossomparent[bv] = b
+            path.append(bv)
+            endps.append(labelend[bv])
+            v = endpoint[labelend[bv]]
+            bv = inblossom[v]
+        path.append(bb)
+        path.reverse()
+        endps.reverse()
+        endps.append(2 * k)
+
+        # Trace back from w to base.
+        while bw != bb:
+            blossomparent[bw] = b
+            path.append(bw)
+            endps.append(labelend[bw] ^ 1)
+            w = endpoint[labelend[bw]]
+            bw = inblossom[w]
+
+        label[b] = 1
+        labelend[b] = labelend[bb]
+        dualvar[b] = 0
+        labeled.add(b)
+
+        for v in blossom_leaves(b):
+            if label[inblossom[v]] == 2:
+                # Former T-vertices become S-vertices and must be scanned.
+                queue.append(v)
+            inblossom[v] = b
+
+        # Compute the least-slack edges to neighbouring S-blossoms.
+        bestedgeto = (2 * nvertex) * [-1]
+        for bv in path:
+            if blossombestedges[bv] is None:
+                nblists = [[p // 2 for p in neighbend[v]] for v in blossom_leaves(bv)]
+            else:
+                nblists = [blossombestedges[bv]]
+            for nblist in nblists:
+                for k in nblist:
+                    i, j, _ = edges[k]
+                    if inblossom[j] == b:
+                        i, j = j, i
+                    bj = inblossom[j]
+                    if bj != b and label[bj] == 1 and \
+                       (bestedgeto[bj] == -1 or slack(k) < slack(bestedgeto[bj])):
+                        bestedgeto[bj] = k
+            blossombestedges[bv] = None
+            bestedge[bv] = -1
+        blossombestedges[b] = [k for k in bestedgeto if k != -1]
+
+        bestedge[b] = -1
+        for k in blossombestedges[b]:
+            if bestedge[b] == -1 or slack(k) < slack(bestedge[b]):
+                bestedge[b] = k
+
+    def expand_blossom(b, endstage):
+        # Convert sub-blossoms into top-level blossoms.
+        for s in blossomchilds[b]:
+            blossomparent[s] = -1
+            if s < nvertex:
+                inblossom[s] = s
+            elif endstage and dualvar[s] == 0:
+                expand_blossom(s, endstage)
+            else:
+                for v in blossom_leaves(s):
+                    inblossom[v] = s
+
+        # If we expand a T-blossom during a stage, its sub-blossoms must be relabeled.
+        if not endstage and label[b] == 2:
+            entrychild = inblossom[endpoint[labelend[b] ^ 1]]
+            j = blossomchilds[b].index(entrychild)
+            if j & 1:
+                j -= len(blossomchilds[b])
+                jstep = 1
+                endptrick = 0
+            else:
+                jstep = -1
+                endptrick = 1
+
+            # Move along the blossom until we get to the base.
+            p = labelend[b]
+            while j != 0:
+                label[endpoint[p ^ 1]] = 0
+                label[endpoint[blossomendps[b][j - endptrick] ^ endptrick ^ 1]] = 0
+                assign_label(endpoint[p ^ 1], 2, p)
+                allowedge[blossomendps[b][j - endptrick] // 2] = True
+                j += jstep
+                p = blossomendps[b][j - endptrick] ^ endptrick
+                allowedge[p // 2] = True
+                j += jstep
+
+            # Relabel the base T-sub-blossom without stepping through to its mate.
+            bv = blossomchilds[b][j]
+            label[endpoint[p ^ 1]] = label[bv] = 2
+            labelend[endpoint[p ^ 1]] = labelend[bv] = p
+            bestedge[bv] = -1
+            labeled.add(bv)
+
+            # Continue along the blossom until we get back to entrychild.
+            j += jstep
+            while blossomchilds[b][j] != entrychild:
+                bv = blossomchilds[b][j]
+                if label[bv] == 1:
+                    j += jstep
+                    continue
+                for v in blossom_leaves(bv):
+                    if label[v] != 0:
+                        break
+                if label[v] != 0:
+                    label[v] = 0
+                    label[endpoint[mate[blossombase[bv]]]] = 0
+                    assign_label(v, 2, labelend[v])
+                j += jstep
+
+        # Recycle the blossom number.
+        label[b] = labelend[b] = -1
+        blossomchilds[b] = blossomendps[b] = None
+        blossombase[b] = -1
+        blossombestedges[b] = None
+        bestedge[b] = -1
+        unusedblossoms.append(b)
+
+    def augment_blossom(b, v):
+        # Swap matched/unmatched edges over an alternating path through
+        # blossom b between vertex v and the base vertex.
+        t = v
+        while blossomparent[t] != b:
+            t = blossomparent[t]
+        if t >= nvertex:
+            augment_blossom(t, v)
+
+        i = j = blossomchilds[b].index(t)
+        if i & 1:
+            j -= len(blossomchilds[b])
+            jstep = 1
+            endptrick = 0
+        else:
+            jstep = -1
+            endptrick = 1
+
+        while j != 0:
+            j += jstep
+            t = blossomchilds[b][j]
+            p = blossomendps[b][j - endptrick] ^ endptrick
+            if t >= nvertex:
+                augment_blossom(t, endpoint[p])
+            j += jstep
+            t = blossomchilds[b][j]
+            if t >= nvertex:
+                augment_blossom(t, endpoint[p ^ 1])
+            mate[endpoint[p]] = p ^ 1
+            mate[endpoint[p ^ 1]] = p
+
+        # Rotate the list of sub-blossoms to put the new base at the front.
+        blossomchilds[b] = blossomchilds[b][i:] + blossomchilds[b][:i]
+        blossomendps[b] = blossomendps[b][i:] + blossomendps[b][:i]
+        blossombase[b] = blossombase[blossomchilds[b][0]]
+
+    def augment_matching(k):
+        # Swap matched/unmatched edges over the augmenting path through edge k.
+        v, w, _ = edges[k]
+        for (s, p) in ((v, 2 * k + 1), (w, 2 * k)):
+            while True:
+                bs = inblossom[s]
+                if bs >= nvertex:
+                    augment_blossom(bs, s)
+                mate[s] = p
+                if labelend[bs] == -1:
+                    # Reached a single vertex, stop.
+                    break
+                t = endpoint[labelend[bs]]
+                bt = inblossom[t]
+                s = endpoint[labelend[bt]]
+                j = endpoint[labelend[bt] ^ 1]
+                if bt >= nvertex:
+                    augment_blossom(bt, j)
+                mate[j] = labelend[bt]
+                p = labelend[bt] ^ 1
+
+    # Each iteration of this loop is a "stage":
+    # a stage finds an augmenting path and uses it to improve the matching.
+    for _ in range(nvertex):
+        label[:] = (2 * nvertex) * [0]
+        bestedge[:] = (2 * nvertex) * [-1]
+        blossombestedges[nvertex:] = nvertex * [None]
+        allowedge[:] = nedge * [False]
+        queue[:] = []
+        labeled.clear()
+        candidates.clear()
+
+        # Label single top-level blossoms with S.
+        for v in range(nvertex):
+            if mate[v] == -1 and label[inblossom[v]] == 0:
+                assign_label(v, 1, -1)
+
+        augmented = False
+        while True:
+            # Continue labeling until all vertices reachable through an
+            # alternating path are labeled, or an augmenting path is found.
+            while queue and not augmented:
+                v = queue.pop()
+                for p in neighbend[v]:
+                    k = p // 2
+                    w = endpoint[p]
+                    if inblossom[v] == inblossom[w]:
+                        continue
+                    if not allowedge[k]:
+                        kslack = slack(k)
+                        if kslack <= 0:
+                            allowedge[k] = True
+                    if allowedge[k]:
+                        if label[inblossom[w]] == 0:
+                            # w is free: label it T and its mate S.
+                            assign_label(w, 2, p ^ 1)
+                        elif label[inblossom[w]] == 1:
+                            # w is an S-vertex: new blossom or augmenting path.
+                            base = scan_blossom(v, w)
+                            if base >= 0:
+                                add_blossom(base, k)
+                            else:
+                                augment_matching(k)
+                                augmented = True
+                                break
+                        elif label[w] == 0:
+                            # w is inside a T-blossom but not yet reached.
+                            label[w] = 2
+                            labelend[w] = p ^ 1
+                    elif label[inblossom[w]] == 1:
+                        b = inblossom[v]
+                        if bestedge[b] == -1 or kslack < slack(bestedge[b]):
+                            bestedge[b] = k
+                    elif label[w] == 0:
+                        if bestedge[w] == -1 or kslack < slack(bestedge[w]):
+                            bestedge[w] = k
+                            candidates.add(w)
+
+            if augmented:
+                break
+
+            # No augmenting path with tight edges: compute the dual update.
+            # Only top-level labeled blossoms take part in it.
+            top = [b for b in labeled if blossomparent[b] == -1 and label[b] in (1, 2)]
+            deltatype = -1
+            delta = deltaedge = deltablossom = None
+
+            # delta1: minimum value of any vertex dual.
+            if not max_cardinality:
+                deltatype = 1
+                delta = min(dualvar[:nvertex])
+
+            # delta2: minimum slack on any edge between an S-vertex and a free vertex.
+            for v in candidates:
+                if label[inblossom[v]] == 0 and bestedge[v] != -1:
+                    d = slack(bestedge[v])
+                    if deltatype == -1 or d < delta:
+                        delta = d
+                        deltatype = 2
+                        deltaedge = bestedge[v]
+
+            # delta3: half the minimum slack on any edge between two S-blossoms.
+            for b in top:
+                if label[b] == 1 and bestedge[b] != -1:
+                    d = slack(bestedge[b]) // 2
+                    if deltatype == -1 or d < delta:
+                        delta = d
+                        deltatype = 3
+                        deltaedge = bestedge[b]
+
+            # delta4: minimum dual of any T-blossom.
+            for b in top:
+                if b >= nvertex and label[b] == 2 and \
+                   (deltatype == -1 or dualvar[b] < delta):
+                    delta = dualvar[b]
+                    deltatype = 4
+                    deltablossom = b
+
+            if deltatype == -1:
+                # No further improvement possible; max-cardinality optimum reached.
+                deltatype = 1
+                delta = max(0, min(dualvar[:nvertex]))
+
+            # Update the dual variables.
+            for b in top:
+                sign = 1 if label[b] == 1 else -1
+                for v in blossom_leaves(b):
+                    dualvar[v] -= sign * delta
+                if b >= nvertex:
+                    dualvar[b] += sign * delta
+
+            if deltatype == 1:
+                # No further improvement possible; optimum reached.
+                break
+            elif deltatype == 2:
+                allowedge[deltaedge] = True
+                i, j, _ = edges[deltaedge]
+                if label[inblossom[i]] == 0:
+                    i, j = j, i
+                queue.append(i)
+            elif deltatype == 3:
+                allowedge[deltaedge] = True
+                i, j, _ = edges[deltaedge]
+                queue.append(i)
+            elif deltatype == 4:
+                expand_blossom(deltablossom, False)
+
+        # Stop when no more augmenting paths can be found.
+        if not augmented:
+            break
+
+        # End of a stage: expand all S-blossoms which have dualvar = 0.
+        for b in range(nvertex, 2 * nvertex):
+            if blossomparent[b] == -1 and blossombase[b] >= 0 and \
+               label[b] == 1 and dualvar[b] == 0:
+                expand_blossom(b, True)
+
+    # Transform mate[] such that mate[v] is the vertex to which v is paired.
+    for v in range(nvertex):
+        if mate[v] >= 0:
+            mate[v] = endpoint[mate[v]]
+
+    return mate
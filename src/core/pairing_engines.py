@@ -0,0 +1,477 @@
+from itertools import groupby
+import os
+
+import numpy as np
+
+from core.matching import max_weight_matching
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Number of neighbours (in ranking order) each player is connected to
+# in the matching graph before the window is widened.
+DEFAULT_WINDOW = 8
+
+# Number of players matched together before floaters move down a block.
+DEFAULT_BLOCK_SIZE = 256
+
+# Below this field size score groups are paired in-process, a worker pool
+# costs more to start than it saves.
+PARALLEL_MIN_PLAYERS = 1000
+
+
+# Set a verdict if player1 has played against player2
+def have_played_before(head_to_head_map, player1_id, player2_id):
+    return head_to_head_map.played(player1_id, player2_id)
+
+
+def _count(stats, key, amount=1):
+    if stats is not None:
+        stats[key] = stats.get(key, 0) + amount
+
+
+def greedy_pairing(players, head_to_head_map, stats=None):
+    """
+    Generate Swiss-style tournament pairings with a greedy top-down scan.
+
+    The Swiss pairing algorithm:
+    1. Avoids pairing players who have already played each other.
+    2. Pairs players close in ranking order.
+    3. Handles BYE players first (those resting or absent).
+    4. Tries to fix conflicts by swapping opponents if necessary.
+    5. Assigns a 'BYE' if no valid opponent is available.
+
+    Args:
+        players (list): List of player objects with attributes:
+                        - id
+                        - name
+                        - is_bye (bool)
+        head_to_head_map (HeadToHead): Head-to-head history of already played matches.
+        stats (dict | None): Receives the number of "swaps" performed.
+
+    Returns:
+        list of tuples: Each tuple contains (playerA, playerB) or (player, 'BYE').
+
+    Algorithm Complexity:
+        Time Complexity:
+            O(n²) —
+                The algorithm may compare each player with all others
+                to ensure no repeated matchups, and can backtrack or
+                swap pairings in conflict cases. This quadratic growth
+                is typical for Swiss pairing algorithms of moderate player counts.
+
+        Space Complexity:
+            O(n) —
+                - O(n) for tracking paired players and pairings.
+                - The head-to-head index is owned by the caller (O(n² / 8) bytes).
+    """
+    paired_players = set()
+    pairings = []
+
+    # Handle BYE players (rested players) firs
+    for i in range(len(players) - 1, -1, -1):
+        player = players[i]
+        if player.is_bye and player.id not in paired_players:
+            left_player = player
+            paired_players.add(player.id)
+
+            # Try to pair BYE player with someone above in rankings
+            for j in range(i - 1, -1, -1):
+                opponent = players[j]
+                if not opponent.is_bye and opponent.id not in paired_players and \
+                   not have_played_before(head_to_head_map, left_player.id, opponent.id):
+                    pairings.append((left_player, opponent))
+                    paired_players.add(opponent.id)
+                    logger.debug(f"{left_player.id} {left_player.name} - {opponent.name} {opponent.id}")
+                    break
+            else:
+                # No valid opponent found upwards, try downwards
+                for j in range(i, len(players)):
+                    opponent = players[j]
+                    if not opponent.is_bye and opponent.id not in paired_players and \
+                       not have_played_before(head_to_head_map, left_player.id, opponent.id):
+                        pairings.append((left_player, opponent))
+                        paired_players.add(opponent.id)
+                        logger.debug(f"{left_player.id} {left_player.name} - {opponent.name} {opponent.id}")
+                        break
+
+    # Pair remaining active players from top to bottom
+    for i, left_player in enumerate(players):
+        if left_player.id in paired_players:
+            continue
+
+        paired_players.add(left_player.id)
+        paired = False  # Track if we found a valid opponent
+
+        for j, right_player in enumerate(players[i:], start=i):
+            if right_player.id in paired_players:
+                continue
+
+            # Case: They haven't played before — simple pairing
+            if not have_played_before(head_to_head_map, left_player.id, right_player.id):
+                pairings.append((left_player, right_player))
+                paired_players.add(right_player.id)
+                paired = True
+                logger.debug(f"{left_player.id} {left_player.name} - {right_player.name} {right_player.id}")
+                break
+
+            # Case: All possible opponents already played — try reshuffling
+            if j == len(players) - 1:
+                for k in range(len(pairings) - 1, -1, -1):
+                    player1, player2 = pairings[k]
+                    id1, id2 = player1.id, player2.id
+
+                    # Try swapping with pair (player1, player2)
+                    if not have_played_before(head_to_head_map, left_player.id, id2) and \
+                    not have_played_before(head_to_head_map, id1, right_player.id):
+                        pairings[k] = (player1, right_player)
+                        pairings.append((left_player, player2))
+                        paired_players.add(right_player.id)
+                        paired = True
+                        _count(stats, "swaps")
+                        logger.debug(f"Swap pairing: {id1}-{right_player.id}, {left_player.id}-{player2.id}")
+                        break
+
+                    elif not have_played_before(head_to_head_map, left_player.id, id1) and \
+                        not have_played_before(head_to_head_map, right_player.id, id2):
+                        pairings[k] = (player1, left_player)
+                        pairings.append((right_player, player2))
+                        paired_players.add(right_player.id)
+                        paired = True
+                        _count(stats, "swaps")
+                        logger.debug(f"Swap pairing: {id1}-{left_player.id}, {right_player.id}-{player2.id}")
+                        break
+        # If no pairing found at all — assign BYE
+        if not paired:
+            if left_player.is_bye:
+                raise ValueError(f"Player {left_player.name} (ID {left_player.id}) has already received a BYE before!")
+            pairings.append((left_player, 'BYE'))
+            logger.debug(f"{left_player.id} {left_player.name} - BYE")
+
+    return pairings
+
+
+def _pairing_edges(players, head_to_head_map, window, final):
+    """
+    Build the weighted edge list of the pairing graph of one block.
+
+    Vertices 0..n-1 are the players in ranking order, vertex n is a virtual
+    opponent that only exists for odd blocks: the BYE in the final block,
+    a float down into the next block otherwise. Edge weights are integers:
+    a score-group difference always costs more than any rank distance, and
+    rematches have no edge at all (hard ban).
+    """
+    n = len(players)
+    score_weight = n + 1
+    max_points = max((float(p.points) for p in players), default=0.0)
+    base = score_weight * int(4 * max_points + 1) ** 2 + n + 1
+
+    points = [float(p.points) for p in players]
+    index = head_to_head_map.indices([p.id for p in players])
+
+    edges = []
+    for i in range(n):
+        upper = n if window is None else min(n, i + window + 1)
+        played = head_to_head_map.played_mask(index[i], index[i + 1:upper])
+        for j in np.flatnonzero(~played) + i + 1:
+            j = int(j)
+            score_diff = round(2 * abs(points[i] - points[j]))
+            edges.append((i, j, base - score_weight * score_diff ** 2 - (j - i)))
+
+    if n % 2 == 1:
+        # Both the BYE and the float act like an opponent from the lowest score
+        # group and prefer the lowest ranked player who has not rested yet,
+        # only those may receive the BYE in the final block
+        min_points = min(float(p.points) for p in players)
+        for i, player in enumerate(players):
+            score_diff = round(2 * (float(player.points) - min_points))
+            weight = base - score_weight * score_diff ** 2 - (n - 1 - i)
+            if not player.is_bye:
+                edges.append((i, n, weight))
+            elif not final:
+                edges.append((i, n, weight - n))
+
+    return edges
+
+
+def _match_block(players, head_to_head_map, window, final):
+    """
+    Solve the matching of one block, widening the window while players are
+    left unpaired for lack of edges rather than because of the history.
+
+    Returns:
+        tuple: (pairings, unpaired players)
+    """
+    n = len(players)
+
+    while True:
+        edges = _pairing_edges(players, head_to_head_map, window, final)
+        mate = max_weight_matching(edges, max_cardinality=True)
+        mate += [-1] * (n + 1 - len(mate))
+
+        singles = [i for i in range(n) if mate[i] == -1]
+        if len(singles) <= n % 2 or window is None or window >= n:
+            break
+
+        window *= 2
+        logger.debug(f"{len(singles)} unpaired players, widening matching window to {window}")
+
+    pairings = []
+    unpaired = []
+    for i, player in enumerate(players):
+        j = mate[i]
+        if j == n and final:
+            pairings.append((player, 'BYE'))
+        elif j > i and j < n:
+            pairings.append((player, players[j]))
+        elif j == -1 or j == n:
+            unpaired.append(player)
+
+    return pairings, unpaired
+
+
+def _match_blocks(players, head_to_head_map, window, block_size, final, stats=None):
+    """
+    Match consecutive ranking blocks, floating unpaired players downwards.
+
+    Returns:
+        tuple: (pairings, players left unpaired after the last block)
+    """
+    n = len(players)
+    num_blocks = 1 if not block_size else max(1, round(n / block_size))
+    bounds = [n * b // num_blocks for b in range(num_blocks + 1)]
+
+    pairings = []
+    floaters = []
+    for b in range(num_blocks):
+        block = floaters + players[bounds[b]:bounds[b + 1]]
+        last = b == num_blocks - 1
+
+        block_pairs, floaters = _match_block(block, head_to_head_map, window, final and last)
+        pairings.extend(block_pairs)
+
+        if floaters and not last:
+            _count(stats, "floaters", len(floaters))
+            logger.debug(f"Block {b + 1}/{num_blocks}: {len(floaters)} players float down")
+
+    return pairings, floaters
+
+
+def _assign_byes(pairings, unpaired):
+    # No opponent left at all — assign BYE
+    for player in unpaired:
+        if player.is_bye:
+            raise ValueError(f"Player {player.name} (ID {player.id}) has already received a BYE before!")
+        pairings.append((player, 'BYE'))
+
+    for player1, player2 in pairings:
+        if player2 == 'BYE':
+            logger.debug(f"{player1.id} {player1.name} - BYE")
+        else:
+            logger.debug(f"{player1.id} {player1.name} - {player2.name} {player2.id}")
+
+    return pairings
+
+
+def matching_pairing(players, head_to_head_map, window=DEFAULT_WINDOW, block_size=DEFAULT_BLOCK_SIZE, stats=None):
+    """
+    Generate Swiss-style tournament pairings as a maximum-weight matching.
+
+    Each round is modelled as a weighted graph where every player is a
+    vertex and every allowed game is an edge. Among all matchings with the
+    largest number of games (fewest BYEs), the one with the smallest total
+    score difference, then smallest total rank distance, is chosen.
+
+    Large fields are split into consecutive blocks of `block_size` players
+    in ranking order. Each block is matched on its own and players it
+    cannot pair float down to the top of the next block, so the cubic cost
+    of the blossom algorithm only applies per block.
+
+    Args:
+        players (list): Player objects in ranking order with attributes:
+                        - id
+                        - name
+                        - is_bye (bool)
+                        - points
+        head_to_head_map (HeadToHead): Head-to-head history of already played matches.
+        window (int | None): Each player is only connected to the next
+                             `window` players in ranking order. The window is
+                             doubled until no avoidable BYE is left.
+                             None builds the complete graph.
+        block_size (int | None): Number of players matched together.
+                                 None matches the whole field at once.
+        stats (dict | None): Receives the number of "floaters" between blocks.
+
+    Returns:
+        list of tuples: Each tuple contains (playerA, playerB) or (player, 'BYE').
+
+    Complexity:
+        Time  : O(n · block_size²) in practice, O(n³) worst case
+                for the blossom algorithm on a single block.
+        Space : O(block_size · window)
+    """
+    pairings, unpaired = _match_blocks(players, head_to_head_map, window, block_size, final=True, stats=stats)
+    return _assign_byes(pairings, unpaired)
+
+
+def _pair_score_group(group, head_to_head_map, final):
+    """Match a single score group, players it cannot pair are returned."""
+    return _match_blocks(group, head_to_head_map, DEFAULT_WINDOW, DEFAULT_BLOCK_SIZE, final)
+
+
+def score_group_pairing(players, head_to_head_map, workers=None, stats=None):
+    """
+    Generate Swiss-style tournament pairings score group by score group.
+
+    Players are split into score groups by points. Walking the groups top
+    down, an odd group sends its lowest ranked player (preferring one who
+    has not rested yet) down into the next group, so every group but the
+    last has an even size and no longer depends on the others. The groups
+    are then matched at the same time in a process pool. Players left over
+    because of the head-to-head history are matched in a final sequential
+    pass; if that would cost an avoidable BYE, the whole field falls back
+    to matching_pairing.
+
+    Args:
+        players (list): Player objects in ranking order with attributes:
+                        - id
+                        - name
+                        - is_bye (bool)
+                        - points
+        head_to_head_map (HeadToHead): Head-to-head history of already played matches.
+        workers (int | None): Size of the process pool (default: CPU count),
+                              1 pairs all groups in-process.
+        stats (dict | None): Receives the number of "floaters" between groups.
+
+    Returns:
+        list of tuples: Each tuple contains (playerA, playerB) or (player, 'BYE').
+
+    Complexity:
+        Time  : O(Σ g · block_size²) over score groups of size g,
+                divided across `workers` processes.
+        Space : O(Σ g² / 8) for the per-group head-to-head slices.
+    """
+    groups = [list(group) for _, group in groupby(players, key=lambda p: float(p.points))]
+
+    # Decide the floaters up front so the groups can be paired independently
+    brackets = []
+    floaters = []
+    for index, group in enumerate(groups):
+        bracket = floaters + group
+        final = index == len(groups) - 1
+        floaters = []
+        if len(bracket) % 2 == 1 and not final:
+            floater = next((p for p in reversed(group) if not p.is_bye), group[-1])
+            bracket.remove(floater)
+            floaters.append(floater)
+            _count(stats, "floaters")
+        brackets.append((bracket, final))
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(brackets) < 2 or len(players) < PARALLEL_MIN_PLAYERS:
+        results = [_pair_score_group(bracket, head_to_head_map, final) for bracket, final in brackets]
+    else:
+        # multiprocessing is only imported when a pool is actually used
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Ship each worker only the history of its own bracket
+        histories = [head_to_head_map.subset(p.id for p in bracket) for bracket, _ in brackets]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_pair_score_group,
+                                    [bracket for bracket, _ in brackets],
+                                    histories,
+                                    [final for _, final in brackets]))
+
+    # Workers return copies, map them back to the caller's player objects
+    by_id = {player.id: player for player in players}
+    pairings = []
+    leftovers = []
+    for bracket_pairs, unpaired in results:
+        pairings.extend((by_id[p1.id], p2 if p2 == 'BYE' else by_id[p2.id]) for p1, p2 in bracket_pairs)
+        leftovers.extend(by_id[p.id] for p in unpaired)
+
+    logger.debug(f"{len(groups)} score groups paired, {len(leftovers)} players left over")
+
+    leftovers.sort(key=lambda p: p.rank)
+    _count(stats, "floaters", len(leftovers))
+    leftover_pairs, unpaired = _match_blocks(leftovers, head_to_head_map, DEFAULT_WINDOW, DEFAULT_BLOCK_SIZE, final=False)
+    pairings.extend(leftover_pairs)
+
+    byes = sum(1 for _, p2 in pairings if p2 == 'BYE') + len(unpaired)
+    if byes > len(players) % 2 or any(p.is_bye for p in unpaired):
+        logger.warning(f"{len(unpaired)} players could not be paired in score groups, falling back to full matching")
+        return matching_pairing(players, head_to_head_map, stats=stats)
+
+    return _assign_byes(pairings, unpaired)
+
+
+def round_robin_pairing(players):
+    """
+    Generate all round-robin pairings for a list of active player objects.
+
+    Each player faces every other player exactly once.
+    If there is an odd number of players, one receives a BYE each round.
+
+    Args:
+        players (list): List of player objects with at least attributes:
+                        - id
+                        - name
+                        - rank (optional, used for sorting/logging)
+
+    Returns:
+        list[list[tuple]]: A list of rounds,
+                           where each round is a list of (playerA, playerB) tuples.
+                           A BYE is represented as (player, 'BYE').
+
+    Algorithm:
+        - Implements the "circle method" for round-robin scheduling.
+        - Ensures each player plays every other exactly once.
+        - BYE pairings appear only if the player count is odd.
+
+    Complexity:
+        Time  : O(n²)
+        Space : O(n²)
+    """
+
+    players = players[:]  # Copy list to avoid mutation
+    n = len(players)
+    has_bye = False
+
+    # Handle odd number of players
+    if n % 2 == 1:
+        has_bye = True
+        n += 1
+
+    rounds = []
+    for round_index in range(n - 1):
+        round_pairs = []
+
+        for i in range(n // 2):
+            if has_bye and (i == 0 and round_index % n < len(players)):
+                # Give BYE to one player each round in rotation
+                bye_player = players[(round_index + i) % len(players)]
+                round_pairs.append((bye_player, 'BYE'))
+                continue
+
+            # Determine real matchups
+            p1_index = (round_index + i) % len(players)
+            p2_index = (round_index + n - 1 - i) % len(players)
+
+            if p1_index == p2_index:
+                continue  # skip self-match in odd count
+
+            p1 = players[p1_index]
+            p2 = players[p2_index]
+            if p1 != p2:
+                round_pairs.append((p1, p2))
+
+        rounds.append(round_pairs)
+
+    return rounds
+
+
+ENGINES = {
+    "greedy": greedy_pairing,
+    "matching": matching_pairing,
+    "score-groups": score_group_pairing,
+}
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+
+import csv
+from contextlib import closing, nullcontext
+from pathlib import Path
+import argparse
+import os
+
+from common.logger import get_logger
+from common.common import root_dir
+
+logger = get_logger(__name__)
+
+# Columns expected in the players CSV header, in any order
+PLAYER_COLUMNS = ('id', 'name', 'email')
+
+# Columns the players CSV header may add, e.g. generated load-test ratings
+OPTIONAL_PLAYER_COLUMNS = ('rating',)
+
+# Invalid rows logged individually, the full list goes to --reject-file
+MAX_REPORTED_ERRORS = 50
+
+
+def open_csv(csv_file):
+    """Open a CSV file path, or pass an already open text stream through."""
+    if isinstance(csv_file, (str, os.PathLike)):
+        return open(csv_file, newline='')
+    return nullcontext(csv_file)
+
+
+def check_header(header):
+    """Raise ValueError unless the CSV header holds the player columns, each once."""
+    if (len(set(header)) != len(header) or not set(PLAYER_COLUMNS) <= set(header)
+            or not set(header) <= set(PLAYER_COLUMNS + OPTIONAL_PLAYER_COLUMNS)):
+        raise ValueError(f"Unexpected CSV header {header}, expected the columns {', '.join(PLAYER_COLUMNS)} "
+                         f"and optionally {', '.join(OPTIONAL_PLAYER_COLUMNS)}")
+
+
+def copy_players_to_staging(cur, csv_file):
+    """
+    Stream the CSV file (a path or an open text stream) into a temporary
+    staging table with COPY.
+    All columns are TEXT so that no row is rejected before validation.
+
+    Returns:
+        int: Number of rows copied.
+    """
+    cur.execute("""
+        CREATE TEMP TABLE players_staging (
+            row_number BIGSERIAL,
+            id TEXT,
+            name TEXT,
+            email TEXT,
+            rating TEXT,
+            reason TEXT
+        ) ON COMMIT DROP;
+    """)
+    with open_csv(csv_file) as csvfile:
+        header = next(csv.reader(csvfile), [])
+        check_header(header)
+        # Columns are copied in the order of the file, the header was validated above
+        cur.copy_expert(f"COPY players_staging ({', '.join(header)}) FROM STDIN WITH (FORMAT csv)", csvfile)
+    cur.execute("SELECT COUNT(*) FROM players_staging;")
+    return cur.fetchone()[0]
+
+
+def find_invalid_players(cur):
+    """
+    Validate the staging table in one pass and record the reason of every
+    invalid row in its reason column. Exact duplicate rows and players
+    already registered with the same name and email are not errors, the
+    merge skips them.
+
+    The SQL is shared by the Postgres and SQLite storages, so it sticks to
+    what both understand (trim, ltrim with a character set, UPDATE ... FROM).
+
+    Returns:
+        list of tuples: (row number, id, reason) for every invalid row.
+    """
+    cur.execute("""
+        UPDATE players_staging AS staged
+        SET reason = checked.reason
+        FROM (
+            SELECT s.row_number,
+                   CASE
+                       WHEN s.id IS NULL OR trim(s.id) = '' THEN 'missing id'
+                       WHEN length(s.id) > 25 THEN 'id longer than 25 characters'
+                       WHEN s.name IS NULL OR trim(s.name) = '' THEN 'missing name'
+                       WHEN length(s.name) > 255 THEN 'name longer than 255 characters'
+                       WHEN s.email IS NULL OR trim(s.email) = '' THEN 'missing email'
+                       WHEN length(s.email) > 255 THEN 'email longer than 255 characters'
+                       WHEN ltrim(trim(s.rating), '0123456789') <> '' OR length(trim(s.rating)) NOT BETWEEN 1 AND 4
+                           THEN 'rating is not a whole number from 0 to 9999'
+                       WHEN MIN(s.name) OVER same_id <> MAX(s.name) OVER same_id
+                         OR MIN(s.email) OVER same_id <> MAX(s.email) OVER same_id
+                           THEN 'id appears with different name or email'
+                       WHEN p.id IS NOT NULL AND (p.name <> s.name OR p.email <> s.email)
+                           THEN 'id already registered with a different name or email'
+                   END AS reason
+            FROM players_staging AS s
+            LEFT JOIN players AS p ON p.id = s.id
+            WINDOW same_id AS (PARTITION BY s.id)
+        ) AS checked
+        WHERE staged.row_number = checked.row_number AND checked.reason IS NOT NULL;
+    """)
+    cur.execute("SELECT row_number, id, reason FROM players_staging WHERE reason IS NOT NULL ORDER BY row_number;")
+    return cur.fetchall()
+
+
+def merge_staged_players(cur):
+    """
+    Insert the valid, deduplicated staging rows into players in one
+    statement: the first valid row of every id, unless it is registered.
+
+    Returns:
+        int: Number of new players.
+    """
+    cur.execute("""
+        INSERT INTO players (id, name, email, rating)
+        SELECT id, name, email, CAST(trim(rating) AS INTEGER)
+        FROM players_staging
+        WHERE row_number IN (SELECT MIN(row_number) FROM players_staging WHERE reason IS NULL GROUP BY id)
+        ON CONFLICT (id) DO NOTHING;
+    """)
+    return cur.rowcount
+
+
+def write_rejected(reject_file, rejected):
+    with open(reject_file, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['row', 'id', 'reason'])
+        writer.writerows(rejected)
+    logger.info(f"Rejected rows written to {reject_file}")
+
+
+def register_players(conn, csv_file, skip_invalid=False, reject_file=None, stage=copy_players_to_staging):
+    """
+    Bulk register the players of a CSV file.
+
+    The file is streamed into a staging table with COPY, validated and
+    deduplicated there with set-based queries and merged into players with
+    a single INSERT ... SELECT. All invalid rows are reported together.
+
+    Args:
+        conn: Database connection (psycopg2, or sqlite3 with its own stage).
+        csv_file (str | file): CSV file with an id,name,email header and an
+                               optional rating column, or an open text
+                               stream of one.
+        skip_invalid (bool): Register the valid rows even if some are invalid,
+                             otherwise nothing is registered.
+        reject_file (str | None): Write every invalid row to this CSV file.
+        stage (callable): stage(cur, csv_file) fills the players_staging
+                          table and returns its row count.
+
+    Returns:
+        int: Number of newly registered players.
+
+    Complexity:
+        Round trips : O(1) — the file is streamed in a single COPY.
+    """
+    try:
+        with closing(conn.cursor()) as cur:
+            copied = stage(cur, csv_file)
+            logger.debug(f"{copied} rows copied to the staging table")
+
+            rejected = find_invalid_players(cur)
+            for row_number, player_id, reason in rejected[:MAX_REPORTED_ERRORS]:
+                logger.error(f"Row {row_number} (id {player_id!r}): {reason}")
+            if len(rejected) > MAX_REPORTED_ERRORS:
+                logger.error(f"... and {len(rejected) - MAX_REPORTED_ERRORS} more invalid rows")
+            if rejected and reject_file:
+                write_rejected(reject_file, rejected)
+            if rejected and not skip_invalid:
+                raise ValueError(f"{len(rejected)} of {copied} rows are invalid, use --skip-invalid "
+                                 f"to register the valid rows only")
+
+            registered = merge_staged_players(cur)
+
+        conn.commit()
+        logger.info(f"{registered} players registered successfully "
+                    f"({copied - len(rejected) - registered} duplicates or already registered, "
+                    f"{len(rejected)} invalid rows skipped).")
+        return registered
+    except Exception as err:
+        conn.rollback()
+        logger.error("An unexpected error occurred. Rolled back all changes.")
+        logger.error(f"Reason: {err}")
+        return 0
+
+
+def main(argv=None, conn=None):
+    """
+    Register the players of a CSV file.
+
+    Args:
+        argv (list | None): Command line arguments, sys.argv[1:] if None.
+        conn: Open database connection or Storage to use instead of connecting to --conn.
+    """
+    parser = argparse.ArgumentParser(prog="register-players")
+    parser.add_argument('--conn',
+                        help='PostgreSQL connection string, or sqlite:///<file> for a local database '
+                             '(default: from DB_* environment variables)')
+    parser.add_argument('--csv-file',
+                        help='CSV file containing player data',
+                        default=os.path.join(root_dir(__file__), 'data/players.csv'))
+    parser.add_argument('--skip-invalid',
+                        action='store_true',
+                        help='Register the valid rows even if the file contains invalid ones')
+    parser.add_argument('--reject-file',
+                        help='Write every invalid row with its reason to this CSV file')
+    args = parser.parse_args(argv)
+
+    # Imported here, core.storage builds on the functions of this module
+    from core.storage import open_storage
+
+    with open_storage(args.conn, conn) as storage:
+        # Register players from CSV file
+        storage.register_players(args.csv_file, args.skip_invalid, args.reject_file)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+
+from pathlib import Path
+import argparse
+from psycopg2.extras import execute_values
+import csv
+import os
+import sys
+
+from core.register_players import open_csv
+from common.logger import get_logger
+from common.common import root_dir
+
+logger = get_logger(__name__)
+
+
+def get_max_round_id(conn) -> int:
+    """Return the maximum round_id from results table (0 if empty)."""
+    with conn.cursor() as cur:
+        cur.execute("SELECT COALESCE(MAX(round_id), 0) FROM results;")
+        return cur.fetchone()[0]
+
+# Scores a player can make in a single game
+VALID_SCORES = (0.0, 0.5, 1.0)
+
+# Invalid rows logged individually before giving up
+MAX_REPORTED_ERRORS = 50
+
+
+class InvalidResultsError(ValueError):
+    """Results rejected by validation, with every (line number, message) error found."""
+
+    def __init__(self, errors):
+        super().__init__(f"{len(errors)} invalid result rows, nothing was stored")
+        self.errors = errors
+
+
+def parse_score(value, column):
+    try:
+        score = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid {column}: {value}")
+    if score not in VALID_SCORES:
+        raise ValueError(f"Invalid {column}: {value}")
+    return score
+
+
+def parse_results(input_file, max_round_id):
+    """
+    Parse and validate a results file in memory, see validate_result_rows().
+
+    Args:
+        input_file (str | file): Results CSV file, or an open text stream of one.
+        max_round_id (int): Last registered round, the file must hold the next one.
+
+    Returns:
+        tuple: (rows ready to insert, list of (line number, message) errors)
+    """
+    with open_csv(input_file) as file:
+        reader = csv.DictReader(file)
+        return validate_result_rows(((reader.line_num, row) for row in reader), max_round_id)
+
+
+def validate_result_rows(records, max_round_id):
+    """
+    Validate result records given as (line number, row dict) pairs with the
+    columns of the results CSV file.
+
+    Every row is checked for the round number, the score domain, scores
+    summing to 1.0, BYE rows and players appearing in more than one game.
+    Nothing stops at the first error, all invalid rows are collected.
+
+    Args:
+        records (iterable): (line number, row dict) pairs.
+        max_round_id (int): Last registered round, the rows must hold the next one.
+
+    Returns:
+        tuple: (rows ready to insert as (line, (round_id, player1_id,
+                player1_name, player1_score, player2_score, player2_name,
+                player2_id)), list of (line number, message) errors)
+    """
+    rows, errors = [], []
+    seen = {}
+    for line, row in records:
+        try:
+            round_id = int(row['round_id'])
+            player1_id = row['player1_id']
+            player1_name = row['player1_name']
+            player2_name = row['player2_name']
+            player2_id = row['player2_id']
+
+            if round_id != max_round_id + 1:
+                raise ValueError(f"Invalid round {round_id}: next allowed round is {max_round_id + 1}")
+
+            # A player score set to BYE means that he\she has having a resting round.
+            # As there are no matches he gets auto Win a.k.a 1.0 points
+            if row['player1_score'] == 'BYE':
+                player1_score = 1.0
+                player2_score, player2_name, player2_id = 0.0, None, None
+            else:
+                player1_score = parse_score(row['player1_score'], 'player1_score')
+                player2_score = parse_score(row['player2_score'], 'player2_score')
+                if player1_score + player2_score != 1.0:
+                    raise ValueError('Invalid sum of players! Sum of player scores must be 1.0')
+                if player1_id == player2_id:
+                    raise ValueError(f"Player {player1_id} cannot play against themselves")
+
+            for player_id in (player1_id, player2_id):
+                if player_id is not None and player_id in seen:
+                    raise ValueError(f"Player {player_id} already plays on line {seen[player_id]}")
+        except (KeyError, TypeError, ValueError) as e:
+            errors.append((line, f"{e}: {','.join(str(value) for value in row.values())}"))
+            continue
+
+        for player_id in (player1_id, player2_id):
+            if player_id is not None:
+                seen[player_id] = line
+        rows.append((line, (round_id, player1_id, player1_name, player1_score,
+                            player2_score, player2_name, player2_id)))
+
+    return rows, errors
+
+
+def check_identities(cur, rows):
+    """
+    Check every (id, name) of the parsed rows against standings with a
+    single join.
+
+    Returns:
+        list of (line number, message) errors.
+    """
+    lines, ids, names = [], [], []
+    for line, result in rows:
+        _, player1_id, player1_name, _, _, player2_name, player2_id = result
+        lines.append(line)
+        ids.append(player1_id)
+        names.append(player1_name)
+        # If the player1 was set to bye, naturally bypass empty player2 attributes
+        if player2_id is not None:
+            lines.append(line)
+            ids.append(player2_id)
+            names.append(player2_name)
+
+    cur.execute("""
+        SELECT t.line, t.id, t.name
+        FROM unnest(%s::int[], %s::text[], %s::text[]) AS t(line, id, name)
+        LEFT JOIN standings AS s ON s.id = t.id AND s.name = t.name
+        WHERE s.id IS NULL
+        ORDER BY t.line;
+    """, (lines, ids, names))
+    return [(line, f"Player mismatch: {player_id} - {name} not found in standings.")
+            for line, player_id, name in cur.fetchall()]
+
+
+def insert_results(cur, results):
+    """Insert result rows with a single execute_values() statement."""
+    execute_values(cur,
+                   "INSERT INTO results (round_id, player1_id, player1_name, player1_score, player2_score, player2_name, player2_id) "
+                   "VALUES %s",
+                   results,
+                   page_size=max(len(results), 1))
+
+
+def store_results(input_file, storage, commit=True):
+    """
+    Register a results file.
+
+    The file is validated in memory first, player identities are checked
+    with one join against standings and all rows are inserted with a single
+    statement, so a round costs a constant number of round trips however
+    many games it has. Invalid rows are all reported at once and nothing is
+    stored.
+
+    Args:
+        input_file (str | file): Results CSV file, or an open text stream of one.
+        storage (Storage): Tournament storage, see core.storage.
+        commit (bool): Commit the inserted rows. False leaves the transaction
+                       open for the caller, as run-round does.
+
+    Returns:
+        list | None: The stored result rows, None if a database error
+                     rolled the transaction back.
+
+    Raises:
+        InvalidResultsError: If rows are invalid; they are logged and the
+                             transaction is rolled back.
+
+    Complexity:
+        Round trips : O(1)
+    """
+    try:
+        max_round_id = storage.max_round_id()
+        rows, errors = parse_results(input_file, max_round_id)
+
+        if rows:
+            errors += storage.check_identities(rows)
+
+        if errors:
+            errors.sort()
+            for line, message in errors[:MAX_REPORTED_ERRORS]:
+                logger.error(f"Line {line}: {message}")
+            if len(errors) > MAX_REPORTED_ERRORS:
+                logger.error(f"... and {len(errors) - MAX_REPORTED_ERRORS} more invalid rows")
+            storage.rollback()
+            raise InvalidResultsError(errors)
+
+        results = [result for _, result in rows]
+        storage.insert_results(results)
+
+        logger.info(f"{len(rows)} results stored successfully.")
+        if commit:
+            storage.commit()
+        return results
+    except (storage.Error, FileNotFoundError) as e:
+        storage.rollback()
+        logger.error(f"Error: {str(e)}")
+        return None
+
+
+def main(argv=None, conn=None):
+    """
+    Register the results of a round from a CSV file.
+
+    Args:
+        argv (list | None): Command line arguments, sys.argv[1:] if None.
+        conn: Open database connection or Storage to use instead of connecting to --conn.
+    """
+    parser = argparse.ArgumentParser(prog="register-results")
+    parser.add_argument('--conn',
+                        help='PostgreSQL connection string, or sqlite:///<file> for a local database '
+                             '(default: from DB_* environment variables)')
+    parser.add_argument('-f',
+                        '--input-file',
+                        required=True,
+                        help=f'Results csv input file (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    # Imported here, core.storage builds on the functions of this module
+    from core.storage import open_storage
+
+    with open_storage(args.conn, conn) as storage:
+        try:
+            store_results(args.input_file, storage)
+        except InvalidResultsError as err:
+            logger.error(str(err))
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
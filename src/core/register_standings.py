@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+import argparse
+import csv
+
+from core.standings_snapshot import refresh_snapshot
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def read_seed_points(seed_file):
+    """
+    Read initial points from a CSV file with an id,points header, e.g. for
+    late entrants credited with points for the rounds they missed.
+
+    Returns:
+        tuple: (list of player ids, list of points)
+    """
+    ids, points = [], []
+    with open(seed_file, newline='') as f:
+        for row in csv.DictReader(f):
+            ids.append(row['id'])
+            points.append(float(row['points']))
+    return ids, points
+
+
+# Populate standings table based on players list and default values.
+def fill_standings_table(conn, initial_points=0.0, seed_ids=(), seed_points=()):
+    """
+    Create a standings row for every registered player that has none yet,
+    with a single INSERT ... SELECT. Existing standings are never touched,
+    so re-running only adds players registered since (late entrants).
+
+    Args:
+        conn: Database connection.
+        initial_points (float): Starting points of new standings rows.
+        seed_ids (list): Players starting with their own points instead.
+        seed_points (list): Starting points of seed_ids, in the same order.
+
+    Returns:
+        int: Number of standings rows created.
+
+    Complexity:
+        Round trips : O(1)
+    """
+    with conn.cursor() as cur:
+        cur.execute("""
+            INSERT INTO Standings (id, name, is_active, is_bye, matches, tiebreaker_C, tiebreaker_B, tiebreaker_A, points)
+            SELECT p.id, p.name, true, false, 0, 0.00, 0.00, 0.00, COALESCE(seed.points, %(initial_points)s)
+            FROM Players AS p
+            LEFT JOIN unnest(%(seed_ids)s::text[], %(seed_points)s::numeric[]) AS seed(id, points)
+                   ON seed.id = p.id
+            WHERE p.id != '_'
+            ON CONFLICT (id) DO NOTHING;
+        """, {"initial_points": initial_points, "seed_ids": list(seed_ids), "seed_points": list(seed_points)})
+        created = cur.rowcount
+
+        if seed_ids:
+            cur.execute("""
+                SELECT seed.id
+                FROM unnest(%s::text[]) AS seed(id)
+                LEFT JOIN Players AS p ON p.id = seed.id
+                WHERE p.id IS NULL;
+            """, (list(seed_ids),))
+            unknown = [row[0] for row in cur.fetchall()]
+            if unknown:
+                logger.warning(f"{len(unknown)} seeded ids are not registered players: {', '.join(unknown[:10])}")
+
+        refresh_snapshot(conn, commit=False)
+        conn.commit()
+        logger.info(f"Standings table filled successfully ({created} new players)")
+        return created
+
+
+def main(argv=None, conn=None):
+    """
+    Add every registered player to the standings table.
+
+    Args:
+        argv (list | None): Command line arguments, sys.argv[1:] if None.
+        conn: Open database connection or Storage to use instead of connecting to --conn.
+    """
+    parser = argparse.ArgumentParser(prog="register-standings")
+    parser.add_argument('--conn',
+                        help='PostgreSQL connection string, or sqlite:///<file> for a local database '
+                             '(default: from DB_* environment variables)')
+    parser.add_argument('--points',
+                        type=float,
+                        default=0.0,
+                        help='Starting points of newly added players (default: %(default)s)')
+    parser.add_argument('--seed-file',
+                        help='CSV file with id,points columns overriding --points per player')
+    args = parser.parse_args(argv)
+
+    seed_ids, seed_points = read_seed_points(args.seed_file) if args.seed_file else ([], [])
+
+    # Imported here, core.storage builds on the functions of this module
+    from core.storage import open_storage
+
+    with open_storage(args.conn, conn) as storage:
+        # Fill the tables
+        storage.fill_standings(args.points, seed_ids, seed_points)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+
+import argparse
+import sys
+
+from core.generate_swiss_pairings import generate_pairings_csv, swiss_pairing, swiss_round_count, validate_new_round
+from core.pairing_engines import ENGINES
+from core.register_results import store_results
+from core.storage import open_storage
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def run_round(storage, input_file, engine="greedy", use_cache=True, full_tiebreaks=False,
+              verify=False, pair_next=True, **options):
+    """
+    Close a round and pair the next one in a single transaction.
+
+    The steps of register-results, apply-results and generate-swiss-pairings
+    run on one storage and commit together, so a failure in any of them
+    leaves the database as it was. The stored results are handed on in
+    memory: the applied round and the last round number come from them, and
+    its games extend the cached head-to-head history without re-reading the
+    results table. The pairings file is written once everything committed.
+
+    Args:
+        storage (Storage): Tournament storage, see core.storage.
+        input_file (str): Results CSV file of the round just played.
+        engine (str): Pairing engine of the next round, see ENGINES.
+        use_cache (bool): Load the head-to-head history through the on-disk cache.
+        full_tiebreaks (bool): Recompute every player's tie-breakers instead
+                               of those the round touched.
+        verify (bool): Check the tie-breakers against a full recomputation.
+        pair_next (bool): Pair the next round; False for the final round.
+        **options: Engine specific keyword arguments (e.g. workers).
+
+    Returns:
+        int: The round that was registered and applied.
+
+    Complexity:
+        Round trips : O(1) — a fixed number of statements per step.
+    """
+    pairs = None
+    try:
+        results = store_results(input_file, storage, commit=False)
+        if results is None:
+            raise ValueError(f"Results of {input_file} could not be registered")
+        if not results:
+            raise ValueError(f"No results found in {input_file}")
+        round_id = results[0][0]
+
+        storage.apply_round(round_id, full_tiebreaks, verify)
+
+        if pair_next:
+            next_round = round_id + 1
+            players = storage.active_players()
+            validate_new_round(None, swiss_round_count(len(players), next_round), next_round,
+                               max_round_id=round_id)
+            known_rounds = {round_id: [(result[1], result[6]) for result in results]}
+            # The cache covers the new round, so it is written once that commits
+            pairs = swiss_pairing(storage, players, engine, use_cache, known_rounds, save_cache=False, **options)
+
+        storage.commit()
+    except Exception:
+        # Nothing of the round is kept
+        storage.rollback()
+        raise
+
+    logger.info(f"Round {round_id} registered and applied.")
+    if pairs is not None:
+        # Sort the pairs by the rank of the first player in each pair
+        generate_pairings_csv(sorted(pairs, key=lambda pair: pair[0].rank), next_round)
+    return round_id
+
+
+def main(argv=None, conn=None):
+    """
+    Register and apply the results of a round, then pair the next one.
+
+    Args:
+        argv (list | None): Command line arguments, sys.argv[1:] if None.
+        conn: Open database connection or Storage to use instead of connecting to --conn.
+    """
+    parser = argparse.ArgumentParser(prog="run-round")
+    parser.add_argument('--conn',
+                        help='PostgreSQL connection string, or sqlite:///<file> for a local database '
+                             '(default: from DB_* environment variables)')
+    parser.add_argument('-f',
+                        '--input-file',
+                        required=True,
+                        help='Results csv input file of the round just played')
+    parser.add_argument("-e",
+                        "--engine",
+                        choices=sorted(ENGINES),
+                        default="greedy",
+                        help="Pairing engine of the next round (default: %(default)s)")
+    parser.add_argument("-w",
+                        "--workers",
+                        type=int,
+                        default=None,
+                        help="Worker processes for the score-groups engine (default: CPU count)")
+    parser.add_argument("--no-cache",
+                        action="store_true",
+                        help="Rebuild the head-to-head history from the results table")
+    parser.add_argument('--full-tiebreaks',
+                        action='store_true',
+                        help='Recompute the tie-breakers of every player instead of those touched by the round')
+    parser.add_argument('--verify',
+                        action='store_true',
+                        help='Check the tie-breakers against a full recomputation before committing')
+    parser.add_argument('--final',
+                        action='store_true',
+                        help='Last round of the tournament, do not pair a next round')
+    args = parser.parse_args(argv)
+
+    options = {"workers": args.workers} if args.engine == "score-groups" else {}
+    with open_storage(args.conn, conn) as storage:
+        try:
+            run_round(storage, args.input_file, args.engine, not args.no_cache, args.full_tiebreaks,
+                      args.verify, not args.final, **options)
+        except ValueError as err:
+            # Invalid results or a round that cannot be paired, already rolled back
+            logger.error(str(err))
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+
+import argparse
+import hashlib
+import json
+import threading
+
+import psycopg2
+from flask import Flask, Response, request
+
+from core.apply_results_to_standings import (ROUND_SCOPE, TIEBREAK_CTES, apply_scores_to_standings,
+                                             apply_tiebreaks)
+from core.generate_swiss_pairings import load_head_to_head_map, swiss_round_count, validate_new_round
+from core.pairing_engines import ENGINES
+from core.player import Player
+from core.register_results import insert_results, validate_result_rows
+from core.standings_snapshot import refresh_snapshot
+from common.db_utils import open_connection
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Standings columns held in memory, one dict per player
+STANDINGS_QUERY = """
+    SELECT id, name, is_active, is_bye, matches, points,
+           tiebreaker_A, tiebreaker_B, tiebreaker_C
+    FROM standings
+"""
+
+
+def standings_row(row):
+    """Standings query row as a JSON friendly dict (DECIMAL columns as floats)."""
+    player_id, name, is_active, is_bye, matches, points, tiebreaker_a, tiebreaker_b, tiebreaker_c = row
+    return {
+        "id": player_id,
+        "name": name,
+        "is_active": bool(is_active),
+        "is_bye": bool(is_bye),
+        "matches": matches,
+        "points": float(points or 0),
+        "tiebreaker_A": float(tiebreaker_a or 0),
+        "tiebreaker_B": float(tiebreaker_b or 0),
+        "tiebreaker_C": float(tiebreaker_c or 0),
+    }
+
+
+class TournamentState:
+    """
+    Standings, head-to-head index and current pairings of the tournament,
+    kept in memory between requests.
+
+    Reads are served from response bodies built once per change, so they
+    never touch Postgres. Writes (pairing a round, submitting results) are
+    serialized by a lock, go to the database in one transaction and are
+    then applied to the in-memory state: only the standings rows a round
+    can change are re-read and the new games are added to the index.
+    Results are accepted only for the games of the published pairings,
+    which live in memory: after a restart or /reload the round is paired
+    again before its results can be submitted.
+    """
+
+    def __init__(self, standings, head_to_head_map, last_round, version=None):
+        self.lock = threading.Lock()
+        self._reset(standings, head_to_head_map, last_round, version)
+
+    def _reset(self, standings, head_to_head_map, last_round, version):
+        self.players = {row["id"]: row for row in standings}
+        self.head_to_head_map = head_to_head_map
+        self.last_round = last_round
+        self.version = version
+        self.pairings_round = None
+        self.pairings = None
+        self.ranked = sorted((row for row in standings if row["is_active"]), key=self._ranking_key)
+        self._publish()
+
+    @classmethod
+    def load(cls, conn):
+        """Read the whole tournament once, at start-up."""
+        return cls(*cls._read(conn))
+
+    def reload(self, conn):
+        """
+        Re-read the whole tournament into this state, on /reload.
+
+        Done in place under the write lock, so a write either lands before
+        the reload (and is read back) or waits for it; none can update a
+        state that is about to be discarded.
+        """
+        with self.lock:
+            self._reset(*self._read(conn))
+
+    @staticmethod
+    def _read(conn):
+        """Standings, head-to-head index, last round and snapshot version from the database."""
+        with conn.cursor() as cur:
+            cur.execute(STANDINGS_QUERY + " ORDER BY points DESC, tiebreaker_A DESC, "
+                                          "tiebreaker_B DESC, tiebreaker_C DESC;")
+            standings = [standings_row(row) for row in cur.fetchall()]
+            cur.execute("SELECT COALESCE(MAX(round_id), 0) FROM results;")
+            last_round = cur.fetchone()[0]
+        head_to_head_map = load_head_to_head_map(conn, [row["id"] for row in standings if row["is_active"]])
+        # Idempotent: an unchanged tournament keeps its version, a manual
+        # edit since the last snapshot gets a new one
+        version = refresh_snapshot(conn, commit=False)
+        conn.commit()
+        logger.info(f"Loaded {len(standings)} players, last round {last_round}, standings {version}")
+        return standings, head_to_head_map, last_round, version
+
+    @staticmethod
+    def _ranking_key(row):
+        # Same order as the standings snapshot, player id breaks the last ties
+        return (-row["points"], -row["tiebreaker_A"], -row["tiebreaker_B"], -row["tiebreaker_C"], row["id"])
+
+    def _publish(self):
+        """Build the response bodies the read endpoints return as they are."""
+        body = json.dumps({
+            "round_id": self.last_round,
+            "version": self.version,
+            "standings": [dict(row, rank=rank) for rank, row in enumerate(self.ranked, 1)],
+        }).encode()
+        # ETag is the snapshot version, shared with every other reader of the
+        # standings. Body and ETag are swapped in together for the readers.
+        self.standings = (body, self.version or hashlib.md5(body).hexdigest())
+        pairings = None
+        if self.pairings is not None:
+            pairings = [{
+                "board": board,
+                "player1_id": player1.id,
+                "player1_name": player1.name,
+                "player2_id": None if player2 == "BYE" else player2.id,
+                "player2_name": None if player2 == "BYE" else player2.name,
+                "bye": player2 == "BYE",
+            } for board, (player1, player2) in enumerate(self.pairings, 1)]
+        self.pairings_body = json.dumps({"round_id": self.pairings_round, "pairings": pairings}).encode()
+
+    def ranked_players(self):
+        """Player objects in standings order, as get_active_players() returns them."""
+        return [Player(rank, row["id"], row["name"], row["is_bye"], row["points"])
+                for rank, row in enumerate(self.ranked, 1)]
+
+    def pair_next_round(self, engine="greedy", **options):
+        """
+        Pair the round after the last applied one from the in-memory
+        standings and head-to-head index.
+
+        Raises:
+            ValueError: If the round cannot be paired.
+        """
+        with self.lock:
+            round_id = self.last_round + 1
+            players = self.ranked_players()
+            validate_new_round(None, swiss_round_count(len(players), round_id), round_id,
+                               max_round_id=self.last_round)
+            pairs = ENGINES[engine](players, self.head_to_head_map, **options)
+            self.pairings = sorted(pairs, key=lambda pair: pair[0].rank)
+            self.pairings_round = round_id
+            self._publish()
+        logger.info(f"Round {round_id} paired with '{engine}' engine")
+        return round_id
+
+    def submit_results(self, conn, records):
+        """
+        Register and apply the results of the next round.
+
+        Args:
+            conn: Database connection, written in a single transaction.
+            records (list): Result dicts with player1_id, player1_score,
+                            player2_score and player2_id (None for a BYE,
+                            whose player1_score is "BYE").
+
+        Returns:
+            tuple: (round_id, list of (position, message) errors); nothing
+                   is stored if there are errors.
+
+        Raises:
+            ValueError: If the round has not been paired (POST /pairings).
+        """
+        with self.lock:
+            round_id = self.last_round + 1
+            if self.pairings is None or self.pairings_round != round_id:
+                raise ValueError(f"Round {round_id} has not been paired yet")
+
+            rows, errors = validate_result_rows(self._result_records(records, round_id), self.last_round)
+            # Identities are checked against memory instead of check_identities()
+            errors += [(position, f"Player mismatch: {player_id} not found in standings.")
+                       for position, result in rows
+                       for player_id in (result[1], result[6])
+                       if player_id is not None and player_id not in self.players]
+            errors += self._pairing_errors(rows, round_id)
+            errors.sort()
+            if errors or not rows:
+                return round_id, errors or [(0, "No results submitted")]
+
+            results = [result for _, result in rows]
+            try:
+                with conn.cursor() as cur:
+                    insert_results(cur, results)
+                apply_scores_to_standings(conn, round_id, commit=False)
+                version = apply_tiebreaks(conn, round_id, commit=False)
+                with conn.cursor() as cur:
+                    # The players apply_tiebreaks() just updated
+                    cur.execute(f"""
+                        WITH {TIEBREAK_CTES.format(scope=ROUND_SCOPE)}
+                        {STANDINGS_QUERY}
+                        WHERE id IN (SELECT id FROM scope);
+                    """, {"round_id": round_id})
+                    changed = [standings_row(row) for row in cur.fetchall()]
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+
+            self.head_to_head_map.add_pairs((result[1], result[6]) for result in results)
+            for row in changed:
+                self.players[row["id"]].update(row)
+            self.ranked = sorted((row for row in self.ranked if row["is_active"]), key=self._ranking_key)
+            self.last_round = round_id
+            self.version = version
+            self.pairings_round, self.pairings = None, None
+            self._publish()
+        logger.info(f"Round {round_id}: {len(results)} results applied, {len(changed)} standings rows updated")
+        return round_id, []
+
+    def _pairing_errors(self, rows, round_id):
+        """(position, message) errors for games that are not the published pairings, or missing from rows."""
+        paired = {frozenset((player1.id, None if player2 == "BYE" else player2.id))
+                  for player1, player2 in self.pairings}
+        submitted = set()
+        errors = []
+        for position, result in rows:
+            game = frozenset((result[1], result[6]))
+            submitted.add(game)
+            if game not in paired:
+                errors.append((position, f"Game {result[1]} - {result[6] or 'BYE'} is not "
+                                         f"in the round {round_id} pairings"))
+        missing = len(paired - submitted)
+        if missing:
+            errors.append((0, f"{missing} games of the round {round_id} pairings have no result"))
+        return errors
+
+    def _result_records(self, records, round_id):
+        """Submitted results as (position, row) pairs of the results CSV columns."""
+        for position, record in enumerate(records, 1):
+            row = {"round_id": record.get("round_id", round_id)}
+            for side in ("player1", "player2"):
+                player_id = record.get(f"{side}_id")
+                row[f"{side}_id"] = player_id
+                row[f"{side}_name"] = self.players[player_id]["name"] if player_id in self.players else None
+                row[f"{side}_score"] = record.get(f"{side}_score")
+            yield position, row
+
+
+def json_response(body, status=200):
+    return Response(body, status=status, mimetype="application/json")
+
+
+def create_app(state, conn):
+    """
+    Flask application serving a TournamentState.
+
+    GET  /standings  ranked standings of the active players
+    GET  /pairings   pairings of the next round, once paired
+    POST /pairings   pair the next round, {"engine": ...} optional
+    POST /results    submit the next round, {"results": [...]}; the games
+                     must be those of the published pairings
+    POST /reload     re-read everything from the database
+    """
+    app = Flask(__name__)
+    app.config["state"] = state
+
+    @app.get("/standings")
+    def get_standings():
+        body, etag = app.config["state"].standings
+        response = json_response(body)
+        response.set_etag(etag)
+        # 304 Not Modified without a body if If-None-Match holds the version
+        return response.make_conditional(request)
+
+    @app.get("/pairings")
+    def get_pairings():
+        return json_response(app.config["state"].pairings_body)
+
+    @app.post("/pairings")
+    def post_pairings():
+        engine = (request.get_json(silent=True) or {}).get("engine", "greedy")
+        if engine not in ENGINES:
+            return json_response(json.dumps({"error": f"Unknown engine {engine}"}), 400)
+        try:
+            app.config["state"].pair_next_round(engine)
+        except ValueError as err:
+            return json_response(json.dumps({"error": str(err)}), 409)
+        return json_response(app.config["state"].pairings_body, 201)
+
+    @app.post("/results")
+    def post_results():
+        records = (request.get_json(silent=True) or {}).get("results")
+        if not isinstance(records, list):
+            return json_response(json.dumps({"error": "Expected {\"results\": [...]}"}), 400)
+        try:
+            round_id, errors = app.config["state"].submit_results(conn, records)
+        except ValueError as err:
+            return json_response(json.dumps({"error": str(err)}), 409)
+        except psycopg2.Error as err:
+            # Rolled back by submit_results(), the state is unchanged
+            logger.error(f"Results could not be stored: {err}")
+            return json_response(json.dumps({"error": "Results could not be stored"}), 500)
+        if errors:
+            return json_response(json.dumps({
+                "round_id": round_id,
+                "errors": [{"position": position, "message": message} for position, message in errors],
+            }), 400)
+        return json_response(app.config["state"].standings[0], 201)
+
+    @app.post("/reload")
+    def post_reload():
+        try:
+            app.config["state"].reload(conn)
+        except psycopg2.Error as err:
+            conn.rollback()
+            logger.error(f"Tournament could not be reloaded: {err}")
+            return json_response(json.dumps({"error": "Tournament could not be reloaded"}), 500)
+        return json_response(app.config["state"].standings[0])
+
+    return app
+
+
+def main(argv=None, conn=None):
+    """
+    Serve the tournament over HTTP until interrupted.
+
+    Args:
+        argv (list | None): Command line arguments, sys.argv[1:] if None.
+        conn: Open database connection to use instead of connecting to --conn.
+    """
+    parser = argparse.ArgumentParser(prog="serve")
+    parser.add_argument('--conn',
+                        help='PostgreSQL connection string (default: from DB_* environment variables)')
+    parser.add_argument('--host',
+                        default='127.0.0.1',
+                        help='Interface to listen on, 0.0.0.0 inside Docker (default: %(default)s)')
+    parser.add_argument('--port',
+                        type=int,
+                        default=8000,
+                        help='Port to listen on (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    with open_connection(args.conn, conn) as conn:
+        app = create_app(TournamentState.load(conn), conn)
+        app.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,212 @@
+import numpy as np
+
+from core.player import Player
+from core.head_to_head import HeadToHead
+from core.pairing_engines import ENGINES
+
+# Game outcomes as (player1 score, player2 score): win, draw, loss
+OUTCOMES = np.array([[1.0, 0.0], [0.5, 0.5], [0.0, 1.0]])
+OUTCOME_WEIGHTS = (1 / 3, 1 / 3, 1 / 3)
+
+# Points awarded for a BYE, as in register_results.py
+BYE_POINTS = 1.0
+
+# Elo model of draw_elo_outcomes(): rating of an unrated player, rating
+# difference at which the stronger player is expected to score 10:1, and
+# share of draws between evenly matched players (that of OUTCOME_WEIGHTS,
+# so equal ratings reproduce the uniform outcomes)
+DEFAULT_RATING = 1500.0
+ELO_SCALE = 400.0
+DRAW_RATE = OUTCOME_WEIGHTS[1]
+
+
+def expected_scores(rating1, rating2):
+    """Elo expected score of player1 against player2, elementwise."""
+    return 1.0 / (1.0 + 10.0 ** ((np.asarray(rating2, dtype=float) - rating1) / ELO_SCALE))
+
+
+def performance_ratings(points, matches):
+    """
+    Elo ratings matching each player's score rate, for players known only
+    by their standings. The rate is taken as (points + 0.5) / (matches + 1)
+    so that perfect and zero scores stay finite and new players sit at
+    DEFAULT_RATING.
+    """
+    rate = (np.asarray(points, dtype=float) + 0.5) / (np.asarray(matches, dtype=float) + 1.0)
+    rate = np.clip(rate, 0.01, 0.99)
+    return DEFAULT_RATING + ELO_SCALE * np.log10(rate / (1.0 - rate))
+
+
+def draw_elo_outcomes(rating1, rating2, rng, draw_rate=DRAW_RATE):
+    """
+    Draw the scores of many games at once with an Elo expected-score model.
+
+    The draw probability is draw_rate for evenly matched players and
+    shrinks as the expected score E of player1 moves away from 0.5; the
+    win probability is E minus half of it, so every game keeps its
+    expected score E.
+
+    Args:
+        rating1 (array): Ratings of the first players.
+        rating2 (array): Ratings of their opponents.
+        rng (np.random.Generator): Source of results, one draw per game.
+        draw_rate (float): Draw probability of evenly matched players, 0 to 1.
+
+    Returns:
+        np.ndarray: (games, 2) scores, rows of OUTCOMES.
+    """
+    expected = expected_scores(rating1, rating2)
+    p_draw = draw_rate * (1.0 - np.abs(2.0 * expected - 1.0))
+    p_win = expected - p_draw / 2.0
+    draws = rng.random(expected.shape)
+    return OUTCOMES[(draws >= p_win).astype(np.int64) + (draws >= p_win + p_draw)]
+
+
+class SimulatedTournament:
+    """
+    A whole tournament held in NumPy arrays instead of Postgres.
+
+    The arrays mirror the standings table (points, matches, is_bye and the
+    three tie-breakers) and the results table is replaced by a HeadToHead
+    index plus opponents and scores matrices. Rounds are paired with the
+    regular pairing engines and scored like apply_results_to_standings.py
+    does, so a simulated event follows the same rules as a real one.
+
+    Complexity:
+        Space : O(n·r) for the opponents matrix of n players over r rounds,
+                plus the O(n² / 8) head-to-head index.
+    """
+
+    def __init__(self, num_players, rounds, rng=None, outcome_weights=OUTCOME_WEIGHTS):
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.outcome_weights = np.asarray(outcome_weights, dtype=float)
+        self.ids = [f"{i + 1:07d}" for i in range(num_players)]
+        self.names = [f"Player {i + 1}" for i in range(num_players)]
+        self.position = {player_id: i for i, player_id in enumerate(self.ids)}
+
+        self.points = np.zeros(num_players)
+        self.matches = np.zeros(num_players, dtype=np.int64)
+        self.is_bye = np.zeros(num_players, dtype=bool)
+        self.buchholz = np.zeros(num_players)
+        self.sonneborn_berger = np.zeros(num_players)
+        self.progressive = np.zeros(num_players)
+        self.opponents = np.full((num_players, rounds), -1, dtype=np.int64)
+        self.scores = np.zeros((num_players, rounds))
+        self.head_to_head_map = HeadToHead(self.ids)
+        self.round_id = 0
+
+    def __len__(self):
+        return len(self.ids)
+
+    def ranking(self):
+        """
+        Player positions in standings order: points, then tie-breakers A, B
+        and C, then seed (the standings query leaves further ties unordered).
+        """
+        return np.lexsort((np.arange(len(self.ids)), -self.progressive, -self.sonneborn_berger,
+                           -self.buchholz, -self.points))
+
+    def ranked_players(self):
+        """Player objects in standings order, as get_active_players() returns them."""
+        return [Player(rank + 1, self.ids[i], self.names[i], bool(self.is_bye[i]), float(self.points[i]))
+                for rank, i in enumerate(self.ranking())]
+
+    def pair_round(self, engine="greedy", stats=None, **options):
+        """Pair the next round with one of the pairing engines."""
+        return ENGINES[engine](self.ranked_players(), self.head_to_head_map, stats=stats, **options)
+
+    def play_round(self, pairings):
+        """
+        Draw a result for every game of pairings and apply it to the standings.
+
+        Returns:
+            np.ndarray: (games, 2) scores of the games, in pairing order.
+        """
+        if self.round_id >= self.opponents.shape[1]:
+            raise ValueError(f"All {self.opponents.shape[1]} rounds have already been played")
+
+        games = [(p1.id, p2.id) for p1, p2 in pairings if p2 != 'BYE']
+        byes = np.array([self.position[p1.id] for p1, p2 in pairings if p2 == 'BYE'], dtype=np.int64)
+        left = np.array([self.position[p1] for p1, _ in games], dtype=np.int64)
+        right = np.array([self.position[p2] for _, p2 in games], dtype=np.int64)
+
+        outcome = self.rng.choice(len(OUTCOMES), size=len(games), p=self.outcome_weights)
+        scores = OUTCOMES[outcome]
+
+        # Every player appears at most once per round, plain fancy indexing is safe
+        self.points[left] += scores[:, 0]
+        self.points[right] += scores[:, 1]
+        self.points[byes] += BYE_POINTS
+        self.is_bye[byes] = True
+        self.matches[np.concatenate([left, right, byes])] += 1
+
+        self.opponents[left, self.round_id] = right
+        self.opponents[right, self.round_id] = left
+        self.scores[left, self.round_id] = scores[:, 0]
+        self.scores[right, self.round_id] = scores[:, 1]
+        self.scores[byes, self.round_id] = BYE_POINTS
+        self.head_to_head_map.add_pairs(games)
+        self.round_id += 1
+
+        self.apply_tiebreaks()
+        return scores
+
+    def apply_tiebreaks(self):
+        """
+        Recalculate the tie-breakers of every player at once, as
+        apply_tiebreaks() of apply_results_to_standings.py does:
+        Buchholz over distinct opponents, Sonneborn-Berger and progressive
+        score. BYEs count towards the progressive score only.
+        """
+        opponents = self.opponents[:, :self.round_id]
+        scores = self.scores[:, :self.round_id]
+        played = opponents >= 0
+        opponent_points = np.where(played, self.points[opponents], 0.0)
+
+        distinct = np.sort(opponents, axis=1)
+        valid = distinct >= 0
+        valid[:, 1:] &= distinct[:, 1:] != distinct[:, :-1]
+        self.buchholz = np.where(valid, self.points[distinct], 0.0).sum(axis=1)
+        self.sonneborn_berger = (scores * opponent_points).sum(axis=1)
+        self.progressive = np.cumsum(scores, axis=1).sum(axis=1)
+
+    def standings(self):
+        """
+        Final standings in rank order.
+
+        Returns:
+            list of tuples: (rank, id, name, points, buchholz, matches, is_bye,
+                             sonneborn_berger, progressive)
+        """
+        return [(rank + 1, self.ids[i], self.names[i], float(self.points[i]),
+                 float(self.buchholz[i]), int(self.matches[i]), bool(self.is_bye[i]),
+                 float(self.sonneborn_berger[i]), float(self.progressive[i]))
+                for rank, i in enumerate(self.ranking())]
+
+
+def simulate_tournament(num_players, rounds, engine="greedy", rng=None, stats=None, **options):
+    """
+    Play a complete Swiss tournament in memory.
+
+    Args:
+        num_players (int): Field size.
+        rounds (int): Number of Swiss rounds.
+        engine (str): Pairing engine name, see pairing_engines.ENGINES.
+        rng (np.random.Generator | None): Source of results and ties.
+        stats (dict | None): Receives the engine counters plus "rematches"
+                             and "byes" summed over all rounds.
+        **options: Extra keyword arguments for the pairing engine.
+
+    Returns:
+        SimulatedTournament: The tournament after the last round.
+    """
+    tournament = SimulatedTournament(num_players, rounds, rng)
+    for _ in range(rounds):
+        pairings = tournament.pair_round(engine, stats=stats, **options)
+        if stats is not None:
+            played = tournament.head_to_head_map.played
+            stats["rematches"] = stats.get("rematches", 0) + \
+                sum(1 for p1, p2 in pairings if p2 != 'BYE' and played(p1.id, p2.id))
+            stats["byes"] = stats.get("byes", 0) + sum(1 for _, p2 in pairings if p2 == 'BYE')
+        tournament.play_round(pairings)
+    return tournament
@@ -0,0 +1,109 @@
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Rank the active players once and store them as the current snapshot. The
+# version combines the last round with a checksum of the ranked rows, so
+# any change to the standings yields a new version, while a snapshot of
+# unchanged standings keeps its version (and its ETag). Superseded
+# snapshots are deleted by the same statement, so the table holds one row.
+# Player id breaks the remaining ties to keep the ranking reproducible.
+# The snapshot records the standings_changes generation it was ranked from.
+REFRESH_SNAPSHOT_SQL = """
+    WITH ranked AS (
+        SELECT ROW_NUMBER() OVER (ORDER BY points DESC, tiebreaker_A DESC, tiebreaker_B DESC,
+                                           tiebreaker_C DESC, id) AS rank,
+               id, name, matches, is_bye, points, tiebreaker_A, tiebreaker_B, tiebreaker_C
+        FROM standings
+        WHERE is_active
+    ),
+    snapshot AS (
+        SELECT COALESCE(jsonb_agg(jsonb_build_object(
+                   'rank', rank, 'id', id, 'name', name, 'matches', matches, 'is_bye', is_bye,
+                   'points', points, 'tiebreaker_A', tiebreaker_A, 'tiebreaker_B', tiebreaker_B,
+                   'tiebreaker_C', tiebreaker_C) ORDER BY rank), '[]'::jsonb) AS standings
+        FROM ranked
+    ),
+    latest AS (
+        SELECT 'r' || r.round_id || '-' || left(md5(s.standings::text), 16) AS version,
+               r.round_id, s.standings, c.generation
+        FROM (SELECT COALESCE(MAX(round_id), 0) AS round_id FROM results) AS r,
+             snapshot AS s, standings_changes AS c
+    ),
+    superseded AS (
+        DELETE FROM standings_snapshots
+        WHERE version <> (SELECT version FROM latest)
+    )
+    INSERT INTO standings_snapshots (version, round_id, standings, generation)
+    SELECT version, round_id, standings, generation FROM latest
+    ON CONFLICT (version) DO UPDATE SET created_at = clock_timestamp(), generation = EXCLUDED.generation
+    RETURNING version;
+"""
+
+
+def refresh_snapshot(conn, commit=True):
+    """
+    Store the current standings as the current snapshot.
+
+    Called by every step that changes the standings, inside its own
+    transaction, so a committed change always comes with its snapshot.
+
+    Args:
+        conn: Database connection.
+        commit (bool): Commit the snapshot. False leaves the transaction
+                       open for the caller.
+
+    Returns:
+        str: Version of the snapshot.
+
+    Complexity:
+        Time  : O(n log n) for n active players, once per change.
+    """
+    with conn.cursor() as cur:
+        cur.execute(REFRESH_SNAPSHOT_SQL)
+        version = cur.fetchone()[0]
+    if commit:
+        conn.commit()
+    logger.debug(f"Standings snapshot {version} stored")
+    return version
+
+
+# The latest snapshot, unless the standings changed after it was ranked
+CURRENT_SNAPSHOT_SQL = """
+    SELECT version, round_id, {standings}
+    FROM (SELECT * FROM standings_snapshots ORDER BY created_at DESC LIMIT 1) AS latest
+    WHERE latest.generation >= (SELECT generation FROM standings_changes);
+"""
+
+
+def snapshot_version(conn):
+    """Version of the current snapshot, None before the first one or once it is stale."""
+    with conn.cursor() as cur:
+        cur.execute(CURRENT_SNAPSHOT_SQL.format(standings="NULL"))
+        row = cur.fetchone()
+    return row[0] if row else None
+
+
+def current_snapshot(conn, if_none_match=None):
+    """
+    Read the current snapshot, storing one first if there is none yet or
+    the standings changed since it was stored.
+
+    Args:
+        conn: Database connection.
+        if_none_match (str | None): Version the reader already holds. If it
+                                    is still current, the standings are not
+                                    transferred.
+
+    Returns:
+        tuple: (version, round_id, standings as a list of dicts in rank
+                order, or None if if_none_match is still current)
+    """
+    with conn.cursor() as cur:
+        cur.execute(CURRENT_SNAPSHOT_SQL.format(
+            standings="CASE WHEN version IS DISTINCT FROM %s THEN standings END"), (if_none_match,))
+        row = cur.fetchone()
+    if row is None:
+        refresh_snapshot(conn)
+        return current_snapshot(conn, if_none_match)
+    return row
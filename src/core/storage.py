@@ -0,0 +1,520 @@
+import csv
+import sqlite3
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+
+import psycopg2
+
+from core.apply_results_to_standings import (APPLY_SCORES_SQL, FULL_SCOPE, ROUND_SCOPE, ROUND_STATUS_SQL,
+                                             TIEBREAK_MISMATCHES_SQL, UPDATE_TIEBREAKS_SQL,
+                                             apply_scores_to_standings, apply_tiebreaks, check_round_status)
+from core.generate_swiss_pairings import (create_head_to_head_map, get_active_players, load_head_to_head_map,
+                                         save_head_to_head_cache)
+from core.head_to_head import HeadToHead
+from core.player import Player
+from core.register_players import check_header, open_csv, register_players
+from core.register_results import check_identities, get_max_round_id, insert_results
+from core.register_standings import fill_standings_table
+from core.standings_snapshot import refresh_snapshot, snapshot_version
+from common.db_utils import open_connection
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Connection strings of the local backend: sqlite:///path/to/file.db, or
+# sqlite:// (or sqlite:///:memory:) for a database that lives in memory
+SQLITE_PREFIX = "sqlite:"
+
+# Rows fetched per round trip when streaming a table
+BATCH_SIZE = 1000
+
+PLAYERS_QUERY = "SELECT id, name, email FROM players"
+
+RESULTS_QUERY = """
+    SELECT round_id, player1_name, player1_score, player2_score, player2_name
+    FROM results
+"""
+
+# Ranked rows of the current snapshot, unpacked in SQL so that a rank range
+# or a page is cut before the rows leave the database
+SNAPSHOT_STANDINGS_QUERY = """
+    SELECT s.rank, s.name, s.matches, s."tiebreaker_B"::float8, s."tiebreaker_A"::float8, s.points::float8
+    FROM (SELECT standings FROM standings_snapshots ORDER BY created_at DESC LIMIT 1) AS latest,
+         jsonb_to_recordset(latest.standings)
+             AS s(rank integer, name text, matches integer,
+                  "tiebreaker_B" numeric, "tiebreaker_A" numeric, points numeric)
+"""
+
+
+def filtered_query(query, filters, order_by, limit, offset, placeholder, no_limit):
+    """
+    Add the WHERE, ORDER BY and page clauses of a streamed read.
+
+    Args:
+        query (str): SELECT without WHERE or ORDER BY.
+        filters (list): (condition, value) pairs; a condition holds one {}
+                        for the placeholder of its value and is skipped when
+                        the value is None.
+        order_by (str): ORDER BY expression, also the order of the pages.
+        limit (int | None): Rows of the page, all rows if None.
+        offset (int): Rows skipped before the page.
+        placeholder (callable): Placeholder of the backend for a parameter name.
+        no_limit (str): LIMIT of the backend meaning no limit.
+
+    Returns:
+        tuple: (SQL, parameters dict)
+    """
+    params = {"limit": limit, "offset": offset}
+    conditions = []
+    for index, (condition, value) in enumerate(filters):
+        if value is not None:
+            params[f"p{index}"] = value
+            conditions.append(condition.format(placeholder(f"p{index}")))
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    page = placeholder("limit") if limit is not None else no_limit
+    return (f"{query} {where} ORDER BY {order_by} LIMIT {page} OFFSET {placeholder('offset')}", params)
+
+
+class Storage(ABC):
+    """
+    Tournament data operations of the round cycle, independent of the
+    database behind them. Commands reach the data only through these
+    methods, so they run the same on Postgres and on a local SQLite file.
+
+    Writes are not committed by the methods (except register_players and
+    fill_standings, which are whole commands); the caller commits.
+    """
+
+    # Exception type of the backend's driver errors
+    Error = Exception
+
+    @abstractmethod
+    def active_players(self):
+        """Active players in ranking order as Player objects."""
+
+    @abstractmethod
+    def max_round_id(self):
+        """Last round stored in results, 0 before the first."""
+
+    @abstractmethod
+    def result_pairs(self):
+        """(player1_id, player2_id) of every game played, player2_id None for BYEs."""
+
+    def head_to_head_map(self, player_ids=(), use_cache=True, known_rounds=None, save_cache=True):
+        """
+        HeadToHead index of every game played, see load_head_to_head_map().
+        save_cache=False writes the cache only once commit() succeeds, for
+        callers whose latest round is not committed yet.
+        """
+        return HeadToHead.from_pairs(self.result_pairs(), player_ids)
+
+    @abstractmethod
+    def check_identities(self, rows):
+        """(line, message) errors for parsed result rows whose id and name are not in standings."""
+
+    @abstractmethod
+    def insert_results(self, results):
+        """Insert result rows as (round_id, player1_id, player1_name, player1_score,
+        player2_score, player2_name, player2_id)."""
+
+    @abstractmethod
+    def apply_round(self, round_id, full_tiebreaks=False, verify=False):
+        """Apply a registered round to the standings and recompute the tie-breakers."""
+
+    @abstractmethod
+    def ranked_standings(self, min_rank=None, max_rank=None, limit=None, offset=0, batch_size=BATCH_SIZE):
+        """
+        Stream the ranked active players as (rank, name, matches, t2, t1,
+        points) rows, fetched batch_size rows at a time. The rank range and
+        the page (limit, offset) are applied by the database.
+        """
+
+    @abstractmethod
+    def players(self, limit=None, offset=0, batch_size=BATCH_SIZE):
+        """Stream the registered players as (id, name, email) rows, by id."""
+
+    @abstractmethod
+    def results(self, round_id=None, limit=None, offset=0, batch_size=BATCH_SIZE):
+        """Stream the results, of one round if round_id is given, as (round_id,
+        player1_name, player1_score, player2_score, player2_name) rows."""
+
+    @abstractmethod
+    def player_ratings(self):
+        """Ratings of the rated players as {id: rating}."""
+
+    @abstractmethod
+    def standing_scores(self):
+        """(id, points, matches) of every standings row."""
+
+    @abstractmethod
+    def register_players(self, csv_file, skip_invalid=False, reject_file=None):
+        """Register the players of a CSV file or stream, see register_players.register_players()."""
+
+    @abstractmethod
+    def fill_standings(self, initial_points=0.0, seed_ids=(), seed_points=()):
+        """Create the missing standings rows, see register_standings.fill_standings_table()."""
+
+    @abstractmethod
+    def commit(self):
+        """Commit the open transaction."""
+
+    @abstractmethod
+    def rollback(self):
+        """Roll back the open transaction."""
+
+    @abstractmethod
+    def close(self):
+        """Close the connection to the database."""
+
+
+class PostgresStorage(Storage):
+    """Storage on the Postgres schema, through the functions of the commands."""
+
+    Error = psycopg2.Error
+
+    def __init__(self, conn):
+        self.conn = conn
+        # Cache writes waiting for the transaction they depend on to commit
+        self.pending_saves = []
+
+    def active_players(self):
+        return get_active_players(self.conn)
+
+    def max_round_id(self):
+        return get_max_round_id(self.conn)
+
+    def result_pairs(self):
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT player1_id, player2_id FROM results;")
+            return cur.fetchall()
+
+    def head_to_head_map(self, player_ids=(), use_cache=True, known_rounds=None, save_cache=True):
+        if not use_cache:
+            return create_head_to_head_map(self.conn, player_ids)
+        if save_cache:
+            return load_head_to_head_map(self.conn, player_ids, known_rounds=known_rounds)
+        return load_head_to_head_map(self.conn, player_ids, known_rounds=known_rounds,
+                                     save=lambda *cache: self.pending_saves.append(cache))
+
+    def check_identities(self, rows):
+        with self.conn.cursor() as cur:
+            return check_identities(cur, rows)
+
+    def insert_results(self, results):
+        with self.conn.cursor() as cur:
+            insert_results(cur, results)
+
+    def apply_round(self, round_id, full_tiebreaks=False, verify=False):
+        apply_scores_to_standings(self.conn, round_id, commit=False)
+        return apply_tiebreaks(self.conn, None if full_tiebreaks else round_id, verify=verify, commit=False)
+
+    def _stream(self, name, query, filters, order_by, limit, offset, batch_size):
+        """Rows of a named (server-side) cursor, batch_size rows per round trip."""
+        sql, params = filtered_query(query, filters, order_by, limit, offset, "%({})s".format, "ALL")
+        with self.conn.cursor(name=name) as cur:
+            cur.itersize = batch_size
+            cur.execute(sql, params)
+            yield from cur
+
+    def ranked_standings(self, min_rank=None, max_rank=None, limit=None, offset=0, batch_size=BATCH_SIZE):
+        if snapshot_version(self.conn) is None:
+            refresh_snapshot(self.conn, commit=False)
+        return self._stream("ranked_standings", SNAPSHOT_STANDINGS_QUERY,
+                            [("s.rank >= {}", min_rank), ("s.rank <= {}", max_rank)],
+                            "s.rank", limit, offset, batch_size)
+
+    def players(self, limit=None, offset=0, batch_size=BATCH_SIZE):
+        return self._stream("players", PLAYERS_QUERY, [], "id", limit, offset, batch_size)
+
+    def results(self, round_id=None, limit=None, offset=0, batch_size=BATCH_SIZE):
+        return self._stream("results", RESULTS_QUERY, [("round_id = {}", round_id)],
+                            "round_id, player1_id", limit, offset, batch_size)
+
+    def player_ratings(self):
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT id, rating FROM players WHERE rating IS NOT NULL;")
+            return dict(cur.fetchall())
+
+    def standing_scores(self):
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT id, points::float8, matches FROM standings;")
+            return cur.fetchall()
+
+    def register_players(self, csv_file, skip_invalid=False, reject_file=None):
+        return register_players(self.conn, csv_file, skip_invalid, reject_file)
+
+    def fill_standings(self, initial_points=0.0, seed_ids=(), seed_points=()):
+        return fill_standings_table(self.conn, initial_points, seed_ids, seed_points)
+
+    def commit(self):
+        self.conn.commit()
+        pending_saves, self.pending_saves = self.pending_saves, []
+        for cache in pending_saves:
+            save_head_to_head_cache(*cache)
+
+    def rollback(self):
+        self.conn.rollback()
+        self.pending_saves = []
+
+    def close(self):
+        self.conn.close()
+
+
+# Schema of db/migrations in SQLite types. DECIMAL columns become REAL.
+SQLITE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS players (
+        id TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        email TEXT NOT NULL,
+        rating INTEGER
+    );
+
+    CREATE TABLE IF NOT EXISTS results (
+        round_id INTEGER NOT NULL,
+        player1_id TEXT NOT NULL REFERENCES players(id),
+        player1_name TEXT NOT NULL,
+        player1_score REAL NOT NULL,
+        player2_score REAL,
+        player2_name TEXT,
+        player2_id TEXT REFERENCES players(id),
+        PRIMARY KEY (round_id, player1_id),
+        CONSTRAINT one_result_per_player CHECK (player1_id != player2_id)
+    );
+
+    CREATE INDEX IF NOT EXISTS results_player1_idx ON results (player1_id, player2_id);
+    CREATE INDEX IF NOT EXISTS results_player2_idx ON results (player2_id, player1_id);
+
+    CREATE TABLE IF NOT EXISTS standings (
+        id TEXT PRIMARY KEY REFERENCES players(id),
+        name TEXT,
+        is_active BOOLEAN,
+        is_bye BOOLEAN,
+        matches INTEGER NOT NULL,
+        tiebreaker_C REAL,
+        tiebreaker_B REAL,
+        tiebreaker_A REAL,
+        points REAL
+    );
+"""
+
+# Standings order of the snapshot: points, tie-breakers A, B and C, then id
+SQLITE_RANKING = "points DESC, tiebreaker_A DESC, tiebreaker_B DESC, tiebreaker_C DESC, id"
+
+
+def sqlite_params(sql):
+    """Postgres pyformat placeholders of shared SQL as SQLite named ones."""
+    return sql.replace("%(round_id)s", ":round_id")
+
+
+def stage_players_sqlite(cur, csv_file):
+    """
+    Fill the players staging table of register_players() with executemany(),
+    SQLite's stand-in for COPY. The temporary table lives until the next
+    registration or the end of the connection.
+
+    Returns:
+        int: Number of rows staged.
+    """
+    cur.execute("DROP TABLE IF EXISTS temp.players_staging;")
+    cur.execute("""
+        CREATE TEMP TABLE players_staging (
+            row_number INTEGER PRIMARY KEY,
+            id TEXT,
+            name TEXT,
+            email TEXT,
+            rating TEXT,
+            reason TEXT
+        );
+    """)
+    with open_csv(csv_file) as csvfile:
+        reader = csv.reader(csvfile)
+        header = next(reader, [])
+        check_header(header)
+        # Empty fields are NULL, as COPY ... WITH (FORMAT csv) reads them
+        cur.executemany(f"INSERT INTO players_staging ({', '.join(header)}) "
+                        f"VALUES ({', '.join('?' * len(header))});",
+                        ([value or None for value in row + [None] * (len(header) - len(row))]
+                         for row in reader))
+    cur.execute("SELECT COUNT(*) FROM players_staging;")
+    return cur.fetchone()[0]
+
+
+class SQLiteStorage(Storage):
+    """
+    Storage in a local SQLite database, for tests, offline simulations and
+    small events without a Postgres server. The tie-breakers run the same
+    CTEs as apply_tiebreaks().
+    """
+
+    Error = sqlite3.Error
+
+    def __init__(self, path=":memory:"):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA foreign_keys = ON;")
+        self.conn.executescript(SQLITE_SCHEMA)
+        # Files created before players had a rating
+        if "rating" not in {column[1] for column in self.conn.execute("PRAGMA table_info(players);")}:
+            self.conn.execute("ALTER TABLE players ADD COLUMN rating INTEGER;")
+
+    def active_players(self):
+        rows = self.conn.execute(f"""
+            SELECT id, name, is_bye, points
+            FROM standings
+            WHERE is_active
+            ORDER BY {SQLITE_RANKING};
+        """).fetchall()
+        return [Player(rank + 1, player_id, name, bool(is_bye), points)
+                for rank, (player_id, name, is_bye, points) in enumerate(rows)]
+
+    def max_round_id(self):
+        return self.conn.execute("SELECT COALESCE(MAX(round_id), 0) FROM results;").fetchone()[0]
+
+    def result_pairs(self):
+        return self.conn.execute("SELECT player1_id, player2_id FROM results;").fetchall()
+
+    def check_identities(self, rows):
+        names = dict(self.conn.execute("SELECT id, name FROM standings;"))
+        errors = []
+        for line, result in rows:
+            _, player1_id, player1_name, _, _, player2_name, player2_id = result
+            for player_id, name in ((player1_id, player1_name), (player2_id, player2_name)):
+                if player_id is not None and names.get(player_id) != name:
+                    errors.append((line, f"Player mismatch: {player_id} - {name} not found in standings."))
+        return errors
+
+    def insert_results(self, results):
+        self.conn.executemany("""
+            INSERT INTO results (round_id, player1_id, player1_name, player1_score,
+                                 player2_score, player2_name, player2_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?);
+        """, results)
+
+    def apply_round(self, round_id, full_tiebreaks=False, verify=False):
+        params = {"round_id": round_id}
+        check_round_status(round_id, *self.conn.execute(sqlite_params(ROUND_STATUS_SQL), params).fetchone())
+        self.conn.execute(sqlite_params(APPLY_SCORES_SQL), params)
+        logger.info("Record applied successfully")
+
+        scope = FULL_SCOPE if full_tiebreaks else ROUND_SCOPE
+        self.conn.execute(sqlite_params(UPDATE_TIEBREAKS_SQL.format(scope=scope)), params)
+
+        if verify:
+            mismatches = [row[0] for row in self.conn.execute(sqlite_params(TIEBREAK_MISMATCHES_SQL))]
+            if mismatches:
+                self.conn.rollback()
+                raise ValueError(f"Tie-breakers differ from a full recomputation for "
+                                 f"{len(mismatches)} players: {', '.join(mismatches[:10])}")
+            logger.info("Tie-breakers verified against a full recomputation.")
+        logger.info("Tie-breakers recalculated successfully.")
+
+    def _stream(self, query, filters, order_by, limit, offset, batch_size):
+        """Rows of a query, fetched batch_size rows at a time."""
+        sql, params = filtered_query(query, filters, order_by, limit, offset, ":{}".format, "-1")
+        cur = self.conn.execute(sql, params)
+        try:
+            while rows := cur.fetchmany(batch_size):
+                yield from rows
+        finally:
+            cur.close()
+
+    def ranked_standings(self, min_rank=None, max_rank=None, limit=None, offset=0, batch_size=BATCH_SIZE):
+        ranked = f"""
+            SELECT * FROM (
+                SELECT ROW_NUMBER() OVER (ORDER BY {SQLITE_RANKING}) AS rank,
+                       name, matches, tiebreaker_B, tiebreaker_A, points
+                FROM standings
+                WHERE is_active
+            ) AS ranked
+        """
+        return self._stream(ranked, [("rank >= {}", min_rank), ("rank <= {}", max_rank)],
+                            "rank", limit, offset, batch_size)
+
+    def players(self, limit=None, offset=0, batch_size=BATCH_SIZE):
+        return self._stream(PLAYERS_QUERY, [], "id", limit, offset, batch_size)
+
+    def results(self, round_id=None, limit=None, offset=0, batch_size=BATCH_SIZE):
+        return self._stream(RESULTS_QUERY, [("round_id = {}", round_id)],
+                            "round_id, player1_id", limit, offset, batch_size)
+
+    def player_ratings(self):
+        return dict(self.conn.execute("SELECT id, rating FROM players WHERE rating IS NOT NULL;"))
+
+    def standing_scores(self):
+        return self.conn.execute("SELECT id, points, matches FROM standings;").fetchall()
+
+    def register_players(self, csv_file, skip_invalid=False, reject_file=None):
+        return register_players(self.conn, csv_file, skip_invalid, reject_file, stage=stage_players_sqlite)
+
+    def fill_standings(self, initial_points=0.0, seed_ids=(), seed_points=()):
+        # Seeds go through a temporary table, the players are added by one
+        # INSERT ... SELECT like the Postgres unnest() join
+        self.conn.execute("DROP TABLE IF EXISTS temp.standings_seeds;")
+        self.conn.execute("CREATE TEMP TABLE standings_seeds (id TEXT PRIMARY KEY, points REAL);")
+        self.conn.executemany("INSERT OR REPLACE INTO standings_seeds (id, points) VALUES (?, ?);",
+                              zip(seed_ids, map(float, seed_points)))
+        created = self.conn.execute("""
+            INSERT OR IGNORE INTO standings (id, name, is_active, is_bye, matches,
+                                             tiebreaker_C, tiebreaker_B, tiebreaker_A, points)
+            SELECT p.id, p.name, 1, 0, 0, 0.0, 0.0, 0.0, COALESCE(seed.points, ?)
+            FROM players AS p
+            LEFT JOIN standings_seeds AS seed ON seed.id = p.id
+            WHERE p.id != '_';
+        """, (float(initial_points),)).rowcount
+
+        unknown = [row[0] for row in self.conn.execute("""
+            SELECT seed.id
+            FROM standings_seeds AS seed
+            LEFT JOIN players AS p ON p.id = seed.id
+            WHERE p.id IS NULL
+            ORDER BY seed.id;
+        """)]
+        if unknown:
+            logger.warning(f"{len(unknown)} seeded ids are not registered players: {', '.join(unknown[:10])}")
+        self.conn.execute("DROP TABLE standings_seeds;")
+        self.conn.commit()
+        logger.info(f"Standings table filled successfully ({created} new players)")
+        return created
+
+    def commit(self):
+        self.conn.commit()
+
+    def rollback(self):
+        self.conn.rollback()
+
+    def close(self):
+        self.conn.close()
+
+
+def sqlite_path(conn_string):
+    """File of a sqlite: connection string, ':memory:' for an in-memory database."""
+    path = conn_string[len(SQLITE_PREFIX):]
+    if path.startswith("///"):
+        path = path[3:]
+    elif path.startswith("//"):
+        path = path[2:]
+    return path or ":memory:"
+
+
+@contextmanager
+def open_storage(conn_string=None, conn=None):
+    """
+    Yield the Storage of one command.
+
+    A Storage passed in is yielded as is, a Postgres connection passed in
+    (the one main.py shares) is wrapped; both are left open. Otherwise a
+    sqlite: connection string opens the local backend, anything else a
+    Postgres connection, and it is closed afterwards.
+    """
+    if isinstance(conn, Storage):
+        yield conn
+    elif conn is not None:
+        yield PostgresStorage(conn)
+    elif conn_string and conn_string.startswith(SQLITE_PREFIX):
+        storage = SQLiteStorage(sqlite_path(conn_string))
+        try:
+            yield storage
+        finally:
+            storage.close()
+    else:
+        with open_connection(conn_string) as conn:
+            yield PostgresStorage(conn)
@@ -9,10 +9,9 @@ and converting reports.
 """
 
 import argparse
-import subprocess
+import importlib
 import sys
 import os
-from pathlib import Path
 
 
 # Parse only --verbose early (before imports)
@@ -21,71 +20,171 @@ if "--verbose" in sys.argv:
 else:
     os.environ["LOG_LEVEL"] = "INFO"
 
-from common.logger import get_logger
-logger = get_logger(__name__)
-
 # --- Ensure project root is on sys.path ---
 ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # project root
 SRC = os.path.join(ROOT, "src")
 if SRC not in sys.path:
     sys.path.insert(0, SRC)
 
+from common.db_utils import open_connection
+from common.logger import get_logger
+logger = get_logger(__name__)
 
-def run_script(script_rel_path, *args):
-    """Run a sub-script with correct Python environment."""
-    env = os.environ.copy()
-    env["PYTHONPATH"] = SRC + os.pathsep + env.get("PYTHONPATH", "")
-    script_path = os.path.join(SRC, script_rel_path)
-    subprocess.run([sys.executable, script_path, *args], check=True, env=env)
+# Module implementing every command, imported only when the command runs
+COMMANDS = {
+    "init-db": "core.init_db",
+    "generate-players": "core.generate_players",
+    "register-players": "core.register_players",
+    "generate-swiss-pairings": "core.generate_swiss_pairings",
+    "generate-roundrobin-pairings": "core.generate_roundrobin_pairings",
+    "register-standings": "core.register_standings",
+    "populate-results": "utils.populate_results",
+    "register-results": "core.register_results",
+    "print-table": "utils.print_table",
+    "apply-results": "core.apply_results_to_standings",
+    "run-round": "core.run_round",
+    "serve": "core.service",
+    "convert-excel-to-csv": "utils.convert_excel_to_csv",
+    "convert-table-to-excel": "utils.convert_table_to_excel",
+    "benchmark-pairings": "utils.benchmark_pairings",
+    "explain-queries": "utils.explain_queries",
+    "simulate-tournament": "utils.simulate_tournament",
+    "forecast-standings": "utils.forecast_standings",
+}
+
+# Commands run on the connection opened by main(). init-db connects on its
+# own, as the schema owner, before the tournament schema exists.
+DB_COMMANDS = {
+    "register-players", "generate-swiss-pairings", "generate-roundrobin-pairings",
+    "register-standings", "register-results", "print-table", "apply-results", "run-round",
+    "convert-table-to-excel", "explain-queries", "forecast-standings", "serve",
+}
+
+# DB commands written against core.storage, which also run on a local
+# SQLite database (--conn sqlite:///<file>). The others need PostgreSQL.
+STORAGE_COMMANDS = {
+    "register-players", "generate-swiss-pairings", "register-standings", "register-results",
+    "print-table", "apply-results", "run-round", "convert-table-to-excel",
+}
+
+
+def run_command(command, argv, conn=None):
+    """
+    Run a command in this process through the main() of its module.
+
+    Args:
+        command (str): Command name, a key of COMMANDS.
+        argv (list): Arguments of the command, without the command name.
+        conn: Open database connection or Storage shared with the command, or None.
+    """
+    module = importlib.import_module(COMMANDS[command])
+    if command in DB_COMMANDS:
+        module.main(argv, conn=conn)
+    else:
+        module.main(argv)
+
+
+def profile_startup(argv):
+    """
+    Run the command in a child interpreter with -X importtime and report
+    where its startup time goes. The command's own output is passed through.
+
+    Returns:
+        int: Exit code of the command.
+    """
+    import subprocess
+    from common.startup import parse_import_times, print_import_profile
+
+    child = subprocess.run([sys.executable, "-X", "importtime", os.path.abspath(__file__), *argv],
+                           stderr=subprocess.PIPE, text=True)
+    lines = child.stderr.splitlines()
+    for line in lines:
+        if not line.startswith("import time:"):
+            print(line, file=sys.stderr)
+    print_import_profile(parse_import_times(lines))
+    return child.returncode
 
 
 def main():
+    if "--startup-profile" in sys.argv[1:]:
+        sys.exit(profile_startup([arg for arg in sys.argv[1:] if arg != "--startup-profile"]))
+
     parser = argparse.ArgumentParser(
         description="Swiss System Tournament Manager CLI"
     )
     parser.add_argument("--verbose", "-v",
                         action="store_true",
                         help="Enable verbose logging")
+    parser.add_argument("--startup-profile",
+                        action="store_true",
+                        help="Run the command and report its import time breakdown")
     subparsers = parser.add_subparsers(dest="command", required=True)
 
     # --- Command definitions ---
 
-    subparsers.add_parser("init-db", help="Initialize the tournament database")
-    subparsers.add_parser("generate-players", help="Generate list of players")
-    subparsers.add_parser("register-players", help="Register players into the database")
+    # Commands without options of their own here leave --help to their module.
+    # --conn of the commands that run on the shared connection
+    db = argparse.ArgumentParser(add_help=False)
+    db.add_argument("--conn", help="PostgreSQL connection string, or sqlite:///<file> for the storage commands")
+
+    subparsers.add_parser("init-db", add_help=False, help="Initialize or migrate the tournament database")
+    subparsers.add_parser("generate-players", add_help=False, help="Generate list of players")
+    subparsers.add_parser("register-players", add_help=False, parents=[db],
+                          help="Register players into the database")
 
-    p = subparsers.add_parser("generate-swiss-pairings", help="Generate swiss match pairings")
+    p = subparsers.add_parser("generate-swiss-pairings", parents=[db], help="Generate swiss match pairings")
     p.add_argument("-r", "--round-id", required=True, help="Round ID")
+    p.add_argument("-e", "--engine", choices=["greedy", "matching", "score-groups"], default="greedy",
+                   help="Pairing engine (default: %(default)s)")
+    p.add_argument("-w", "--workers", help="Worker processes for the score-groups engine")
+    p.add_argument("--no-cache", action="store_true", help="Rebuild the head-to-head history from the DB")
 
-    p = subparsers.add_parser("generate-roundrobin-pairings", help="Generate round-robin match pairings")
-    
-    subparsers.add_parser("register-standings", help="Register tournament standings")
+    subparsers.add_parser("generate-roundrobin-pairings", add_help=False, parents=[db],
+                          help="Generate round-robin match pairings")
+
+    subparsers.add_parser("register-standings", add_help=False, parents=[db],
+                          help="Register tournament standings")
 
     p = subparsers.add_parser("populate-results", help="Populate results from a file")
     p.add_argument("-f", "--file", required=True, help="CSV file with results")
 
-    p = subparsers.add_parser("register-results", help="Register results into DB")
+    p = subparsers.add_parser("register-results", parents=[db], help="Register results into DB")
     p.add_argument("-f", "--input-file", required=True, help="Results input CSV file")
-    p.add_argument("--conn", help="PostgreSQL connection string")
 
-    p = subparsers.add_parser("print-table", help="Print tournament tables")
+    p = subparsers.add_parser("print-table", parents=[db], help="Print tournament tables")
     p.add_argument("-t", "--table", choices=["standings", "results", "players"], required=True)
-    p.add_argument("--conn", help="PostgreSQL connection string")
 
-    p = subparsers.add_parser("apply-results", help="Apply results to standings for a given round")
+    p = subparsers.add_parser("apply-results", parents=[db], help="Apply results to standings for a given round")
     p.add_argument("-r", "--round-id", required=True)
-    p.add_argument("--conn", help="PostgreSQL connection string")
+
+    p = subparsers.add_parser("run-round", parents=[db],
+                              help="Register and apply a round's results and pair the next round in one transaction")
+    p.add_argument("-f", "--input-file", required=True, help="Results input CSV file")
+
+    subparsers.add_parser("serve", add_help=False, parents=[db],
+                          help="Serve pairings, results and standings over HTTP from warm in-memory state")
 
     p = subparsers.add_parser("convert-excel-to-csv", help="Convert Excel file to CSV format")
     p.add_argument("--input", default="data/input.xlsx", help="Path to input Excel file")
     p.add_argument("--output", default="data/output.csv", help="Path to output CSV file")
 
-    subparsers.add_parser("convert-table-to-excel", help="Convert DB tables to Excel format")
+    subparsers.add_parser("convert-table-to-excel", add_help=False, parents=[db],
+                          help="Convert DB tables to Excel format")
+
+    subparsers.add_parser("benchmark-pairings", add_help=False,
+                          help="Benchmark pairing engines on synthetic tournaments")
+    subparsers.add_parser("explain-queries", add_help=False, parents=[db],
+                          help="Show query plans with and without the schema indexes")
+    subparsers.add_parser("simulate-tournament", add_help=False, help="Simulate whole tournaments in memory")
+
+    p = subparsers.add_parser("forecast-standings", parents=[db],
+                              help="Forecast final placements from the current standings")
+    p.add_argument("-r", "--rounds-left", required=True)
 
     test_parser = subparsers.add_parser("test", help="Run internal test scripts")
     test_parser.add_argument(
         "name",
-        choices=["test_pairings", "test_player", "test_standings", "test_tournament"],
+        choices=["test_cli", "test_pairings", "test_player", "test_standings", "test_tournament"],
         help="Test script name (e.g., test_pairings)"
     )
 
@@ -96,74 +195,59 @@ def main():
     # Ignore --verbose if already present
     unknown = [u for u in unknown if u not in ("--verbose", "-v")]
 
-    try:
-        # --- Core scripts ---
-        if cmd == "init-db":
-            run_script("core/init_db.py", *unknown)
-
-        elif cmd == "generate-players":
-            run_script("core/generate-players.py", *unknown)
-
-        elif cmd == "register-players":
-            run_script("core/register-players.py", *unknown)
-
-        elif cmd == "generate-roundrobin-pairings":
-            run_script("core/generate-roundrobin-pairings.py", *unknown)
-
-        elif cmd == "generate-swiss-pairings":
-            run_script("core/generate-swiss-pairings.py", "-r", args.round_id, *unknown)
-
-        elif cmd == "register-standings":
-            run_script("core/register-standings.py", *unknown)
-
-        elif cmd == "populate-results":
-            run_script("utils/populate-results.py", "-f", args.file, *unknown)
-
-        elif cmd == "register-results":
-            cmd_args = ["-f", args.input_file]
-            if args.conn:
-                cmd_args += ["--conn", args.conn]
-            run_script("core/register-results.py", *cmd_args, *unknown)
-
-        elif cmd == "apply-results":
-            cmd_args = ["-r", args.round_id]
-            if args.conn:
-                cmd_args += ["--conn", args.conn]
-            run_script("core/apply-results-to-standings.py", *cmd_args, *unknown)
-
-        # --- Utility scripts ---
-        elif cmd == "print-table":
-            cmd_args = ["-t", args.table]
-            if args.conn:
-                cmd_args += ["--conn", args.conn]
-            run_script("utils/print-table.py", *cmd_args, *unknown)
-
-        elif cmd == "convert-excel-to-csv":
-            run_script("utils/convert-excel-to-csv.py", "--input", args.input, "--output", args.output, *unknown)
-
-        elif cmd == "convert-table-to-excel":
-            run_script("utils/convert-table-to-excel.py", *unknown)
+    # Arguments main.py parsed itself, handed back to the command
+    if cmd == "generate-swiss-pairings":
+        cmd_args = ["-r", args.round_id, "-e", args.engine]
+        if args.workers:
+            cmd_args += ["--workers", args.workers]
+        if args.no_cache:
+            cmd_args += ["--no-cache"]
+    elif cmd == "populate-results":
+        cmd_args = ["-f", args.file]
+    elif cmd in ("register-results", "run-round"):
+        cmd_args = ["-f", args.input_file]
+    elif cmd == "print-table":
+        cmd_args = ["-t", args.table]
+    elif cmd == "apply-results":
+        cmd_args = ["-r", args.round_id]
+    elif cmd == "convert-excel-to-csv":
+        cmd_args = ["--input", args.input, "--output", args.output]
+    elif cmd == "forecast-standings":
+        cmd_args = ["-r", args.rounds_left]
+    else:
+        cmd_args = []
 
+    try:
         # --- Test scripts ---
-        elif cmd == "test":
-            run_script(f"test/{args.name}.py", *unknown)
-
+        if cmd == "test":
+            import pytest
+            sys.exit(pytest.main([os.path.join(ROOT, "tests", f"{args.name}.py"), *unknown]))
+
+        # --- Core and utility scripts, in this process ---
+        if {"-h", "--help"} & set(unknown):
+            # The command's parser prints its help and exits before connecting
+            run_command(cmd, cmd_args + unknown)
+        elif cmd in STORAGE_COMMANDS:
+            from core.storage import open_storage
+            with open_storage(args.conn) as storage:
+                run_command(cmd, cmd_args + unknown, storage)
+        elif cmd in DB_COMMANDS:
+            if (args.conn or "").startswith("sqlite:"):
+                logger.error(f"{cmd} needs a PostgreSQL database, SQLite is supported by: "
+                             f"{', '.join(sorted(STORAGE_COMMANDS))}")
+                sys.exit(2)
+            with open_connection(args.conn) as conn:
+                run_command(cmd, cmd_args + unknown, conn)
         else:
-            parser.print_help()
+            run_command(cmd, cmd_args + unknown)
 
-    except subprocess.CalledProcessError as err:
-        logger.error("Subcommand failed: %s", err)
-        sys.exit(err.returncode)
     except FileNotFoundError as err:
-        logger.error("Script not found: %s", err)
+        logger.error("File not found: %s", err)
         sys.exit(1)
     except Exception as err:
         logger.error("Unexpected error occurred! %s", err)
         sys.exit(1)
 
 
-
-
-
 if __name__ == "__main__":
     main()
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from common.logger import get_logger
+from common.common import root_dir
+from core.pairing_engines import ENGINES, round_robin_pairing
+from core.simulation import SimulatedTournament
+
+logger = get_logger(__name__)
+
+# Relative slowdown / memory growth flagged as a regression against a baseline
+DEFAULT_TOLERANCE = 1.5
+
+
+def timed(function, *args, **kwargs):
+    """Return (result, wall time in seconds) of a single call."""
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def peak_memory(function, *args, **kwargs):
+    """
+    Return the peak traced allocation in bytes of a single call.
+    Tracing slows Python code down, so it never runs in the timed call.
+    """
+    tracemalloc.start()
+    try:
+        function(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def process_usage():
+    """
+    Return (max RSS of this process, max RSS of its largest reaped child,
+    CPU seconds of the reaped children), the RSS in bytes.
+
+    The RSS figures are high-water marks over the life of the process, so
+    they cover worker processes that tracemalloc cannot see, but only grow
+    from one measurement to the next.
+    """
+    # ru_maxrss is in KiB on Linux, in bytes on macOS
+    unit = 1 if sys.platform == 'darwin' else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_maxrss * unit, children.ru_maxrss * unit, children.ru_utime + children.ru_stime
+
+
+def benchmark_swiss(engine, num_players, rounds, seed, track_memory=True):
+    """
+    Simulate a Swiss tournament in memory and measure every pairing round.
+
+    Rounds are played by SimulatedTournament, so results are drawn at random
+    and the standings evolve as they would through the database scripts.
+    peak_memory is traced in this process only: a round whose pairing ran
+    in worker processes (score-groups on large fields) is flagged with
+    peak_memory_partial, and max_rss_children reports the workers instead.
+
+    Returns:
+        dict: Per round and total timing, memory and quality metrics.
+    """
+    tournament = SimulatedTournament(num_players, rounds, np.random.default_rng(seed))
+    head_to_head_map = tournament.head_to_head_map
+    pairing = ENGINES[engine]
+
+    report = {"engine": engine, "players": num_players, "rounds": []}
+    for round_id in range(1, rounds + 1):
+        players = tournament.ranked_players()
+        stats = {}
+        _, _, child_time = process_usage()
+        pairs, elapsed = timed(pairing, players, head_to_head_map, stats=stats)
+        peak = peak_memory(pairing, players, head_to_head_map) if track_memory else None
+        # Workers are reaped when the pool closes, so their CPU time shows up here
+        partial = process_usage()[2] > child_time
+
+        games = [(p1, p2) for p1, p2 in pairs if p2 != 'BYE']
+        byes = [p1 for p1, p2 in pairs if p2 == 'BYE']
+        rematches = sum(1 for p1, p2 in games if head_to_head_map.played(p1.id, p2.id))
+        score_diff = sum(abs(p1.points - p2.points) for p1, p2 in games)
+        tournament.play_round(pairs)
+
+        report["rounds"].append({
+            "round": round_id,
+            "wall_time": round(elapsed, 6),
+            "peak_memory": peak,
+            "peak_memory_partial": partial,
+            "rematches": rematches,
+            "byes": len(byes),
+            "score_diff_sum": score_diff,
+            "swaps": stats.get("swaps", 0),
+            "floaters": stats.get("floaters", 0),
+        })
+        logger.debug(f"{engine} n={num_players} round {round_id}: {elapsed:.3f}s, "
+                     f"{len(byes)} byes, {rematches} rematches")
+
+    rows = report["rounds"]
+    peaks = [row["peak_memory"] for row in rows if row["peak_memory"] is not None]
+    max_rss, max_rss_children, _ = process_usage()
+    report.update({
+        "wall_time": round(sum(row["wall_time"] for row in rows), 6),
+        "peak_memory": max(peaks) if peaks else None,
+        "peak_memory_partial": any(row["peak_memory_partial"] for row in rows),
+        "max_rss": max_rss,
+        "max_rss_children": max_rss_children,
+        "rematches": sum(row["rematches"] for row in rows),
+        "byes": sum(row["byes"] for row in rows),
+        "score_diff_sum": sum(row["score_diff_sum"] for row in rows),
+        "swaps": sum(row["swaps"] for row in rows),
+        "floaters": sum(row["floaters"] for row in rows),
+        "head_to_head_bytes": head_to_head_map.nbytes,
+    })
+    return report
+
+
+def benchmark_round_robin(num_players, track_memory=True):
+    """Measure generating the full round-robin schedule for num_players."""
+    players = SimulatedTournament(num_players, 0).ranked_players()
+
+    schedule, elapsed = timed(round_robin_pairing, players)
+    peak = peak_memory(round_robin_pairing, players) if track_memory else None
+
+    return {
+        "players": num_players,
+        "wall_time": round(elapsed, 6),
+        "peak_memory": peak,
+        "rounds": len(schedule),
+        "games": sum(1 for round_pairs in schedule for _, p2 in round_pairs if p2 != 'BYE'),
+        "byes": sum(1 for round_pairs in schedule for _, p2 in round_pairs if p2 == 'BYE'),
+    }
+
+
+def compare_to_baseline(report, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compare a report with an earlier one.
+
+    Returns:
+        list[str]: Human readable regressions, empty if none.
+    """
+    regressions = []
+    previous = {(row["engine"], row["players"]): row for row in baseline.get("swiss", [])}
+    for row in report["swiss"]:
+        old = previous.get((row["engine"], row["players"]))
+        if old is None:
+            continue
+        label = f"{row['engine']} n={row['players']}"
+        if old["wall_time"] and row["wall_time"] > tolerance * old["wall_time"]:
+            regressions.append(f"{label}: wall time {old['wall_time']:.3f}s -> {row['wall_time']:.3f}s")
+        if old.get("peak_memory") and row.get("peak_memory") and \
+           row["peak_memory"] > tolerance * old["peak_memory"]:
+            regressions.append(f"{label}: peak memory {old['peak_memory']} -> {row['peak_memory']} bytes")
+        if old.get("max_rss_children") and row.get("max_rss_children") and \
+           row["max_rss_children"] > tolerance * old["max_rss_children"]:
+            regressions.append(f"{label}: worker RSS {old['max_rss_children']} -> "
+                               f"{row['max_rss_children']} bytes")
+        for metric in ("rematches", "byes"):
+            if row[metric] > old[metric]:
+                regressions.append(f"{label}: {metric} {old[metric]} -> {row[metric]}")
+    return regressions
+
+
+def print_report(report):
+    print("{:<13} | {:>7} | {:>10} | {:>12} | {:>9} | {:>5} | {:>10} | {:>6} | {:>8}".format(
+        "engine", "players", "time (s)", "peak (MiB)", "rematches", "byes", "score diff", "swaps", "floaters"))
+    print("-" * 105)
+    for row in report["swiss"]:
+        peak = "-" if row["peak_memory"] is None else f"{row['peak_memory'] / 2**20:.1f}"
+        if row["peak_memory"] is not None and row.get("peak_memory_partial"):
+            peak += "*"
+        print("{:<13} | {:>7} | {:>10.3f} | {:>12} | {:>9} | {:>5} | {:>10.1f} | {:>6} | {:>8}".format(
+            row["engine"], row["players"], row["wall_time"], peak, row["rematches"], row["byes"],
+            row["score_diff_sum"], row["swaps"], row["floaters"]))
+    for row in report["round_robin"]:
+        peak = "-" if row["peak_memory"] is None else f"{row['peak_memory'] / 2**20:.1f}"
+        print("{:<13} | {:>7} | {:>10.3f} | {:>12} | {:>9} | {:>5} |".format(
+            "round-robin", row["players"], row["wall_time"], peak, "-", row["byes"]))
+    if any(row.get("peak_memory_partial") for row in report["swiss"]):
+        print("* traced in the main process only, pairing workers peaked at "
+              f"{max(row['max_rss_children'] for row in report['swiss']) / 2**20:.1f} MiB RSS")
+
+
+def parse_args(argv=None):
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="benchmark-pairings",
+        description="Benchmark pairing engines on synthetic in-memory tournaments."
+    )
+    parser.add_argument('-n', '--sizes',
+                        default='100,1000,10000',
+                        help='Comma separated field sizes (default: %(default)s)')
+    parser.add_argument('-r', '--rounds',
+                        type=int,
+                        default=7,
+                        help='Swiss rounds simulated per tournament (default: %(default)s)')
+    parser.add_argument('-e', '--engines',
+                        default=','.join(ENGINES),
+                        help='Comma separated pairing engines (default: %(default)s)')
+    parser.add_argument('--max-roundrobin',
+                        type=int,
+                        default=2000,
+                        help='Largest field to build a round-robin schedule for (default: %(default)s)')
+    parser.add_argument('--seed',
+                        type=int,
+                        default=42,
+                        help='Random seed (default: %(default)s)')
+    parser.add_argument('--no-memory',
+                        action='store_true',
+                        help='Skip the tracemalloc pass, only measure wall time')
+    parser.add_argument('-o', '--output',
+                        help='JSON report file (default: data/benchmarks/pairings_<timestamp>.json)')
+    parser.add_argument('--baseline',
+                        help='Earlier JSON report to compare against, exits 1 on regressions')
+    parser.add_argument('--tolerance',
+                        type=float,
+                        default=DEFAULT_TOLERANCE,
+                        help='Allowed slowdown / memory growth factor against the baseline (default: %(default)s)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(',')]
+    engines = args.engines.split(',')
+    unknown = [engine for engine in engines if engine not in ENGINES]
+    if unknown:
+        raise ValueError(f"Unknown pairing engines: {', '.join(unknown)}")
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "rounds": args.rounds,
+        "swiss": [],
+        "round_robin": [],
+    }
+
+    for num_players in sizes:
+        for engine in engines:
+            logger.info(f"Swiss: {engine} engine, {num_players} players, {args.rounds} rounds")
+            report["swiss"].append(
+                benchmark_swiss(engine, num_players, args.rounds, args.seed, not args.no_memory))
+
+        if num_players <= args.max_roundrobin:
+            logger.info(f"Round-robin: {num_players} players")
+            report["round_robin"].append(benchmark_round_robin(num_players, not args.no_memory))
+
+    print_report(report)
+
+    output_file = Path(args.output) if args.output else \
+        Path(root_dir(__file__)) / 'data' / 'benchmarks' / f"pairings_{datetime.now():%Y%m%d-%H%M%S}.json"
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_file, 'w') as f:
+        json.dump(report, f, indent=2)
+    logger.info(f"Benchmark report written to {output_file}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(report, baseline, args.tolerance)
+        for regression in regressions:
+            logger.error(f"Regression: {regression}")
+        if regressions:
+            sys.exit(1)
+        logger.info(f"No regressions against {args.baseline}")
+
+
+if __name__ == '__main__':
+    main()
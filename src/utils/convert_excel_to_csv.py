@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+
+from pathlib import Path
+import argparse
+import csv
+import os
+
+from openpyxl import load_workbook
+
+from core.register_players import OPTIONAL_PLAYER_COLUMNS, PLAYER_COLUMNS
+from common.common import root_dir
+from common.csv_stream import CSVStream
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Rows read from the workbook before they are handed on
+CHUNK_SIZE = 1000
+
+
+def read_sheet_chunks(input_file, sheets=None, chunk_size=CHUNK_SIZE):
+    """
+    Stream the rows of an Excel workbook in chunks.
+
+    The workbook is opened in read-only mode, which parses the sheet XML
+    as it is iterated instead of loading every cell, so at most one chunk
+    of rows is held in memory. Blank rows are skipped.
+
+    Args:
+        input_file (str): Excel file.
+        sheets (list | None): Sheets to read, in this order; all if None.
+        chunk_size (int): Rows per chunk.
+
+    Yields:
+        tuple: (sheet name, header row, list of up to chunk_size rows)
+
+    Complexity:
+        Memory : O(chunk_size)
+    """
+    workbook = load_workbook(input_file, read_only=True, data_only=True)
+    try:
+        missing = [name for name in sheets or () if name not in workbook.sheetnames]
+        if missing:
+            raise ValueError(f"Sheets not found in {input_file}: {', '.join(missing)}")
+
+        for name in sheets or workbook.sheetnames:
+            rows = workbook[name].iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                continue
+            # Trailing empty header cells are formatting, not columns
+            while header and header[-1] is None:
+                header = header[:-1]
+
+            chunk = []
+            for row in rows:
+                if all(value is None for value in row):
+                    continue
+                chunk.append(row[:len(header)])
+                if len(chunk) == chunk_size:
+                    yield name, header, chunk
+                    chunk = []
+            if chunk:
+                yield name, header, chunk
+    finally:
+        workbook.close()
+
+
+def convert_to_csv(input_file, output_file, sheets=None, chunk_size=CHUNK_SIZE):
+    """
+    Convert the sheets of an Excel workbook to one CSV file, chunk by chunk.
+
+    Every sheet must have the header of the first one, their rows are
+    appended in sheet order.
+
+    Returns:
+        int: Number of rows written.
+    """
+    header = None
+    count = 0
+    with open(output_file, 'w', newline='') as f:
+        writer = csv.writer(f)
+        for name, sheet_header, chunk in read_sheet_chunks(input_file, sheets, chunk_size):
+            if header is None:
+                header = sheet_header
+                writer.writerow(header)
+            elif sheet_header != header:
+                raise ValueError(f"Sheet {name} has the columns {list(sheet_header)}, "
+                                 f"expected {list(header)} as in the first sheet")
+            writer.writerows(chunk)
+            count += len(chunk)
+    logger.info(f"{count} rows written to {output_file}")
+    return count
+
+
+def cell_text(value):
+    """Cell value as CSV text; integral numbers (ids typed as numbers) without '.0'."""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def player_rows(chunks):
+    """
+    The id, name and email columns of workbook chunks, header first, and
+    the rating column if the first sheet has one.
+
+    Columns are found by header name, ignoring case and surrounding
+    spaces, so sheets may order them differently or carry other columns.
+
+    Raises:
+        ValueError: If a sheet lacks one of the columns.
+    """
+    columns = None
+    for name, header, chunk in chunks:
+        names = [cell_text(column).lower() for column in header]
+        if columns is None:
+            columns = PLAYER_COLUMNS + tuple(column for column in OPTIONAL_PLAYER_COLUMNS if column in names)
+            yield columns
+        missing = [column for column in columns if column not in names]
+        if missing:
+            raise ValueError(f"Sheet {name} has no {', '.join(missing)} column")
+        positions = [names.index(column) for column in columns]
+        for row in chunk:
+            yield [cell_text(row[position]) for position in positions]
+    if columns is None:
+        # No rows at all, registration still expects a header
+        yield PLAYER_COLUMNS
+
+
+def main(argv=None, conn=None):
+    """
+    Convert the sheets of an Excel workbook to CSV, or register the players
+    they list directly.
+
+    Args:
+        argv (list | None): Command line arguments, sys.argv[1:] if None.
+        conn: Open database connection or Storage to use with --register.
+    """
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(prog="convert-excel-to-csv")
+    parser.add_argument('--input',
+                        default=os.path.join(root_dir(__file__), 'data/input.xlsx'),
+                        help=f'Input Excel file (default: %(default)s)')
+    parser.add_argument('--output',
+                        default=os.path.join(root_dir(__file__), 'data/output.csv'),
+                        help=f'Output CSV file (default: %(default)s)')
+    parser.add_argument('--sheet',
+                        action='append',
+                        dest='sheets',
+                        help='Sheet to convert, repeat for several (default: every sheet)')
+    parser.add_argument('--chunk-size',
+                        type=int,
+                        default=CHUNK_SIZE,
+                        help='Rows read from the workbook at a time (default: %(default)s)')
+    parser.add_argument('--register',
+                        action='store_true',
+                        help='Register the id, name, email (and rating) columns as players instead of writing a CSV')
+    parser.add_argument('--conn',
+                        help='Connection string of --register, PostgreSQL or sqlite:///<file> '
+                             '(default: from DB_* environment variables)')
+    parser.add_argument('--skip-invalid',
+                        action='store_true',
+                        help='With --register, register the valid rows even if some are invalid')
+    parser.add_argument('--reject-file',
+                        help='With --register, write every invalid row with its reason to this CSV file')
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+
+    if args.register:
+        # Imported here, registration needs the database drivers
+        from core.storage import open_storage
+
+        rows = player_rows(read_sheet_chunks(args.input, args.sheets, args.chunk_size))
+        with open_storage(args.conn, conn) as storage:
+            storage.register_players(CSVStream(rows), args.skip_invalid, args.reject_file)
+        return
+
+    # Convert the Excel file to CSV
+    convert_to_csv(args.input, args.output, args.sheets, args.chunk_size)
+
+if __name__ == '__main__':
+    main()
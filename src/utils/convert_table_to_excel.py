@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+
+from openpyxl import Workbook
+
+from core.storage import BATCH_SIZE, open_storage
+from common.common import root_dir
+from common.logger import get_logger
+from utils.print_table import STANDINGS_COLUMNS
+
+logger = get_logger(__name__)
+
+# Sheets of the export: name, header and the Storage method streaming its rows
+SHEETS = [
+    ("standings", STANDINGS_COLUMNS, "ranked_standings"),
+    ("results", ["round_id", "player1_name", "player1_score", "player2_score", "player2_name"], "results"),
+    ("players", ["id", "name", "email"], "players"),
+]
+
+
+def export_workbook(storage, output, batch_size=BATCH_SIZE):
+    """
+    Export the standings, results and players tables to one workbook, one
+    sheet per table.
+
+    Rows stream from the storage batch_size at a time into a write-only
+    workbook, which keeps only the current row in memory and writes it
+    straight to the file, so memory stays flat however large the event.
+
+    Args:
+        storage (Storage): Tournament storage.
+        output (str): Excel file to write.
+        batch_size (int): Rows fetched from the database at a time.
+
+    Returns:
+        dict: Rows written per sheet.
+
+    Complexity:
+        Memory : O(batch_size)
+    """
+    workbook = Workbook(write_only=True)
+    counts = {}
+    for title, columns, method in SHEETS:
+        sheet = workbook.create_sheet(title)
+        sheet.append(columns)
+        counts[title] = 0
+        for row in getattr(storage, method)(batch_size=batch_size):
+            sheet.append(list(row))
+            counts[title] += 1
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    workbook.save(output)
+    return counts
+
+
+def main(argv=None, conn=None):
+    """
+    Export the tournament tables to an Excel workbook, by default
+    data/tournament_r<round>.xlsx for the last registered round.
+
+    Args:
+        argv (list | None): Command line arguments, sys.argv[1:] if None.
+        conn: Open database connection or Storage to use instead of connecting to --conn.
+    """
+    parser = argparse.ArgumentParser(prog="convert-table-to-excel")
+    parser.add_argument('--conn',
+                        help='PostgreSQL connection string, or sqlite:///<file> for a local database '
+                             '(default: from DB_* environment variables)')
+    parser.add_argument('-o',
+                        '--output',
+                        help='Output Excel file (default: data/tournament_r<round>.xlsx)')
+    parser.add_argument('--batch-size',
+                        type=int,
+                        default=BATCH_SIZE,
+                        help='Rows fetched from the database at a time (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    with open_storage(args.conn, conn) as storage:
+        output = args.output or os.path.join(root_dir(__file__), 'data',
+                                             f'tournament_r{storage.max_round_id()}.xlsx')
+        counts = export_workbook(storage, output, args.batch_size)
+
+    logger.info(f"Tournament exported to {output} "
+                f"({', '.join(f'{count} {title}' for title, count in counts.items())})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+
+import argparse
+import re
+
+from common.db_utils import open_connection
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Hot queries of the round cycle, as issued by the scripts. %(player_id)s is
+# the top ranked player and %(round_id)s the last played round.
+QUERIES = [
+    ("standings_ranking", """
+        SELECT id, name, is_bye, points
+        FROM Standings
+        WHERE is_active = true
+        ORDER BY points DESC, tiebreaker_A DESC, tiebreaker_B DESC, tiebreaker_C DESC, id;
+    """),
+    ("current_snapshot", """
+        SELECT version, round_id, standings
+        FROM (SELECT * FROM standings_snapshots ORDER BY created_at DESC LIMIT 1) AS latest
+        WHERE latest.generation >= (SELECT generation FROM standings_changes);
+    """),
+    ("get_max_round_id", """
+        SELECT COALESCE(MAX(round_id), 0) FROM results;
+    """),
+    ("round_results", """
+        SELECT player1_id, player1_score, player2_score, player2_id
+        FROM results
+        WHERE round_id = %(round_id)s;
+    """),
+    ("fetch_played_opponents", """
+        SELECT player1_id, player2_id
+        FROM results
+        WHERE player1_id = %(player_id)s OR player2_id = %(player_id)s;
+    """),
+    ("results_changes", """
+        SELECT (SELECT COALESCE(MAX(generation), 0) FROM results_changes),
+               (SELECT MIN(lowest_round) FROM results_changes WHERE generation > 0);
+    """),
+    ("fetch_games_after", """
+        SELECT round_id, player1_id, player2_id
+        FROM results
+        WHERE round_id > %(round_id)s AND NOT (round_id = ANY(ARRAY[]::integer[]));
+    """),
+]
+
+# Index changes of db/migrations/0002_query_indexes.sql and 0007_standings_ranking_id.sql,
+# undone to show the old plans
+DROP_INDEXES = """
+    ALTER TABLE Results DROP CONSTRAINT IF EXISTS results_pkey;
+    DROP INDEX IF EXISTS results_player1_idx;
+    DROP INDEX IF EXISTS results_player2_idx;
+    DROP INDEX IF EXISTS standings_ranking_idx;
+"""
+
+EXECUTION_TIME = re.compile(r'Execution Time: ([\d.]+) ms')
+
+
+def load_synthetic_tournament(cur, num_players, rounds):
+    """
+    Add a synthetic field of num_players with rounds of results, so plans
+    reflect a large event. Ids are prefixed with 'bench' to stay clear of
+    real players; everything is rolled back by the caller.
+    """
+    cur.execute("""
+        INSERT INTO Players (id, name, email)
+        SELECT 'bench' || lpad(g::text, 7, '0'), 'Bench Player ' || g, 'bench' || g || '@example.com'
+        FROM generate_series(1, %(players)s) AS g;
+
+        INSERT INTO Standings (id, name, is_active, is_bye, matches, tiebreaker_C, tiebreaker_B, tiebreaker_A, points)
+        SELECT id, name, true, false, %(rounds)s,
+               abs(hashtext(id || 'C')) %% 1000 / 10.0,
+               abs(hashtext(id || 'B')) %% 1000 / 10.0,
+               abs(hashtext(id || 'A')) %% 1000 / 10.0,
+               abs(hashtext(id)) %% (2 * %(rounds)s + 1) / 2.0
+        FROM Players
+        WHERE id LIKE 'bench%%';
+
+        WITH ordered AS (
+            SELECT r, p.id, p.name,
+                   row_number() OVER (PARTITION BY r ORDER BY md5(p.id || ':' || r)) - 1 AS pos
+            FROM generate_series(1, %(rounds)s) AS r
+            CROSS JOIN Players AS p
+            WHERE p.id LIKE 'bench%%'
+        )
+        INSERT INTO results (round_id, player1_id, player1_name, player1_score, player2_score, player2_name, player2_id)
+        SELECT a.r, a.id, a.name,
+               abs(hashtext(a.id || a.r)) %% 3 / 2.0,
+               1 - abs(hashtext(a.id || a.r)) %% 3 / 2.0,
+               b.name, b.id
+        FROM ordered AS a
+        JOIN ordered AS b ON b.r = a.r AND b.pos = a.pos + 1
+        WHERE a.pos %% 2 = 0;
+    """, {"players": num_players, "rounds": rounds})
+    cur.execute("ANALYZE Players; ANALYZE Results; ANALYZE Standings;")
+    logger.info(f"Loaded a synthetic field of {num_players} players and {rounds} rounds")
+
+
+def query_parameters(cur):
+    cur.execute("""
+        SELECT (SELECT id FROM Standings WHERE is_active
+                ORDER BY points DESC, tiebreaker_A DESC, tiebreaker_B DESC, tiebreaker_C DESC LIMIT 1),
+               (SELECT COALESCE(MAX(round_id), 0) FROM results);
+    """)
+    player_id, round_id = cur.fetchone()
+    return {"player_id": player_id, "round_id": round_id}
+
+
+def explain_queries(cur, params, analyze=True):
+    """
+    Return {query name: (plan text, execution time in ms or None)}.
+    """
+    options = "ANALYZE, BUFFERS" if analyze else "COSTS"
+    plans = {}
+    for name, sql in QUERIES:
+        cur.execute(f"EXPLAIN ({options}) {sql}", params)
+        plan = "\n".join(row[0] for row in cur.fetchall())
+        match = EXECUTION_TIME.search(plan)
+        plans[name] = (plan, float(match.group(1)) if match else None)
+    return plans
+
+
+def print_plans(title, plans):
+    print(f"\n{'=' * 30} {title} {'=' * 30}")
+    for name, (plan, _) in plans.items():
+        print(f"\n--- {name}\n{plan}")
+
+
+def print_summary(before, after):
+    print(f"\n{'query':<24} | {'before (ms)':>12} | {'after (ms)':>12} | {'speedup':>8}")
+    print("-" * 66)
+    for name in before:
+        old, new = before[name][1], after[name][1]
+        if old is None or new is None:
+            print(f"{name:<24} | {'-':>12} | {'-':>12} | {'-':>8}")
+            continue
+        speedup = f"{old / new:.1f}x" if new else "-"
+        print(f"{name:<24} | {old:>12.3f} | {new:>12.3f} | {speedup:>8}")
+
+
+def main(argv=None, conn=None):
+    """
+    Print the plans of the hot queries with and without the indexes.
+
+    Args:
+        argv (list | None): Command line arguments, sys.argv[1:] if None.
+        conn: Open database connection to use instead of connecting to --conn.
+    """
+    parser = argparse.ArgumentParser(
+        prog="explain-queries",
+        description="Show the plans of the hot queries with and without the migration indexes. "
+                    "Everything runs in one transaction that is rolled back; dropping the indexes "
+                    "locks the tables meanwhile, so use a development database."
+    )
+    parser.add_argument('--conn',
+                        help='PostgreSQL connection string (default: from DB_* environment variables)')
+    parser.add_argument('--players',
+                        type=int,
+                        default=0,
+                        help='Add a synthetic field of this many players first (default: %(default)s)')
+    parser.add_argument('--rounds',
+                        type=int,
+                        default=9,
+                        help='Rounds of synthetic results (default: %(default)s)')
+    parser.add_argument('--no-analyze',
+                        action='store_true',
+                        help='Only show estimated plans, do not execute the queries')
+    args = parser.parse_args(argv)
+
+    with open_connection(args.conn, conn) as conn:
+        try:
+            with conn.cursor() as cur:
+                if args.players:
+                    load_synthetic_tournament(cur, args.players, args.rounds)
+                params = query_parameters(cur)
+
+                after = explain_queries(cur, params, not args.no_analyze)
+                cur.execute(DROP_INDEXES)
+                before = explain_queries(cur, params, not args.no_analyze)
+
+            print_plans("WITHOUT INDEXES", before)
+            print_plans("WITH INDEXES", after)
+            if not args.no_analyze:
+                print_summary(before, after)
+        finally:
+            # Never keep the synthetic data or the dropped indexes
+            conn.rollback()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+
+import csv
+import argparse
+import os
+import sys
+from itertools import islice
+
+import numpy as np
+
+from core.simulation import DEFAULT_RATING, DRAW_RATE, draw_elo_outcomes, performance_ratings
+from common.csv_stream import CSVStream
+from common.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Pairing rows simulated together, one NumPy draw per chunk
+CHUNK_SIZE = 100_000
+
+
+def results_filename(filename):
+    # Create new filename by replacing 'pairings' with 'results'
+    dirname, basename = os.path.split(filename)
+    if "pairings" in basename:
+        new_basename = basename.replace("pairings", "results", 1)
+    else:
+        new_basename = f"results_{basename}"
+    return os.path.join(dirname, new_basename)
+
+
+def read_ratings_file(ratings_file):
+    """Ratings of a CSV file with id and rating columns, e.g. a generated players.csv."""
+    with open(ratings_file, newline="", encoding="utf-8") as f:
+        return {row["id"]: float(row["rating"]) for row in csv.DictReader(f) if row.get("rating")}
+
+
+def simulate_results(filename, ratings=None, rng=None, draw_rate=DRAW_RATE, chunk_size=CHUNK_SIZE):
+    """
+    Stream the rows of a pairings file with every '?' score replaced by a
+    simulated result.
+
+    The file is read chunk_size rows at a time and the outcomes of a whole
+    chunk are drawn in one call of draw_elo_outcomes(), so memory stays
+    bounded and a round of any realistic size takes a single draw.
+
+    Args:
+        filename (str): Pairings CSV file.
+        ratings (dict | None): Ratings by player id; players missing from it,
+                               or everyone if None, play at DEFAULT_RATING.
+        rng (np.random.Generator | None): Source of results.
+        draw_rate (float): Draw probability of evenly matched players.
+        chunk_size (int): Rows simulated together.
+
+    Yields:
+        list: CSV rows of the results file, header first.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    ratings = ratings or {}
+    with open(filename, newline="", encoding="utf-8") as infile:
+        reader = csv.reader(infile)
+        yield next(reader)
+        while chunk := list(islice(reader, chunk_size)):
+            games = [row for row in chunk if row[3] == "?" and row[4] == "?"]
+            if games:
+                rating1 = np.array([ratings.get(row[1], DEFAULT_RATING) for row in games])
+                rating2 = np.array([ratings.get(row[6], DEFAULT_RATING) for row in games])
+                scores = draw_elo_outcomes(rating1, rating2, rng, draw_rate)
+                for row, (score1, score2) in zip(games, scores.tolist()):
+                    row[3], row[4] = f"{score1:.1f}", f"{score2:.1f}"
+            yield from chunk
+
+
+def replace_results(filename: str, ratings=None, rng=None, draw_rate=DRAW_RATE, chunk_size=CHUNK_SIZE) -> str:
+    """Write the simulated results of a pairings file next to it, see simulate_results()."""
+    output_file = results_filename(filename)
+
+    # Write to the new results file
+    with open(output_file, "w", newline="", encoding="utf-8") as outfile:
+        writer = csv.writer(outfile)
+        writer.writerows(simulate_results(filename, ratings, rng, draw_rate, chunk_size))
+
+    logger.info(f"Results written to {output_file}")
+    return output_file
+
+
+def strength_ratings(storage, strength, ratings_file=None):
+    """
+    Ratings the simulation plays with.
+
+    Args:
+        storage (Storage | None): Tournament storage, read unless a ratings
+                                  file is given.
+        strength (str): "equal" (every game is even), "ratings" (player
+                        ratings) or "standings" (performance ratings of the
+                        current points).
+        ratings_file (str | None): CSV with id and rating columns, used for
+                                   "ratings" instead of the players table.
+
+    Returns:
+        dict: Ratings by player id.
+    """
+    if strength == "ratings":
+        return read_ratings_file(ratings_file) if ratings_file else storage.player_ratings()
+    if strength == "standings":
+        rows = storage.standing_scores()
+        if not rows:
+            return {}
+        ids, points, matches = zip(*rows)
+        return dict(zip(ids, performance_ratings(points, matches).tolist()))
+    return {}
+
+
+def main(argv=None, conn=None):
+    """
+    Fill in the results of a pairings file, as a results file next to it
+    or registered in the database directly.
+
+    Args:
+        argv (list | None): Command line arguments, sys.argv[1:] if None.
+        conn: Open database connection or Storage for --register and the
+              database strength sources.
+    """
+    parser = argparse.ArgumentParser(
+        prog="populate-results",
+        description="Replace ? with simulated chess/game results in pairings CSV."
+    )
+    parser.add_argument("-f",
+                        "--file",
+                        type=str,
+                        required=True,
+                        help="Path to the pairings file to be updated")
+    parser.add_argument("--strength",
+                        choices=["equal", "ratings", "standings"],
+                        default="equal",
+                        help="Player strength of the Elo model: equal for everyone, the players' "
+                             "ratings, or performance ratings of the current standings (default: %(default)s)")
+    parser.add_argument("--ratings-file",
+                        help="CSV with id and rating columns for --strength ratings, "
+                             "instead of the players table (e.g. a generated players.csv)")
+    parser.add_argument("--draw-rate",
+                        type=float,
+                        default=DRAW_RATE,
+                        help="Draw probability of evenly matched players (default: %(default).3f)")
+    parser.add_argument("--seed",
+                        type=int,
+                        help="Seed for reproducible results (default: random)")
+    parser.add_argument("--chunk-size",
+                        type=int,
+                        default=CHUNK_SIZE,
+                        help="Pairing rows simulated at a time (default: %(default)s)")
+    parser.add_argument("--register",
+                        action="store_true",
+                        help="Register the results in the database instead of writing a results file")
+    parser.add_argument("--conn",
+                        help="Connection string of --register and the database strengths, "
+                             "PostgreSQL or sqlite:///<file> (default: from DB_* environment variables)")
+
+    args = parser.parse_args(argv)
+    if not 0.0 <= args.draw_rate <= 1.0:
+        parser.error("--draw-rate must be between 0 and 1")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+
+    rng = np.random.default_rng(args.seed)
+    needs_storage = args.register or args.strength == "standings" or (
+        args.strength == "ratings" and not args.ratings_file)
+    if not needs_storage:
+        replace_results(args.file, strength_ratings(None, args.strength, args.ratings_file),
+                        rng, args.draw_rate, args.chunk_size)
+        return
+
+    # Imported here, only the database paths need the drivers
+    from core.register_results import InvalidResultsError, store_results
+    from core.storage import open_storage
+
+    with open_storage(args.conn, conn) as storage:
+        ratings = strength_ratings(storage, args.strength, args.ratings_file)
+        if args.register:
+            try:
+                store_results(CSVStream(simulate_results(args.file, ratings, rng, args.draw_rate,
+                                                         args.chunk_size)),
+                              storage)
+            except InvalidResultsError as err:
+                logger.error(str(err))
+                sys.exit(1)
+        else:
+            replace_results(args.file, ratings, rng, args.draw_rate, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+import argparse
+import sys
+import os
+
+
+# Columns of Storage.ranked_standings() rows
+STANDINGS_COLUMNS = ['rank', 'name', 'matches', 't2', 't1', 'points']
+
+
+def print_standings(storage, min_rank=None, max_rank=None, excel_file=None, **page):
+    """
+    Print the ranked standings as they stream from the storage, optionally
+    also writing them to an Excel file.
+
+    Args:
+        storage (Storage): Tournament storage.
+        min_rank (int | None): First rank printed.
+        max_rank (int | None): Last rank printed.
+        excel_file (str | None): Also write the printed rows to this file.
+        **page: limit, offset and batch_size, see Storage.ranked_standings().
+    """
+    exported = [] if excel_file else None
+
+    # Print the results in PostgreSQL format
+    print(" rank |         name              | matches |  t2  |  t1  | points")
+    print("------+---------------------------+---------+------+------+--------")
+    for row in storage.ranked_standings(min_rank, max_rank, **page):
+        print("{:5d} | {:25s} | {:7d} | {:.2f} | {:.2f} | {:6.1f}".format(row[0], row[1], row[2], row[3], row[4], row[5]))
+        if exported is not None:
+            exported.append(row)
+
+    if excel_file:
+        # pandas is only needed for the Excel copy, keep it off the other tables' path
+        import pandas as pd
+
+        # Convert the query results to a pandas DataFrame
+        df = pd.DataFrame(exported, columns=STANDINGS_COLUMNS)
+        df.to_excel(excel_file, index=False)
+
+def print_players(storage, **page):
+    print("{:<7} | {:<21} | {:<30}".format("id", "name", "email"))
+    print("-" * 70)
+    for row in storage.players(**page):
+        print("{:<7} | {:<21} | {:<30}".format(row[0], row[1], row[2]))
+    print()
+
+def print_results(storage, round_id=None, **page):
+    print("{:<9} | {:<21} | {:<13} | {:<13} | {:<21}".format(
+        "round_id", "player1_name", "player1_score", "player2_score", "player2_name"))
+    print("-" * 100)
+    for row in storage.results(round_id, **page):
+        safe_row = tuple("" if value is None else value for value in row)
+        print("{:<9} | {:<21} | {:<13} | {:<13} | {:<21}".format(*safe_row))
+    print()
+
+
+def main(argv=None, conn=None):
+    """
+    Print one of the tournament tables.
+
+    Args:
+        argv (list | None): Command line arguments, sys.argv[1:] if None.
+        conn: Open database connection or Storage to use instead of connecting to --conn.
+    """
+    parser = argparse.ArgumentParser(prog="print-table")
+    parser.add_argument('--conn',
+                        help='PostgreSQL connection string, or sqlite:///<file> for a local database '
+                             '(default: from DB_* environment variables)')
+    parser.add_argument("-t",
+                        "--table",
+                        choices=['standings', 'results', 'players'],
+                        required=True,
+                        help="a PostgreSQL table")
+    parser.add_argument("-r",
+                        "--round-id",
+                        type=int,
+                        help="Results of this round only (results table)")
+    parser.add_argument("--min-rank",
+                        type=int,
+                        help="First rank to print (standings table)")
+    parser.add_argument("--max-rank",
+                        type=int,
+                        help="Last rank to print (standings table)")
+    parser.add_argument("--limit",
+                        type=int,
+                        help="Print at most this many rows")
+    parser.add_argument("--offset",
+                        type=int,
+                        default=0,
+                        help="Skip this many rows first (default: %(default)s)")
+    parser.add_argument("--batch-size",
+                        type=int,
+                        default=1000,
+                        help="Rows fetched from the database at a time (default: %(default)s)")
+    parser.add_argument("--excel",
+                        metavar="FILE",
+                        help="Also write the printed standings to this Excel file (standings table)")
+    args = parser.parse_args(argv)
+
+    filters = {}
+    if args.table == "results":
+        filters["round_id"] = args.round_id
+    elif args.round_id is not None:
+        parser.error("--round-id only applies to the results table")
+    if args.table == "standings":
+        filters.update(min_rank=args.min_rank, max_rank=args.max_rank, excel_file=args.excel)
+    elif {args.min_rank, args.max_rank, args.excel} != {None}:
+        parser.error("--min-rank, --max-rank and --excel only apply to the standings table")
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+
+    # The storage backends pull in numpy and psycopg2, keep them off --help
+    from core.storage import open_storage
+
+    function = getattr(sys.modules[__name__], f"print_{args.table}")
+    with open_storage(args.conn, conn) as storage:
+        function(storage, limit=args.limit, offset=args.offset, batch_size=args.batch_size, **filters)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+import argparse
+import time
+
+import numpy as np
+
+from common.logger import get_logger
+from core.pairing_engines import ENGINES
+from core.simulation import simulate_tournament
+
+logger = get_logger(__name__)
+
+
+def summarize_events(num_players, rounds, events, engine, rng):
+    """
+    Simulate events tournaments of the same format and aggregate how
+    decisive they were.
+
+    Returns:
+        dict: Averages over all events.
+    """
+    leader_points, tied_leaders, perfect_scores = [], [], []
+    stats = {}
+    start = time.perf_counter()
+    for _ in range(events):
+        tournament = simulate_tournament(num_players, rounds, engine, rng=rng, stats=stats)
+        top = tournament.points.max()
+        leader_points.append(top)
+        tied_leaders.append(int(np.count_nonzero(tournament.points == top)))
+        perfect_scores.append(int(np.count_nonzero(tournament.points == rounds)))
+    elapsed = time.perf_counter() - start
+
+    tied_leaders = np.array(tied_leaders)
+    return {
+        "players": num_players,
+        "rounds": rounds,
+        "events": events,
+        "seconds_per_event": elapsed / events,
+        "leader_points": float(np.mean(leader_points)),
+        "sole_winner": float(np.mean(tied_leaders == 1)),
+        "tied_leaders": float(np.mean(tied_leaders)),
+        "perfect_scores": float(np.mean(perfect_scores)),
+        "rematches": stats.get("rematches", 0) / events,
+        "byes": stats.get("byes", 0) / events,
+    }
+
+
+def print_summary(rows):
+    print("{:>7} | {:>6} | {:>8} | {:>10} | {:>11} | {:>11} | {:>12} | {:>9}".format(
+        "players", "rounds", "ms/event", "leader pts", "sole winner", "tied at top", "perfect runs", "rematches"))
+    print("-" * 94)
+    for row in rows:
+        print("{:>7} | {:>6} | {:>8.2f} | {:>10.2f} | {:>10.1f}% | {:>11.2f} | {:>12.2f} | {:>9.2f}".format(
+            row["players"], row["rounds"], 1000 * row["seconds_per_event"], row["leader_points"],
+            100 * row["sole_winner"], row["tied_leaders"], row["perfect_scores"], row["rematches"]))
+
+
+def parse_args(argv=None):
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="simulate-tournament",
+        description="Simulate whole Swiss tournaments in memory to size rounds and sections."
+    )
+    parser.add_argument('-p', '--players',
+                        default='100',
+                        help='Comma separated field sizes (default: %(default)s)')
+    parser.add_argument('-r', '--rounds',
+                        default='7',
+                        help='Comma separated numbers of rounds (default: %(default)s)')
+    parser.add_argument('-n', '--events',
+                        type=int,
+                        default=1000,
+                        help='Events simulated per format (default: %(default)s)')
+    parser.add_argument('-e', '--engine',
+                        choices=list(ENGINES),
+                        default='greedy',
+                        help='Pairing engine (default: %(default)s)')
+    parser.add_argument('--seed',
+                        type=int,
+                        help='Random seed for reproducible runs')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    rng = np.random.default_rng(args.seed)
+
+    rows = []
+    for num_players in (int(size) for size in args.players.split(',')):
+        for rounds in (int(count) for count in args.rounds.split(',')):
+            logger.info(f"Simulating {args.events} events: {num_players} players, {rounds} rounds")
+            rows.append(summarize_events(num_players, rounds, args.events, args.engine, rng))
+
+    print_summary(rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,9 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC = os.path.join(ROOT, "src")
+
+# Modules are imported by package, e.g. `core.player` and `common.logger`
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from common.startup import STARTUP_BUDGET_MS, parse_import_times, total_import_ms
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+
+def import_profile(command):
+    """Import main.py and the module of command in a fresh interpreter."""
+    code = f"import importlib, main; importlib.import_module(main.COMMANDS[{command!r}])"
+    env = dict(os.environ, PYTHONPATH=SRC)
+    child = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                           env=env, stderr=subprocess.PIPE, text=True, check=True)
+    return parse_import_times(child.stderr.splitlines())
+
+
+def test_parse_import_times():
+    imports = parse_import_times([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       120 |        120 |   _io",
+        "import time:      1500 |       4000 | numpy",
+        "[12:00:00] [main] INFO: not an import line",
+    ])
+    assert imports == [("_io", 0.12, 0.12, 1), ("numpy", 1.5, 4.0, 0)]
+    assert total_import_ms(imports) == 4.0
+
+
+@pytest.mark.parametrize("command", ["generate-swiss-pairings", "print-table"])
+def test_command_startup_stays_within_budget(command):
+    imports = import_profile(command)
+    modules = {module for module, *_ in imports}
+    assert not modules & {"pandas", "faker", "openpyxl"}
+    # Best of three, a single run can be slowed down by the machine
+    best = min(total_import_ms(imports), *(total_import_ms(import_profile(command)) for _ in range(2)))
+    assert best < STARTUP_BUDGET_MS
+
+
+@pytest.mark.parametrize("command", ["register-players", "register-standings"])
+def test_command_help_needs_no_database(command):
+    env = {key: value for key, value in os.environ.items() if not key.startswith("DB_")}
+    env["PYTHONPATH"] = SRC
+    child = subprocess.run([sys.executable, os.path.join(SRC, "main.py"), command, "--help"],
+                           env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    assert child.returncode == 0
+    assert "usage:" in child.stdout
@@ -0,0 +1,246 @@
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+from core.head_to_head import HeadToHead
+from core.matching import max_weight_matching
+from core import generate_swiss_pairings, pairing_engines
+from core.pairing_engines import greedy_pairing, matching_pairing, score_group_pairing
+from core.player import Player
+from utils.benchmark_pairings import compare_to_baseline
+
+
+def make_players(points):
+    return [Player(rank + 1, f"{rank + 1:05d}", f"Player {rank + 1}", False, p)
+            for rank, p in enumerate(points)]
+
+
+def brute_force_matching(edges, max_cardinality):
+    best = None
+    for size in range(len(edges) + 1):
+        for subset in itertools.combinations(edges, size):
+            vertices = [v for (i, j, _) in subset for v in (i, j)]
+            if len(vertices) != len(set(vertices)):
+                continue
+            key = (size, sum(w for *_, w in subset)) if max_cardinality else (sum(w for *_, w in subset),)
+            if best is None or key > best:
+                best = key
+    return best
+
+
+@pytest.mark.parametrize("max_cardinality", [False, True])
+def test_max_weight_matching_is_optimal(max_cardinality):
+    rng = random.Random(7)
+    for _ in range(100):
+        n = rng.randint(2, 6)
+        edges = [(i, j, rng.randint(-2, 10))
+                 for i in range(n) for j in range(i + 1, n) if rng.random() < 0.6]
+        if not edges:
+            continue
+        mate = max_weight_matching(edges, max_cardinality)
+        weights = {(i, j): w for i, j, w in edges}
+        matched = [(v, m) for v, m in enumerate(mate) if m > v]
+        assert all(mate[m] == v for v, m in enumerate(mate) if m >= 0)
+        total = sum(weights[pair] for pair in matched)
+        key = (len(matched), total) if max_cardinality else (total,)
+        assert key == brute_force_matching(edges, max_cardinality)
+
+
+def test_matching_avoids_bye_where_greedy_cannot():
+    players = make_players([2, 2, 1, 1])
+    ids = [p.id for p in players]
+    # 1-2 and 3-4 already played, 2-3 already played: only 1-3 & 2-4 or 1-4 & 2-3 remain
+    history = HeadToHead.from_pairs([(ids[0], ids[1]), (ids[1], ids[2]), (ids[2], ids[3])])
+
+    pairs = matching_pairing(players, history)
+
+    assert all(p2 != 'BYE' for _, p2 in pairs)
+    assert {(p1.id, p2.id) for p1, p2 in pairs} == {(ids[0], ids[2]), (ids[1], ids[3])}
+
+
+def test_matching_gives_bye_to_lowest_player_without_bye():
+    players = make_players([2, 2, 1, 1, 1])
+    players[4].is_bye = True
+
+    pairs = matching_pairing(players, HeadToHead())
+
+    byes = [p1 for p1, p2 in pairs if p2 == 'BYE']
+    assert [p.id for p in byes] == [players[3].id]
+
+
+@pytest.mark.parametrize("engine", [greedy_pairing, matching_pairing])
+def test_engines_pair_every_player_once(engine):
+    players = make_players([3, 3, 2.5, 2, 2, 2, 1.5, 1, 1, 0])
+    pairs = engine(players, HeadToHead())
+    seen = [p.id for pair in pairs for p in pair if p != 'BYE']
+    assert sorted(seen) == sorted(p.id for p in players)
+
+
+def test_matching_blocks_float_players_without_rematches():
+    rng = random.Random(11)
+    players = make_players([0] * 41)
+    history = HeadToHead()
+    for _ in range(5):
+        players.sort(key=lambda p: -p.points)
+        pairs = matching_pairing(players, history, block_size=8)
+
+        seen = [p.id for pair in pairs for p in pair if p != 'BYE']
+        assert sorted(seen) == sorted(p.id for p in players)
+        assert sum(1 for _, p2 in pairs if p2 == 'BYE') == 1
+
+        for p1, p2 in pairs:
+            if p2 == 'BYE':
+                p1.points += 1
+                p1.is_bye = True
+                continue
+            assert not history.played(p1.id, p2.id)
+            history.add_pairs([(p1.id, p2.id)])
+            p1.points += rng.choice([0, 0.5, 1])
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_score_groups_pair_within_groups_first(workers, monkeypatch):
+    monkeypatch.setattr(pairing_engines, "PARALLEL_MIN_PLAYERS", 0)
+    players = make_players([2, 2, 2, 1, 1, 1, 1, 0, 0])
+
+    pairs = score_group_pairing(players, HeadToHead(), workers=workers)
+
+    assert all(p1 in players and (p2 == 'BYE' or p2 in players) for p1, p2 in pairs)
+    cross_group = [(p1, p2) for p1, p2 in pairs if p2 != 'BYE' and p1.points != p2.points]
+    assert len(cross_group) == 2
+    assert [p1.id for p1, p2 in pairs if p2 == 'BYE'] == [players[-1].id]
+
+
+def test_head_to_head_index_queries():
+    history = HeadToHead.from_pairs([("a", "b"), ("a", "c"), ("d", None)], player_ids=["e"])
+
+    assert history.played("a", "b") and history.played("b", "a")
+    assert not history.played("b", "c")
+    assert not history.played("a", "unknown")
+    assert sorted(history.opponents("a")) == ["b", "c"]
+    assert history.opponents("d") == []
+    assert history.eligible_opponents("a") == ["e", "d"]
+    assert list(history.played_mask(history.index["a"], history.indices(["b", "d", "x"]))) == [True, False, False]
+
+    group = history.subset(["c", "a", "d"])
+    assert group.played("a", "c") and not group.played("a", "d")
+    assert not group.played("a", "b")
+    assert len(group) == 3
+
+
+def test_head_to_head_save_and_load(tmp_path):
+    history = HeadToHead.from_pairs([("a", "b"), ("c", None)])
+    cache_file = str(tmp_path / "head_to_head.npz")
+
+    history.save(cache_file, rounds=np.array([1, 2]))
+    loaded, meta = HeadToHead.load(cache_file)
+
+    assert loaded.ids == history.ids
+    assert loaded.played("b", "a") and not loaded.played("a", "c")
+    assert meta["rounds"].tolist() == [1, 2]
+
+
+def test_compare_to_baseline_flags_regressions():
+    baseline = {"swiss": [
+        {"engine": "greedy", "players": 100, "wall_time": 1.0, "peak_memory": 1000,
+         "max_rss_children": 0, "rematches": 0, "byes": 1},
+        {"engine": "matching", "players": 100, "wall_time": 1.0, "peak_memory": None,
+         "rematches": 2, "byes": 1},
+    ]}
+    report = {"swiss": [
+        {"engine": "greedy", "players": 100, "wall_time": 1.4, "peak_memory": 2000,
+         "max_rss_children": 0, "rematches": 1, "byes": 1},
+        {"engine": "matching", "players": 100, "wall_time": 2.0, "peak_memory": 5000,
+         "rematches": 2, "byes": 0},
+        {"engine": "score-groups", "players": 100, "wall_time": 9.0, "peak_memory": 9000,
+         "rematches": 9, "byes": 9},
+    ]}
+
+    assert compare_to_baseline(report, baseline) == [
+        "greedy n=100: peak memory 1000 -> 2000 bytes",
+        "greedy n=100: rematches 0 -> 1",
+        "matching n=100: wall time 1.000s -> 2.000s",
+    ]
+    assert compare_to_baseline(report, baseline, tolerance=3) == ["greedy n=100: rematches 0 -> 1"]
+    assert compare_to_baseline(report, {}) == []
+
+
+class ResultsLog:
+    """In-memory stand-in for the results table and its change log."""
+
+    def __init__(self, monkeypatch):
+        self.games, self.changes, self.fetches = [], [], []
+        monkeypatch.setattr(generate_swiss_pairings, "fetch_results_changes", self.fetch_results_changes)
+        monkeypatch.setattr(generate_swiss_pairings, "fetch_games_after", self.fetch_games_after)
+
+    def add_round(self, round_id, pairs):
+        self.games += [(round_id, p1, p2) for p1, p2 in pairs]
+        self.changes.append(round_id)
+
+    def edit_round(self, round_id, pairs):
+        self.games = [game for game in self.games if game[0] != round_id]
+        self.add_round(round_id, pairs)
+
+    def fetch_results_changes(self, conn, since=0):
+        return len(self.changes), min(self.changes[since:], default=None)
+
+    def fetch_games_after(self, conn, round_id=0, skip_rounds=()):
+        self.fetches.append((round_id, sorted(skip_rounds)))
+        return [game for game in self.games if game[0] > round_id and game[0] not in skip_rounds]
+
+
+def test_head_to_head_cache_appends_new_rounds(tmp_path, monkeypatch):
+    log = ResultsLog(monkeypatch)
+    cache_file = str(tmp_path / "head_to_head.npz")
+    log.add_round(1, [("a", "b"), ("c", "d")])
+
+    history = generate_swiss_pairings.load_head_to_head_map(None, ["e"], cache_file)
+    assert history.played("a", "b") and log.fetches == [(0, [])]
+
+    history = generate_swiss_pairings.load_head_to_head_map(None, ["e"], cache_file)
+    assert history.played("c", "d") and "e" in history.index
+    assert len(log.fetches) == 1
+
+    log.add_round(2, [("a", "c"), ("b", "d")])
+    history = generate_swiss_pairings.load_head_to_head_map(None, (), cache_file)
+    assert history.played("a", "c") and history.played("a", "b")
+    assert log.fetches[-1] == (1, [])
+
+    log.add_round(3, [("a", "d"), ("b", "c")])
+    history = generate_swiss_pairings.load_head_to_head_map(None, (), cache_file,
+                                                            known_rounds={3: [("a", "d"), ("b", "c")]})
+    assert history.played("a", "d") and history.played("b", "c")
+    assert log.fetches[-1] == (2, [3])
+
+    _, meta = HeadToHead.load(cache_file)
+    assert int(meta["last_round"]) == 3 and int(meta["generation"]) == 3
+
+
+def test_head_to_head_cache_rebuilds_edited_rounds(tmp_path, monkeypatch):
+    log = ResultsLog(monkeypatch)
+    cache_file = str(tmp_path / "head_to_head.npz")
+    log.add_round(1, [("a", "b"), ("c", "d")])
+    log.add_round(2, [("a", "c"), ("b", "d")])
+    generate_swiss_pairings.load_head_to_head_map(None, (), cache_file)
+
+    log.edit_round(1, [("a", "d"), ("b", "c")])
+    history = generate_swiss_pairings.load_head_to_head_map(None, (), cache_file)
+
+    assert log.fetches[-1] == (0, [])
+    assert history.played("a", "d") and not history.played("a", "b")
+    assert history.played("a", "c")
+
+
+def test_head_to_head_cache_rebuilds_unreadable_file(tmp_path, monkeypatch):
+    log = ResultsLog(monkeypatch)
+    cache_file = tmp_path / "head_to_head.npz"
+    cache_file.write_bytes(b"not a cache")
+    log.add_round(1, [("a", "b")])
+
+    history = generate_swiss_pairings.load_head_to_head_map(None, (), str(cache_file))
+
+    assert history.played("a", "b") and log.fetches == [(0, [])]
+    _, meta = HeadToHead.load(str(cache_file))
+    assert int(meta["last_round"]) == 1
@@ -0,0 +1,13 @@
+from core.generate_players import generate_fake_players
+
+
+def test_generated_players_are_unique_and_reproducible():
+    players = generate_fake_players(2000, seed=11, rating_mean=1500, rating_sd=300)
+
+    assert players == generate_fake_players(2000, seed=11, rating_mean=1500, rating_sd=300)
+    assert len({player[0] for player in players}) == 2000
+    assert len({player[2] for player in players}) == 2000
+    assert all(len(player[0]) == 5 and player[0].isdigit() for player in players)
+    ratings = [player[3] for player in players]
+    assert 1450 < sum(ratings) / len(ratings) < 1550
+    assert len(generate_fake_players(3, seed=1)[0]) == 3
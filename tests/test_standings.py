@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from core.forecast import forecast_placements, parse_bands, played_matrix
+
+
+def test_parse_bands():
+    assert parse_bands("1,2,4-10") == [(1, 1), (2, 2), (4, 10)]
+    with pytest.raises(ValueError):
+        parse_bands("3-2")
+
+
+def test_forecast_placements_are_probabilities():
+    ids = [f"{i:02d}" for i in range(9)]
+    history = played_matrix(ids, [("00", "01"), ("02", "03"), ("04", "05"), ("06", None)])
+    assert history[0, 1] and history[1, 0] and history.sum() == 6
+
+    bands = parse_bands("1,2-3")
+    probabilities = forecast_placements([1, 1, 1, 1, 0.5, 0.5, 1, 0, 0], np.zeros(9, dtype=bool),
+                                        history, 3, bands, runs=2000, rng=np.random.default_rng(5))
+
+    assert probabilities.shape == (9, 2)
+    assert np.allclose(probabilities.sum(axis=0), [1, 2])
+    assert np.all(probabilities.sum(axis=1) <= 1 + 1e-9)
+
+
+def test_forecast_clear_leader_wins():
+    ids = [f"{i:02d}" for i in range(6)]
+    probabilities = forecast_placements([5, 1, 1, 0, 0, 0], np.zeros(6, dtype=bool),
+                                        played_matrix(ids, []), 1, [(1, 1)], runs=100,
+                                        rng=np.random.default_rng(0))
+    assert probabilities[0, 0] == 1.0
+
+
+def test_forecast_does_not_depend_on_workers(monkeypatch):
+    import core.forecast
+
+    monkeypatch.setattr(core.forecast, "PARALLEL_MIN_RUNS", 0)
+    ids = [f"{i:02d}" for i in range(8)]
+    history = played_matrix(ids, [("00", "01"), ("02", "03")])
+    forecasts = [forecast_placements([1, 1, 1, 1, 0, 0, 0, 0], np.zeros(8, dtype=bool), history, 2,
+                                     [(1, 1), (2, 4)], runs=400, rng=np.random.default_rng(7),
+                                     chunk_size=100, workers=workers)
+                 for workers in (1, 2)]
+    assert np.array_equal(*forecasts)
@@ -0,0 +1,289 @@
+import numpy as np
+import pytest
+
+from core.simulation import SimulatedTournament, simulate_tournament
+
+
+def test_simulated_tournament_keeps_standings_consistent():
+    stats = {}
+    tournament = simulate_tournament(11, 5, "greedy", rng=np.random.default_rng(3), stats=stats)
+
+    # Every game hands out one point, every BYE one point
+    assert tournament.points.sum() == 5 * 5 + 5
+    assert (tournament.matches == 5).all()
+    assert stats["rematches"] == 0
+    assert stats["byes"] == 5
+    assert tournament.is_bye.sum() == 5
+
+    # Tie-breakers follow from the final points of the opponents
+    for i in range(len(tournament)):
+        played = tournament.opponents[i] >= 0
+        opponents = tournament.opponents[i][played]
+        scores = tournament.scores[i]
+        assert tournament.buchholz[i] == tournament.points[opponents].sum()
+        assert tournament.sonneborn_berger[i] == (scores[played] * tournament.points[opponents]).sum()
+        assert tournament.progressive[i] == sum(scores[:r + 1].sum() for r in range(5))
+
+    ranks = [row[0] for row in tournament.standings()]
+    points = [row[3] for row in tournament.standings()]
+    assert ranks == list(range(1, 12))
+    assert points == sorted(points, reverse=True)
+
+
+def test_simulated_round_follows_given_pairings():
+    tournament = SimulatedTournament(3, 1, np.random.default_rng(0))
+    p1, p2, p3 = tournament.ranked_players()
+    scores = tournament.play_round([(p1, p2), (p3, 'BYE')])
+
+    assert scores.sum() == 1.0
+    assert tournament.points[2] == 1.0 and tournament.is_bye[2]
+    assert tournament.opponents[:, 0].tolist() == [1, 0, -1]
+    assert tournament.head_to_head_map.played(p1.id, p2.id)
+
+
+def test_service_serves_standings_and_pairs_from_memory():
+    from core.head_to_head import HeadToHead
+    from core.service import TournamentState, create_app
+
+    points = [2.0, 2.0, 1.0, 1.0, 0.0, 0.0]
+    standings = [{"id": f"{i:02d}", "name": f"Player {i}", "is_active": True, "is_bye": False,
+                  "matches": 2, "points": p, "tiebreaker_A": float(i % 3), "tiebreaker_B": 0.0,
+                  "tiebreaker_C": 0.0} for i, p in enumerate(points)]
+    history = HeadToHead.from_pairs([("00", "01"), ("02", "03"), ("04", "05")], [row["id"] for row in standings])
+    client = create_app(TournamentState(standings, history, 2), conn=None).test_client()
+
+    response = client.get("/standings")
+    ranked = response.get_json()["standings"]
+    assert [row["id"] for row in ranked] == ["01", "00", "02", "03", "05", "04"]
+    assert [row["rank"] for row in ranked] == list(range(1, 7))
+    # Unchanged standings are not sent again
+    etag = response.headers["ETag"]
+    assert client.get("/standings", headers={"If-None-Match": etag}).status_code == 304
+
+    # Nothing to submit results for before the round is paired
+    response = client.post("/results", json={"results": [
+        {"player1_id": "01", "player1_score": 1.0, "player2_score": 0.0, "player2_id": "02"}]})
+    assert response.status_code == 409
+
+    response = client.post("/pairings", json={"engine": "greedy"})
+    assert response.status_code == 201
+    pairings = client.get("/pairings").get_json()
+    assert pairings["round_id"] == 3
+    assert all(not history.played(p["player1_id"], p["player2_id"]) for p in pairings["pairings"])
+
+    # Rejected before anything reaches the database
+    response = client.post("/results", json={"results": [
+        {"player1_id": "01", "player1_score": 1.0, "player2_score": 0.0, "player2_id": "99"}]})
+    assert response.status_code == 400
+    messages = [error["message"] for error in response.get_json()["errors"]]
+    assert any("99 not found" in message for message in messages)
+    assert any("not in the round 3 pairings" in message for message in messages)
+    assert any("have no result" in message for message in messages)
+
+
+def test_service_applies_results_of_the_published_pairings(monkeypatch):
+    import core.service
+    from core.head_to_head import HeadToHead
+    from core.service import TournamentState, create_app
+
+    stored = []
+    monkeypatch.setattr(core.service, "insert_results", lambda cur, results: stored.extend(results))
+    monkeypatch.setattr(core.service, "apply_scores_to_standings", lambda conn, round_id, commit: None)
+    monkeypatch.setattr(core.service, "apply_tiebreaks", lambda conn, round_id, commit: "r1-applied")
+
+    class Connection:
+        """Hands back the standings row of player 02 as apply_tiebreaks() left it."""
+        committed = False
+
+        def cursor(self):
+            return self
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def execute(self, sql, params=None):
+            pass
+
+        def fetchall(self):
+            return [("02", "Player 2", True, False, 1, 1.0, 0.0, 0.0, 1.0)]
+
+        def commit(self):
+            self.committed = True
+
+    standings = [{"id": f"{i:02d}", "name": f"Player {i}", "is_active": True, "is_bye": False, "matches": 0,
+                  "points": 0.0, "tiebreaker_A": 0.0, "tiebreaker_B": 0.0, "tiebreaker_C": 0.0} for i in range(4)]
+    conn = Connection()
+    state = TournamentState(standings, HeadToHead.from_pairs([], [row["id"] for row in standings]), 0)
+    client = create_app(state, conn).test_client()
+
+    pairings = client.post("/pairings").get_json()["pairings"]
+    # Sides may be swapped, a game is the same pair of players
+    results = [{"player1_id": game["player2_id"], "player1_score": 0.0 if game["player2_id"] == "02" else 1.0,
+                "player2_score": 1.0 if game["player2_id"] == "02" else 0.0, "player2_id": game["player1_id"]}
+               if "02" in (game["player1_id"], game["player2_id"]) else
+               {"player1_id": game["player1_id"], "player1_score": 0.5, "player2_score": 0.5,
+                "player2_id": game["player2_id"]}
+               for game in pairings]
+    response = client.post("/results", json={"results": results})
+
+    assert response.status_code == 201
+    assert conn.committed and len(stored) == 2 and state.last_round == 1
+    assert response.get_json()["standings"][0]["id"] == "02"
+    assert all(state.head_to_head_map.played(game["player1_id"], game["player2_id"]) for game in pairings)
+    assert client.get("/standings").headers["ETag"] == '"r1-applied"'
+    # The pairings were used up, the next round has to be paired first
+    assert client.get("/pairings").get_json()["pairings"] is None
+    assert client.post("/results", json={"results": results}).status_code == 409
+
+
+def test_service_reports_database_errors_as_json():
+    import psycopg2
+    from core.head_to_head import HeadToHead
+    from core.service import TournamentState, create_app
+
+    class FailingConnection:
+        rolled_back = False
+
+        def cursor(self):
+            raise psycopg2.OperationalError("server closed the connection")
+
+        def rollback(self):
+            self.rolled_back = True
+
+    standings = [{"id": f"{i:02d}", "name": f"Player {i}", "is_active": True, "is_bye": False, "matches": 0,
+                  "points": 0.0, "tiebreaker_A": 0.0, "tiebreaker_B": 0.0, "tiebreaker_C": 0.0} for i in range(2)]
+    conn = FailingConnection()
+    state = TournamentState(standings, HeadToHead.from_pairs([], ["00", "01"]), 0)
+    client = create_app(state, conn).test_client()
+    assert client.post("/pairings").status_code == 201
+
+    response = client.post("/results", json={"results": [
+        {"player1_id": "00", "player1_score": 1.0, "player2_score": 0.0, "player2_id": "01"}]})
+    assert response.status_code == 500
+    assert response.get_json() == {"error": "Results could not be stored"}
+    assert conn.rolled_back and state.last_round == 0
+
+    # Reloaded in place: the state the writes go to is never replaced
+    assert client.post("/reload").status_code == 500
+    assert client.application.config["state"] is state
+
+
+def test_sqlite_storage_runs_the_round_cycle(tmp_path):
+    from core.generate_swiss_pairings import swiss_pairing
+    from core.storage import SQLiteStorage
+
+    players_csv = tmp_path / "players.csv"
+    players_csv.write_text("id,name,email\n" + "".join(f"{i:02d},Player {i},p{i}@example.org\n" for i in range(7))
+                           + "03,Impostor,x@example.org\n")
+    storage = SQLiteStorage()
+    # Rejected as a whole, then registered without the conflicting id
+    assert storage.register_players(str(players_csv)) == 0
+    assert storage.register_players(str(players_csv), skip_invalid=True) == 6
+    assert storage.fill_standings() == 6
+
+    rng = np.random.default_rng(5)
+    for round_id in range(1, 4):
+        pairs = swiss_pairing(storage, storage.active_players())
+        storage.insert_results([(round_id, a.id, a.name, 1.0, None, None, None) if b == "BYE" else
+                                (round_id, a.id, a.name, score, 1.0 - score, b.name, b.id)
+                                for (a, b), score in zip(pairs, rng.choice([0.0, 0.5, 1.0], len(pairs)))])
+        # Incremental tie-breakers, checked against a full recomputation
+        storage.apply_round(round_id, verify=True)
+        storage.commit()
+
+    assert storage.max_round_id() == 3
+    assert len(set(storage.result_pairs())) == 9
+    standings = list(storage.ranked_standings(batch_size=4))
+    assert [row[0] for row in standings] == list(range(1, 7))
+    assert sum(row[5] for row in standings) == 9.0
+    assert all(row[2] == 3 for row in standings)
+
+    # Filters and pages are cut by the query
+    assert list(storage.ranked_standings(min_rank=2, max_rank=5, limit=2, offset=1)) == standings[2:4]
+    assert [row[0] for row in storage.results(round_id=2, batch_size=2)] == [2, 2, 2]
+    assert [row[0] for row in storage.players(offset=4)] == ["05", "06"]
+
+
+def test_invalid_results_raise_and_run_round_keeps_nothing(tmp_path):
+    import io
+    from core.register_results import InvalidResultsError
+    from core.run_round import run_round
+    from core.storage import SQLiteStorage
+
+    storage = SQLiteStorage()
+    storage.register_players(io.StringIO("id,name,email\n" + "".join(f"{i},P{i},p{i}@example.org\n" for i in range(4))))
+    storage.fill_standings()
+    results = tmp_path / "results_r1.csv"
+    results.write_text("round_id,player1_id,player1_name,player1_score,player2_score,player2_name,player2_id\n"
+                       "1,0,P0,1.0,0.0,P1,1\n1,2,P2,1.0,1.0,P3,3\n")
+
+    with pytest.raises(InvalidResultsError) as raised:
+        run_round(storage, str(results), pair_next=False)
+    assert [line for line, _ in raised.value.errors] == [3]
+    assert storage.max_round_id() == 0
+
+
+def test_export_workbook_writes_one_sheet_per_table(tmp_path):
+    from openpyxl import load_workbook
+    from core.storage import SQLiteStorage
+    from utils.convert_table_to_excel import export_workbook
+
+    storage = SQLiteStorage()
+    storage.conn.executemany("INSERT INTO players (id, name, email) VALUES (?, ?, ?)",
+                             [("a", "Pipe | Name", "a@example.org"), ("b", "Other", "b@example.org")])
+    storage.fill_standings(1.0)
+    output = tmp_path / "tournament_r0.xlsx"
+
+    assert export_workbook(storage, str(output), batch_size=1) == {"standings": 2, "results": 0, "players": 2}
+    workbook = load_workbook(output, read_only=True)
+    assert workbook.sheetnames == ["standings", "results", "players"]
+    assert list(workbook["players"].values)[1] == ("a", "Pipe | Name", "a@example.org")
+    assert list(workbook["standings"].values)[1][:2] == (1, "Pipe | Name")
+
+
+def test_workbook_players_register_without_a_csv(tmp_path):
+    from openpyxl import Workbook
+    from core.storage import SQLiteStorage
+    from common.csv_stream import CSVStream
+    from utils.convert_excel_to_csv import player_rows, read_sheet_chunks
+
+    workbook = Workbook(write_only=True)
+    for title, first in (("North", 1), ("South", 4)):
+        sheet = workbook.create_sheet(title)
+        sheet.append(["Email", "Name", " ID ", "Club"])
+        for i in range(first, first + 3):
+            sheet.append([f"p{i}@example.org", f"Player, {i}", float(i), "Club"])
+        sheet.append([None, None, None, None])
+    workbook.save(tmp_path / "federation.xlsx")
+
+    chunks = list(read_sheet_chunks(tmp_path / "federation.xlsx", chunk_size=2))
+    assert [(name, len(chunk)) for name, _, chunk in chunks] == [("North", 2), ("North", 1), ("South", 2), ("South", 1)]
+
+    storage = SQLiteStorage()
+    assert storage.register_players(CSVStream(player_rows(iter(chunks)))) == 6
+    assert list(storage.players(limit=1)) == [("1", "Player, 1", "p1@example.org")]
+
+
+def test_elo_outcomes_follow_ratings_and_stream_from_pairings(tmp_path):
+    from core.simulation import draw_elo_outcomes, expected_scores
+    from utils.populate_results import simulate_results
+
+    rng = np.random.default_rng(2)
+    even = draw_elo_outcomes(np.full(30000, 1500.0), np.full(30000, 1500.0), rng)
+    assert (even.sum(axis=1) == 1.0).all()
+    assert abs((even[:, 0] == 0.5).mean() - 1 / 3) < 0.02
+    uneven = draw_elo_outcomes(np.full(30000, 1900.0), np.full(30000, 1500.0), rng, draw_rate=0.2)
+    assert abs(uneven[:, 0].mean() - expected_scores(1900.0, 1500.0)) < 0.01
+
+    pairings = tmp_path / "pairings_r1.csv"
+    pairings.write_text("round_id,player1_id,player1_name,player1_score,player2_score,player2_name,player2_id\n"
+                        + "".join(f"1,{2 * i},A{i},?,?,B{i},{2 * i + 1}\n" for i in range(5))
+                        + "1,10,C,BYE,_,_,_\n")
+    ratings = {str(i): 2800.0 if i % 2 else 1000.0 for i in range(10)}
+    rows = list(simulate_results(str(pairings), ratings, np.random.default_rng(7), chunk_size=2))
+    assert rows[0][0] == "round_id" and rows[-1][3:5] == ["BYE", "_"]
+    assert [row[3:5] for row in rows[1:-1]] == [["0.0", "1.0"]] * 5
+    assert rows == list(simulate_results(str(pairings), ratings, np.random.default_rng(7)))